@@ -135,6 +135,75 @@ def logit_like_sum(y: list, x: list, beta_0: float, beta_1: float) -> float:
     return like_sum
 
 
+# Vectorized version of logit_like_sum, 
+# for large datasets and many candidate values of the parameters.
+# Each assignment solution is handed out as a single script, 
+# so this is a copy of logit_like_sum_vec() 
+# in midterm_exam/my_logit_midterm_soln.py, not an import. 
+# Change both together: test_logit_like_sum_vec.py 
+# in midterm_exam checks that they give the same values.
+
+def logit_like_sum_vec(y: List[int], x: List[float], 
+                       beta_0: float, beta_1: float) -> float:
+    """Calculates the value of the likelihood function
+    for the bivariate logistic regression model
+    for several pairs of observations in the lists x and y
+    and coefficients beta_0 and beta_1.
+    
+    This version calculates with numpy arrays instead of looping 
+    over the observations with logit_like(). 
+    If beta_0 and beta_1 are arrays of candidate values, 
+    the likelihood is calculated for each pair (beta_0[i], beta_1[i])
+    and an array of the same shape is returned. 
+    Otherwise, a single float is returned, as in logit_like_sum(). 
+    
+    The log of the logit link function is calculated as 
+    beta_0 + x*beta_1 - log(1 + exp(beta_0 + x*beta_1)), 
+    using np.logaddexp(), which does not overflow for large values of x. 
+    logit_like_sum() remains the reference version of the calculation.
+    
+    >>> round(logit_like_sum_vec([1, 1, 1], [13.7, 12, 437], 0.0, 0.0), 12)
+    -2.07944154168
+    >>> round(logit_like_sum_vec([1, 0], [1, 1], 0.0, math.log(2)), 12)
+    -1.504077396776
+    >>> round(logit_like_sum_vec([1, 0], [2, 3], math.log(5), math.log(2)), 12)
+    -3.762362230874
+    >>> logit_like_sum_vec([1, 0], [2, 3], [0.0, math.log(5)], [0.0, math.log(2)]).round(8)
+    array([-1.38629436, -3.76236223])
+    >>> logit_like_sum_vec([1, 2], [2, 3], 0.0, 0.0)
+    Error: Observations in y must be either zero or one.
+    """
+    
+    y = np.asarray(y, dtype = float)
+    x = np.asarray(x, dtype = float)
+    if not np.all((y == 0) | (y == 1)):
+        print('Error: Observations in y must be either zero or one.')
+        return None
+    
+    # Arrange the candidate parameters in a column, 
+    # so that each row corresponds to one pair (beta_0, beta_1).
+    beta_0, beta_1 = np.broadcast_arrays(np.asarray(beta_0, dtype = float), 
+                                         np.asarray(beta_1, dtype = float))
+    beta_shape = beta_0.shape
+    beta_0 = beta_0.reshape(-1, 1)
+    beta_1 = beta_1.reshape(-1, 1)
+    
+    # The terms y*(beta_0 + x*beta_1) only require sums over the data.
+    like_sum = beta_0[:, 0]*np.sum(y) + beta_1[:, 0]*np.sum(y*x)
+    
+    # The terms log(1 + exp(beta_0 + x*beta_1)) are calculated in blocks 
+    # of observations, to limit the size of the temporary arrays.
+    block_size = max(1, 2**20 // len(beta_0))
+    for start in range(0, len(x), block_size):
+        x_block = x[start:start + block_size]
+        like_sum = like_sum - np.logaddexp(0, beta_0 + beta_1*x_block).sum(axis = 1)
+    
+    if beta_shape == ():
+        return float(like_sum[0])
+    else:
+        return like_sum.reshape(beta_shape)
+
+
 
 #--------------------------------------------------
 # Question 2
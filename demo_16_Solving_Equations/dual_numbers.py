@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Automatic Differentiation with Dual Numbers
+#
+##################################################
+#
+# This module calculates exact derivatives of a function f(x)
+# without writing the formulas for f_prime(x) and f_2prime(x),
+# for use in Newton's method in newton_f_opt() and newton_root_f().
+#
+# A dual number a + b*eps, with eps**2 = 0, carries the value
+# of a variable in a and its derivative in b.
+# Applying f to the dual number x + 1*eps gives
+# f(x) + f'(x)*eps, by the rules of calculus built into
+# the arithmetic below (forward-mode automatic differentiation).
+# A dual number with dual numbers inside gives the second derivative.
+#
+# The function f must be written with the operators
+# +, -, *, / and **, and with numpy functions such as np.exp() and np.log(),
+# not with the functions in the math module, which only accept floats.
+# This module is also used in demo_20_Optimization.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import numpy as np
+from typing import Callable, Tuple
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Dual numbers
+#--------------------------------------------------
+
+class Dual:
+    """
+    A dual number value + deriv*eps, with eps**2 = 0.
+    The value and deriv can be floats, numpy arrays or dual numbers.
+
+    >>> x = Dual(3.0, 1.0)
+    >>> x*x + 2*x
+    Dual(15.0, 8.0)
+    >>> 1/x
+    Dual(0.3333333333333333, -0.1111111111111111)
+    >>> y = np.exp(Dual(0.0, 1.0))
+    >>> float(y.value), float(y.deriv)
+    (1.0, 1.0)
+
+    Numpy arrays and numbers pass their arithmetic to the dual number,
+    rather than making an array of dual numbers:
+
+    >>> np.array([1.0, 2.0])*Dual(np.ones(2), np.ones(2))
+    Dual(array([1., 2.]), array([1., 2.]))
+    """
+
+    __slots__ = ['value', 'deriv']
+
+    # The methods called for numpy functions of dual numbers
+    # and for arithmetic with numpy arrays on the left,
+    # which would otherwise apply to each element of the array.
+    UFUNC_METHODS = {np.exp: 'exp', np.log: 'log', np.sqrt: 'sqrt',
+                     np.sin: 'sin', np.cos: 'cos', np.tanh: 'tanh',
+                     np.negative: '__neg__', np.positive: '__pos__',
+                     np.absolute: '__abs__'}
+    UFUNC_OPERATORS = {np.add: ('__add__', '__radd__'),
+                       np.subtract: ('__sub__', '__rsub__'),
+                       np.multiply: ('__mul__', '__rmul__'),
+                       np.true_divide: ('__truediv__', '__rtruediv__'),
+                       np.power: ('__pow__', '__rpow__')}
+
+    def __init__(self, value, deriv = 0.0):
+        self.value = value
+        self.deriv = deriv
+
+    def __repr__(self):
+        return 'Dual(%r, %r)' % (self.value, self.deriv)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        if ufunc in Dual.UFUNC_METHODS and len(inputs) == 1:
+            return getattr(inputs[0], Dual.UFUNC_METHODS[ufunc])()
+        if ufunc in Dual.UFUNC_OPERATORS and len(inputs) == 2:
+            name, reflected_name = Dual.UFUNC_OPERATORS[ufunc]
+            if isinstance(inputs[0], Dual):
+                return getattr(inputs[0], name)(inputs[1])
+            return getattr(inputs[1], reflected_name)(inputs[0])
+        return NotImplemented
+
+    # Arithmetic, with the rules for derivatives.
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.deriv + other.deriv)
+        return Dual(self.value + other, self.deriv)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Dual(- self.value, - self.deriv)
+
+    def __pos__(self):
+        return self
+
+    def __sub__(self, other):
+        return self + (- other)
+
+    def __rsub__(self, other):
+        return (- self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value*other.value,
+                        self.deriv*other.value + self.value*other.deriv)
+        return Dual(self.value*other, self.deriv*other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value/other.value,
+                        (self.deriv*other.value - self.value*other.deriv)/
+                        (other.value*other.value))
+        return Dual(self.value/other, self.deriv/other)
+
+    def __rtruediv__(self, other):
+        return Dual(other/self.value,
+                    - other*self.deriv/(self.value*self.value))
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return np.exp(other*np.log(self))
+        return Dual(self.value**other,
+                    other*self.value**(other - 1)*self.deriv)
+
+    def __rpow__(self, other):
+        value = other**self.value
+        return Dual(value, value*np.log(other)*self.deriv)
+
+    def __abs__(self):
+        return self*np.sign(float_value(self))
+
+    # Comparisons use the value only.
+
+    def __lt__(self, other):
+        return float_value(self) < float_value(other)
+
+    def __le__(self, other):
+        return float_value(self) <= float_value(other)
+
+    def __gt__(self, other):
+        return float_value(self) > float_value(other)
+
+    def __ge__(self, other):
+        return float_value(self) >= float_value(other)
+
+    # Functions called by numpy, e.g. np.exp(x) calls x.exp().
+
+    def exp(self):
+        value = np.exp(self.value)
+        return Dual(value, value*self.deriv)
+
+    def log(self):
+        return Dual(np.log(self.value), self.deriv/self.value)
+
+    def sqrt(self):
+        value = np.sqrt(self.value)
+        return Dual(value, self.deriv/(2*value))
+
+    def sin(self):
+        return Dual(np.sin(self.value), np.cos(self.value)*self.deriv)
+
+    def cos(self):
+        return Dual(np.cos(self.value), - np.sin(self.value)*self.deriv)
+
+    def tanh(self):
+        value = np.tanh(self.value)
+        return Dual(value, (1 - value*value)*self.deriv)
+
+
+def float_value(x):
+    """
+    Returns the value of x, without any derivatives,
+    if x is a dual number, or x itself otherwise.
+
+    >>> float_value(Dual(Dual(2.0, 1.0), Dual(1.0, 0.0)))
+    2.0
+    >>> float_value(3)
+    3
+    """
+
+    while isinstance(x, Dual):
+        x = x.value
+    return x
+
+
+def scalar_or_array(x):
+    """
+    Returns x as a float if it is a single number,
+    or as a numpy array otherwise.
+
+    >>> scalar_or_array(np.float64(2.5))
+    2.5
+    >>> scalar_or_array([1, 2])
+    array([1., 2.])
+    """
+
+    if np.ndim(x) == 0:
+        return float(x)
+    return np.asarray(x, dtype = float)
+
+
+def constant_derivative(f_x, x):
+    """
+    Returns zero, with the shape of x, as the derivative of f at x
+    when f(x) is a constant, a number or an array of numbers.
+    Raises a TypeError if f(x) contains dual numbers
+    but is not one, since its derivatives cannot be recovered.
+
+    >>> constant_derivative(3.0, 1.0)
+    0.0
+    >>> constant_derivative(np.array([Dual(1.0, 1.0)], dtype = object), 1.0)
+    Traceback (most recent call last):
+    ...
+    TypeError: f(x) is an array of dual numbers, not a dual number.
+    """
+
+    if np.asarray(f_x).dtype == object:
+        raise TypeError('f(x) is an array of dual numbers, not a dual number.')
+
+    return scalar_or_array(np.zeros_like(x, dtype = float))
+
+
+#--------------------------------------------------
+# Derivatives of functions
+#--------------------------------------------------
+
+def derivative(f: Callable, x: float) -> float:
+    """
+    Calculates the first derivative of f at x
+    with one dual number.
+
+    >>> derivative(lambda x: x**3 - 6*x**2 + 4*x + 2, 0.5)
+    -1.25
+    >>> derivative(lambda x: np.log(x) - np.exp(-x), 1.0)
+    1.3678794411714423
+    >>> derivative(lambda x: np.array([1.0, 2.0])*x, np.ones(2))
+    array([1., 2.])
+    >>> derivative(lambda x: 3.0, np.ones(2))
+    array([0., 0.])
+    """
+
+    f_x = f(Dual(x, 1.0))
+    if not isinstance(f_x, Dual):
+        return constant_derivative(f_x, x)
+
+    return scalar_or_array(f_x.deriv)
+
+
+def derivatives(f: Callable, x: float) -> Tuple[float, float, float]:
+    """
+    Calculates the value of f at x and its first and second derivatives,
+    with a dual number inside a dual number:
+    the inner dual number carries the first derivative
+    and the outer one the derivative of that.
+
+    >>> derivatives(lambda x: x**3 - 6*x**2 + 4*x + 2, 0.5)
+    (2.625, -1.25, -9.0)
+    >>> [round(d, 12) for d in derivatives(lambda x: np.sin(x)*x, np.pi/2)]
+    [1.570796326795, 1.0, -1.570796326795]
+    >>> derivatives(lambda x: 3.0, 1.0)
+    (3.0, 0.0, 0.0)
+    """
+
+    f_x = f(Dual(Dual(x, 1.0), Dual(1.0, 0.0)))
+    if not isinstance(f_x, Dual):
+        f_x = Dual(f_x, constant_derivative(f_x, x))
+    value = f_x.value if isinstance(f_x.value, Dual) else Dual(f_x.value, 0.0)
+    deriv = f_x.deriv if isinstance(f_x.deriv, Dual) else Dual(f_x.deriv, 0.0)
+
+    return (scalar_or_array(value.value), scalar_or_array(value.deriv),
+            scalar_or_array(deriv.deriv))
+
+
+def auto_derivative(f: Callable) -> Callable:
+    """
+    Returns the function f_prime(x), the first derivative of f,
+    for use in place of a hand-written derivative, as in newton_root_f().
+
+    >>> f_prime = auto_derivative(lambda x: np.log(x) - np.exp(-x))
+    >>> f_prime(1.0), float(1/1.0 + np.exp(-1.0))
+    (1.3678794411714423, 1.3678794411714423)
+
+    It also works on arrays of x:
+
+    >>> f_prime(np.array([1.0, 2.0]))
+    array([1.36787944, 0.63533528])
+    """
+
+    return lambda x: derivative(f, x)
+
+
+def auto_derivatives(f: Callable) -> Tuple[Callable, Callable]:
+    """
+    Returns the functions f_prime(x) and f_2prime(x),
+    the first and second derivatives of f,
+    for use in place of hand-written derivatives,
+    as in newton_f_opt(x0, f_prime, f_2prime).
+
+    >>> f_prime, f_2prime = auto_derivatives(lambda x: x**3 - 6*x**2 + 4*x + 2)
+    >>> f_prime(0.5), f_2prime(0.5)
+    (-1.25, -9.0)
+    """
+
+    return (lambda x: derivative(f, x),
+            lambda x: derivatives(f, x)[2])
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Root Finding by Grid Search and by Brackets
+#
+##################################################
+#
+# Compares finding the roots of quad_fn() in scipy_solving.py
+# by the value on a grid closest to zero, with steps of
+# 0.01, 0.0001 and 0.000001, with find_roots_bracket(),
+# which scans a coarse grid for sign changes
+# and refines each bracket with brentq().
+# The table shows the time, the number of function evaluations
+# and the largest error in the two roots.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+
+import root_solvers as rs
+
+
+def quad_fn(x, a, b, c):
+    f = a*x**2 + b*x + c
+    return(f)
+
+
+# The roots of quad_fn with these parameters are -2 - 2*sqrt(2) and -2 + 2*sqrt(2).
+a = 1/4
+b = 1
+c = -1
+true_roots = np.array([-2 - 2*np.sqrt(2), -2 + 2*np.sqrt(2)])
+
+
+def grid_roots(step):
+    """ (number) -> (array, int)
+
+    Return the two roots of quad_fn found as in scipy_solving.py,
+    with the value closest to zero on a grid with the given step
+    on each side of the vertex at -2, and the number of evaluations.
+    """
+
+    roots = []
+    num_evals = 0
+    for x_min, x_max in [(-10, -2), (-2, 5)]:
+        x_grid = np.arange(x_min, x_max, step)
+        f_grid = quad_fn(x_grid, a, b, c)
+        roots.append(x_grid[abs(f_grid).argmin()])
+        num_evals = num_evals + len(x_grid)
+
+    return np.array(roots), num_evals
+
+
+def bracket_roots(num_scan):
+    """ (int) -> (array, int)
+
+    Return the roots of quad_fn found by find_roots_bracket()
+    and the number of evaluations.
+    """
+
+    soln = rs.find_roots_bracket(quad_fn, -10, 5, num_scan = num_scan,
+                                 args = (a, b, c))
+
+    return soln.x, soln.nfev
+
+
+def time_it(search, *args):
+    """ (function, ...) -> (number, object)
+
+    Return the number of milliseconds it takes to run
+    search(*args) and the result, averaged over 10 runs.
+    """
+
+    t1 = time.perf_counter()
+    for k in range(10):
+        result = search(*args)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0 / 10, result
+
+
+if __name__ == '__main__':
+
+    print("method\t\t\ttime (ms)\tevals\t\terror")
+    for step in [0.01, 0.0001, 0.000001]:
+        run_time, (roots, num_evals) = time_it(grid_roots, step)
+        print("grid, step {0:<8}\t{1:9.3f}\t{2:9d}\t{3:.2e}".format(
+                step, run_time, num_evals, np.max(np.abs(roots - true_roots))))
+    for num_scan in [15, 100]:
+        run_time, (roots, num_evals) = time_it(bracket_roots, num_scan)
+        print("brackets, scan {0:<4}\t{1:9.3f}\t{2:9d}\t{3:.2e}".format(
+                num_scan, run_time, num_evals, np.max(np.abs(roots - true_roots))))
@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Root Solvers for Many Equations at Once
+#
+##################################################
+#
+# This module contains versions of secant_root_f() and
+# newton_root_f() from scipy_solving.py that solve
+# many equations f(x, *args) = 0 at the same time,
+# one for each starting value or set of parameters,
+# using numpy arrays instead of loops over the equations.
+#
+# Each equation, or "lane", is iterated until it converges
+# and is then left out of the later iterations,
+# so the lanes that converge quickly do not cost anything
+# while the others are still iterating.
+#
+# It also contains a function to find all the roots of an equation
+# in an interval, by finding the brackets where the function changes sign,
+# and a function to solve a system of equations, 
+# such as my_eqns_33_p() in scipy_solving.py, 
+# for many sets of parameters with optimize.root(), 
+# starting each solve at the solution for the previous parameters.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import numpy as np
+from scipy import optimize
+from scipy.optimize import OptimizeResult, brentq
+from typing import Callable, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Preparing the lanes
+#--------------------------------------------------
+
+def broadcast_lanes(x: np.ndarray, args: Tuple) -> Tuple[np.ndarray, list, tuple]:
+    """
+    Broadcasts the starting values x against the parameters in args
+    and returns the flattened starting values,
+    the list of flattened parameters, one value for each lane,
+    and the shape of the broadcast arrays.
+
+    >>> x, args, shape = broadcast_lanes(1.0, (np.array([1, 2, 3]),))
+    >>> x, args, shape
+    (array([1., 1., 1.]), [array([1., 2., 3.])], (3,))
+    """
+
+    arrays = np.broadcast_arrays(np.asarray(x, dtype = float),
+                                 *[np.asarray(arg, dtype = float) for arg in args])
+    shape = arrays[0].shape
+    flat = [np.array(array, dtype = float).reshape(-1) for array in arrays]
+
+    return flat[0], flat[1:], shape
+
+
+def lane_result(x: np.ndarray, f_x: np.ndarray, nit: np.ndarray, nfev: np.ndarray,
+                converged: np.ndarray, shape: tuple) -> OptimizeResult:
+    """
+    Collects the results for the lanes into a scipy OptimizeResult
+    with the arrays reshaped to shape, and prints a message
+    if any of the lanes did not converge.
+
+    >>> soln = lane_result(np.array([1.0, 2.0]), np.array([0.0, 0.5]),
+    ...                    np.array([3, 100]), np.array([4, 101]),
+    ...                    np.array([True, False]), (2,))
+    Exceeded allowed number of iterations in 1 of 2 lanes
+    >>> soln.success
+    False
+    """
+
+    num_failed = int(np.sum(~ converged))
+    if num_failed > 0:
+        print("Exceeded allowed number of iterations in %d of %d lanes"
+              % (num_failed, len(converged)))
+
+    return OptimizeResult(x = x.reshape(shape), fun = f_x.reshape(shape),
+                          nit = nit.reshape(shape), nfev = nfev.reshape(shape),
+                          converged = converged.reshape(shape),
+                          success = num_failed == 0)
+
+
+#--------------------------------------------------
+# Secant method
+#--------------------------------------------------
+
+def secant_root_vec(func: Callable[..., np.ndarray], x0: np.ndarray,
+                    x1: np.ndarray, tol: float = 1e-7, num_iter: int = 100,
+                    args: Tuple = ()) -> OptimizeResult:
+    """
+    Solves for the roots of the equations func(x, *args) = 0
+    using the secant method, as in secant_root_f(),
+    for each pair of starting values in x0 and x1 and each set
+    of parameters in args, which are broadcast against each other.
+    The function func must accept arrays of x and of the parameters.
+
+    Each lane stops when abs(func(x)) < tol
+    and is then excluded from the later iterations.
+    A lane also stops, without converging, if the secant line is flat.
+
+    Returns a scipy OptimizeResult with the arrays
+    x (the roots), fun (the function values),
+    nit (the number of iterations for each lane),
+    nfev (the number of function evaluations for each lane),
+    converged (True for the lanes that found a root)
+    and success (True if all lanes found a root).
+
+    >>> f = lambda x: np.log(x) - np.exp(-x)
+    >>> soln = secant_root_vec(f, 1, np.array([2.0, 1.5, 3.0]))
+    >>> soln.x.round(7)
+    array([1.3097996, 1.3097996, 1.3097996])
+    >>> soln.nit
+    array([5, 4, 6])
+
+    Solve the equation log(x) = a*exp(-x) for several values of a:
+
+    >>> f_a = lambda x, a: np.log(x) - a*np.exp(-x)
+    >>> soln = secant_root_vec(f_a, 1, 2, args = (np.array([0.5, 1.0, 2.0]),))
+    >>> soln.x.round(7)
+    array([1.168199 , 1.3097996, 1.5372017])
+    >>> soln = secant_root_vec(f, 1, 2, num_iter = 3)
+    Exceeded allowed number of iterations in 1 of 1 lanes
+    >>> bool(soln.converged)
+    False
+    """
+
+    x1, lane_args, shape = broadcast_lanes(x1, (x0,) + tuple(args))
+    x0 = lane_args[0]
+    args = lane_args[1:]
+    f0 = func(x0, *args)
+    f1 = func(x1, *args)
+    nit = np.zeros(len(x1), dtype = int)
+    nfev = np.full(len(x1), 2)
+    converged = np.abs(f1) < tol
+    active = ~ converged
+
+    for i in range(num_iter):
+
+        # Iterate only the lanes that have not stopped.
+        lanes = np.flatnonzero(active)
+        if len(lanes) == 0:
+            break
+        denom = f1[lanes] - f0[lanes]
+        is_flat = (denom == 0) | np.isnan(denom)
+        active[lanes[is_flat]] = False
+        lanes = lanes[~ is_flat]
+        denom = denom[~ is_flat]
+
+        x2 = x1[lanes] - f1[lanes]*(x1[lanes] - x0[lanes])/denom
+        f2 = func(x2, *[arg[lanes] for arg in args])
+
+        x0[lanes] = x1[lanes]
+        f0[lanes] = f1[lanes]
+        x1[lanes] = x2
+        f1[lanes] = f2
+        nit[lanes] += 1
+        nfev[lanes] += 1
+
+        is_root = np.abs(f2) < tol
+        converged[lanes[is_root]] = True
+        active[lanes[is_root]] = False
+
+    return lane_result(x1, f1, nit, nfev, converged, shape)
+
+
+#--------------------------------------------------
+# Newton's method
+#--------------------------------------------------
+
+def newton_root_vec(func: Callable[..., np.ndarray],
+                    func_prime: Callable[..., np.ndarray], x0: np.ndarray,
+                    tol: float = 1e-7, num_iter: int = 100,
+                    args: Tuple = ()) -> OptimizeResult:
+    """
+    Solves for the roots of the equations func(x, *args) = 0
+    using Newton's method, as in newton_root_f(),
+    for each starting value in x0 and each set of parameters in args,
+    which are broadcast against each other.
+    The functions func and its derivative func_prime
+    must accept arrays of x and of the parameters.
+
+    Each lane stops when abs(func(x)) < tol
+    and is then excluded from the later iterations.
+    A lane also stops, without converging, if the derivative is zero.
+    Returns a scipy OptimizeResult, as in secant_root_vec().
+
+    >>> f = lambda x: np.log(x) - np.exp(-x)
+    >>> f_prime = lambda x: 1/x + np.exp(-x)
+    >>> soln = newton_root_vec(f, f_prime, np.array([1.0, 0.5, 2.0]))
+    >>> soln.x.round(7)
+    array([1.3097996, 1.3097996, 1.3097996])
+    >>> soln.nit
+    array([4, 5, 4])
+
+    The parameters can be a grid of values:
+
+    >>> f_a = lambda x, a, b: np.log(b*x) - a*np.exp(-x)
+    >>> f_a_prime = lambda x, a, b: 1/x + a*np.exp(-x)
+    >>> soln = newton_root_vec(f_a, f_a_prime, 1, args = (np.array([[1.0], [2.0]]),
+    ...                                                  np.array([1.0, 2.0, 3.0])))
+    >>> soln.x.shape
+    (2, 3)
+    >>> bool(np.all(np.abs(f_a(soln.x, np.array([[1.0], [2.0]]),
+    ...                        np.array([1.0, 2.0, 3.0]))) < 1e-7))
+    True
+    """
+
+    x, args, shape = broadcast_lanes(x0, args)
+    f_x = func(x, *args)
+    nit = np.zeros(len(x), dtype = int)
+    nfev = np.ones(len(x), dtype = int)
+    converged = np.abs(f_x) < tol
+    active = ~ converged
+
+    for i in range(num_iter):
+
+        # Iterate only the lanes that have not stopped.
+        lanes = np.flatnonzero(active)
+        if len(lanes) == 0:
+            break
+        lane_args = [arg[lanes] for arg in args]
+        slope = func_prime(x[lanes], *lane_args)
+        is_flat = (slope == 0) | np.isnan(slope)
+        active[lanes[is_flat]] = False
+        lanes = lanes[~ is_flat]
+        lane_args = [arg[~ is_flat] for arg in lane_args]
+
+        x[lanes] = x[lanes] - f_x[lanes]/slope[~ is_flat]
+        f_x[lanes] = func(x[lanes], *lane_args)
+        nit[lanes] += 1
+        nfev[lanes] += 1
+
+        is_root = np.abs(f_x[lanes]) < tol
+        converged[lanes[is_root]] = True
+        active[lanes[is_root]] = False
+
+    return lane_result(x, f_x, nit, nfev, converged, shape)
+
+
+#--------------------------------------------------
+# All the roots in an interval
+#--------------------------------------------------
+
+def find_roots_bracket(func: Callable[..., np.ndarray], x_min: float, 
+                       x_max: float, num_scan: int = 100, args: Tuple = (), 
+                       xtol: float = 2e-12) -> OptimizeResult:
+    """
+    Finds all the roots of func(x, *args) = 0 between x_min and x_max
+    by evaluating func on a coarse grid of num_scan + 1 points, 
+    in one call with an array of x, 
+    and then refining each interval where func changes sign, 
+    i.e. each bracket, with Brent's method in brentq(). 
+    The roots are accurate to about xtol, 
+    instead of to the step of a grid of values of x. 
+    
+    A pair of roots closer together than the spacing of the grid, 
+    or a root where the function touches zero without changing sign, 
+    can be missed: increase num_scan if the function may have such roots. 
+    
+    Returns a scipy OptimizeResult with the array x of the roots 
+    in increasing order, the number of brackets found and 
+    the total number of function evaluations nfev. 
+    
+    >>> quad_fn = lambda x, a, b, c: a*x**2 + b*x + c
+    >>> soln = find_roots_bracket(quad_fn, -10, 5, num_scan = 15, 
+    ...                           args = (1/4, 1, -1))
+    >>> soln.x
+    array([-4.82842712,  0.82842712])
+    >>> bool(np.all(np.abs(soln.x - (-2 + np.array([-1, 1])*2*np.sqrt(2))) < 1e-15))
+    True
+    >>> soln.nfev
+    30
+    >>> find_roots_bracket(np.sin, -1, 7, num_scan = 8).x.round(12)
+    array([0.        , 3.14159265, 6.28318531])
+    >>> find_roots_bracket(quad_fn, 1, 5, args = (1/4, 1, -1)).x
+    array([], dtype=float64)
+    """
+    
+    x_scan = np.linspace(x_min, x_max, num_scan + 1)
+    f_scan = np.asarray(func(x_scan, *args), dtype = float)
+    nfev = len(x_scan)
+    
+    # Roots at the points on the grid.
+    roots = list(x_scan[f_scan == 0])
+    
+    # Brackets where the function changes sign.
+    brackets = np.flatnonzero(np.sign(f_scan[:-1])*np.sign(f_scan[1:]) < 0)
+    for k in brackets:
+        root, info = brentq(func, x_scan[k], x_scan[k + 1], args = args, 
+                            xtol = xtol, full_output = True)
+        roots.append(root)
+        nfev = nfev + info.function_calls
+    
+    return OptimizeResult(x = np.sort(np.array(roots, dtype = float)), 
+                          num_brackets = len(brackets), nfev = nfev)
+
+
+#--------------------------------------------------
+# Systems of equations for many sets of parameters
+#--------------------------------------------------
+
+# The system of equations with parameters solved in scipy_solving.py, 
+# which imports it from here, 
+# defined at the top level so that it can be sent to worker processes.
+
+def my_eqns_33_p(x, parms):
+    F1 = x[0] + x[1] + x[2]**2 - parms[0]
+    F2 = x[0]**2 - x[1] + x[2] - parms[1]
+    F3 = 2 * x[0] - x[1]**2 + x[2] - parms[2]
+    return [F1, F2, F3]
+
+
+def root_batch_chunk(func: Callable, parms_list: np.ndarray, x0: np.ndarray,
+                     warm_start: bool = True, method: str = 'hybr') -> List:
+    """
+    Solves the system func(x, parms) = 0 with optimize.root()
+    for each row parms of parms_list, in order, 
+    and returns the lists of the solutions, the function values, 
+    the numbers of function evaluations and of iterations, 
+    the success flags and the messages. 
+    The methods 'hybr' and 'lm' do not report the iterations, 
+    so the number of iterations is nan for them.
+    
+    If warm_start is True, each solve starts at the solution
+    for the previous row (continuation along the path of parameters). 
+    If that solve fails, it is tried again from x0. 
+    A solve that fails or raises an error is recorded 
+    as a failure, with nan in the solution, 
+    and the next solve starts from the last solution found. 
+    
+    >>> x, fun, nfev, nit, success, message = root_batch_chunk(my_eqns_33_p, 
+    ...     np.array([[12, 2, 1], [12.5, 2, 1]]), np.array([1.0, 1.0, 1.0]))
+    >>> np.array(x).round(6)
+    array([[1.      , 2.      , 3.      ],
+           [0.953652, 1.999284, 3.089832]])
+    >>> success
+    [True, True]
+    >>> nit
+    [nan, nan]
+    """
+    
+    x0 = np.asarray(x0, dtype = float)
+    x_start = x0
+    x_list = []
+    fun_list = []
+    nfev_list = []
+    nit_list = []
+    success_list = []
+    message_list = []
+    
+    for parms in parms_list:
+        
+        nfev = 0
+        nit = np.nan
+        soln = None
+        starts = [x_start, x0] if warm_start and x_start is not x0 else [x0]
+        for x_try in starts:
+            try:
+                soln = optimize.root(func, x_try, args = (parms,), method = method)
+                nfev = nfev + soln.nfev
+                if soln.get('nit') is not None:
+                    nit = np.nansum([nit, soln.nit])
+                if soln.success:
+                    break
+            except (ValueError, ArithmeticError, np.linalg.LinAlgError) as error:
+                soln = OptimizeResult(x = np.full(len(x0), np.nan), 
+                                      fun = np.full(len(x0), np.nan), 
+                                      success = False, message = str(error))
+        
+        if soln.success:
+            x_list.append(soln.x)
+            fun_list.append(np.asarray(soln.fun))
+            if warm_start:
+                x_start = soln.x
+        else:
+            x_list.append(np.full(len(x0), np.nan))
+            fun_list.append(np.full(len(x0), np.nan))
+        nfev_list.append(nfev)
+        nit_list.append(nit)
+        success_list.append(bool(soln.success))
+        message_list.append(soln.message)
+    
+    return [x_list, fun_list, nfev_list, nit_list, success_list, message_list]
+
+
+def root_batch(func: Callable, parms_matrix: np.ndarray, x0: np.ndarray,
+               warm_start: bool = True, method: str = 'hybr', 
+               num_workers: int = 1) -> OptimizeResult:
+    """
+    Solves the system func(x, parms) = 0 with optimize.root()
+    for each row parms of parms_matrix, 
+    with root_batch_chunk(), so that each solve can start 
+    at the solution for the previous row (warm_start). 
+    This works best when the rows are in order along a path, 
+    so that the solutions for neighboring rows are close. 
+    
+    If num_workers > 1, the rows are split into that many chunks
+    of consecutive rows, which are solved in separate processes, 
+    each starting from x0. 
+    The function func must then be defined at the top level 
+    of a module, so that it can be sent to the worker processes. 
+    
+    Failed solves do not stop the batch. 
+    Returns a scipy OptimizeResult with the arrays
+    x (one row of solutions for each row of parms_matrix, 
+    nan if the solve failed), fun, nfev, 
+    nit (nan for the methods 'hybr' and 'lm', which do not report it), 
+    converged (True for each solve that succeeded), 
+    the list of messages, the number of failures num_failed
+    and success (True if all solves succeeded). 
+    
+    >>> parms_matrix = np.column_stack([np.linspace(12, 24, 7), 
+    ...                                 np.linspace(2, 4, 7), 
+    ...                                 np.linspace(1, 2, 7)])
+    >>> soln = root_batch(my_eqns_33_p, parms_matrix, [1, 1, 1])
+    >>> soln.x[[0, -1]].round(6)
+    array([[1.      , 2.      , 3.      ],
+           [1.325285, 2.273186, 4.516805]])
+    >>> soln.num_failed
+    0
+    >>> soln_kr = root_batch(my_eqns_33_p, parms_matrix, [1, 1, 1], 
+    ...                      method = 'krylov')
+    >>> bool(np.all(soln_kr.nit > 0)), bool(np.all(np.isnan(soln.nit)))
+    (True, True)
+    >>> soln_cold = root_batch(my_eqns_33_p, parms_matrix, [1, 1, 1], 
+    ...                        warm_start = False)
+    >>> bool(np.sum(soln.nfev) < np.sum(soln_cold.nfev))
+    True
+    >>> soln_pool = root_batch(my_eqns_33_p, parms_matrix, [1, 1, 1], 
+    ...                        num_workers = 2)
+    >>> bool(np.allclose(soln_pool.x, soln.x))
+    True
+    
+    The equation x**2 + parms[0] = 0 has no solution when parms[0] > 0:
+    
+    >>> soln = root_batch(lambda x, parms: x**2 + parms[0], [[-4], [1], [-9]], [1])
+    >>> soln.x
+    array([[ 2.],
+           [nan],
+           [ 3.]])
+    >>> soln.converged, soln.num_failed
+    (array([ True, False,  True]), 1)
+    """
+    
+    parms_matrix = np.asarray(parms_matrix, dtype = float)
+    x0 = np.asarray(x0, dtype = float)
+    
+    if num_workers <= 1:
+        results = [root_batch_chunk(func, parms_matrix, x0, warm_start, method)]
+    else:
+        chunks = np.array_split(parms_matrix, num_workers)
+        with ProcessPoolExecutor(max_workers = num_workers) as executor:
+            futures = [executor.submit(root_batch_chunk, func, chunk, x0, 
+                                       warm_start, method) 
+                       for chunk in chunks if len(chunk) > 0]
+            results = [future.result() for future in futures]
+    
+    # Put the chunks back together in order.
+    x_list, fun_list, nfev_list, nit_list, success_list, message_list = [
+        sum([result[k] for result in results], []) for k in range(6)]
+    converged = np.array(success_list)
+    
+    return OptimizeResult(x = np.array(x_list), fun = np.array(fun_list), 
+                          nfev = np.array(nfev_list), nit = np.array(nit_list), 
+                          converged = converged, 
+                          message = message_list, 
+                          num_failed = int(np.sum(~ converged)), 
+                          success = bool(np.all(converged)))
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
@@ -32,6 +32,12 @@ import math
 import matplotlib.pyplot as plt
 from scipy.optimize import fsolve
 from scipy import optimize
+import time
+# Root solvers for many equations at once,
+# in the module root_solvers.py in this folder.
+import root_solvers as rs
+# Automatic derivatives, in the module dual_numbers.py in this folder.
+import dual_numbers as dn
 # from scipy.optimize import minimize
 # from scipy.optimize import Bounds
 # from scipy.optimize import LinearConstraint
@@ -141,6 +147,27 @@ print(quad_fn(x_root_2, a, b, c))
 # and the accuracy is limited by the step size between grid points. 
 # Other approaches are designed to take fewer steps to approach roots using information from more than one point at a time. 
 
+# A better use of the grid is to find where the function changes sign. 
+# A coarse grid is enough to find the intervals, or brackets, 
+# that contain a root, and then a bracketing method such as
+# Brent's method (below, we see the bisection method it builds on) 
+# finds each root to machine precision. 
+# The function find_roots_bracket() in root_solvers.py does this 
+# and returns all the roots in the interval. 
+
+soln_brackets = rs.find_roots_bracket(quad_fn, -10, 5, num_scan = 15, 
+                                      args = (a, b, c))
+print(soln_brackets.x)
+print(quad_fn(soln_brackets.x, a, b, c))
+
+# It took only this many evaluations of quad_fn(), 
+# compared to 1500 for the first grid:
+print(soln_brackets.nfev)
+
+# The script find_roots_time.py compares the time and accuracy 
+# of the two approaches. 
+
+
 
 #--------------------------------------------------
 ### Bisection Method
@@ -381,6 +408,24 @@ print(x_root)
 # but there's a catch: you have to know how to calculate the derivative
 # (and that the derivative exists!). 
 
+# The derivative can be calculated automatically, and exactly, 
+# with dual numbers, which carry the derivative
+# along with the value through each step of the calculation. 
+# For this to work, f(x) must use numpy functions, 
+# rather than the math module. 
+
+def f(x):
+    f_out = np.log(x) - np.exp(-x)
+    return f_out
+
+f_prime = dn.auto_derivative(f)
+
+# Now newton_root_f() uses this f_prime instead of the formula above:
+x_root = newton_root_f(1, 10**(-7), 4)
+print(x_root)
+# 1.3097995858041345
+
+
 
 
 ################################################################################
@@ -523,12 +568,16 @@ print(my_eqns_33(soln_m33_2.x))
 #--------------------------------------------------
 
 # Some systems of equations depend on other fixed parameters. 
+# The function my_eqns_33_p() in root_solvers.py 
+# is the system my_eqns_33() above, 
+# with the constants 12, 2 and 1 replaced by parms[0], parms[1] and parms[2]:
+#     x[0] + x[1] + x[2]**2 - parms[0]
+#     x[0]**2 - x[1] + x[2] - parms[1]
+#     2 * x[0] - x[1]**2 + x[2] - parms[2]
+# It is defined there so that it can be sent to other processes, 
+# as in the batches of solves below. 
 
-def my_eqns_33_p(x, parms):
-    F1 = x[0] + x[1] + x[2]**2 - parms[0]
-    F2 = x[0]**2 - x[1] + x[2] - parms[1]
-    F3 = 2 * x[0] - x[1]**2 + x[2] - parms[2]
-    return [F1, F2, F3]
+from root_solvers import my_eqns_33_p
 
 # You can solve for these as above, 
 # except that you pass the extra parameters to optimize,root(). 
@@ -579,6 +628,103 @@ print(soln_m33_p.fun)
 print(my_eqns_33_p(soln_m33_p.x, parms))
 
 
+##################################################
+# Solving Many Equations at Once
+##################################################
+
+# Often the same equation must be solved for many sets of parameters, 
+# such as the price of every product in a store. 
+# Suppose the share of customers who buy a product at price p is
+# s = 1/(1 + exp(-(a - b*p))), and the product costs c. 
+# The price that maximizes profit (p - c)*s solves 
+# p - c - (1 + exp(a - b*p))/b = 0.
+
+def price_eqn(p, a, b, c):
+    # Note that this calculation also operates on vectors. 
+    return p - c - (1 + np.exp(a - b*p))/b
+
+def price_eqn_prime(p, a, b, c):
+    return 1 + np.exp(a - b*p)
+
+
+# Draw parameters for 10,000 products.
+num_products = 10000
+rng = np.random.default_rng(3311)
+a_prod = rng.uniform(1, 5, num_products)
+b_prod = rng.uniform(0.5, 2, num_products)
+c_prod = rng.uniform(0.5, 2, num_products)
+
+
+# One approach is to solve the equations one at a time in a loop.
+t1 = time.perf_counter()
+p_loop = np.zeros(num_products)
+for i in range(num_products):
+    p_loop[i] = optimize.newton(price_eqn, c_prod[i], price_eqn_prime, 
+                                args = (a_prod[i], b_prod[i], c_prod[i]))
+t2 = time.perf_counter()
+print("Time for loop (ms): %f" % ((t2 - t1)*1000))
+
+
+# Instead, newton_root_vec() takes all the products together, 
+# with one "lane" for each product, 
+# and stops iterating on each lane once it has converged.
+t1 = time.perf_counter()
+soln_vec = rs.newton_root_vec(price_eqn, price_eqn_prime, c_prod, 
+                              tol = 10**(-10), 
+                              args = (a_prod, b_prod, c_prod))
+t2 = time.perf_counter()
+print("Time for newton_root_vec (ms): %f" % ((t2 - t1)*1000))
+
+# The prices are the same:
+print(np.max(np.abs(soln_vec.x - p_loop)))
+
+# The number of iterations differs from product to product:
+print(np.bincount(soln_vec.nit))
+
+
+# The secant method works the same way, without the derivative, 
+# starting with two prices for each product. 
+soln_sec = rs.secant_root_vec(price_eqn, c_prod, c_prod + 1/b_prod, 
+                              tol = 10**(-10), 
+                              args = (a_prod, b_prod, c_prod))
+print(np.max(np.abs(soln_sec.x - p_loop)))
+print(np.bincount(soln_sec.nit))
+
+
+# The same idea applies to systems of equations. 
+# To solve my_eqns_33_p() for many sets of parameters, 
+# start each solve at the solution for the previous parameters, 
+# when the parameters change gradually along a path. 
+parms_path = np.column_stack([np.linspace(12, 24, 50), 
+                              np.linspace(2, 4, 50), 
+                              np.linspace(1, 2, 50)])
+
+soln_batch = rs.root_batch(rs.my_eqns_33_p, parms_path, [1, 1, 1])
+soln_batch_cold = rs.root_batch(rs.my_eqns_33_p, parms_path, [1, 1, 1], 
+                                warm_start = False)
+
+# The number of function evaluations for each solve:
+print(soln_batch.nfev)
+print(soln_batch_cold.nfev)
+print(np.sum(soln_batch.nfev), np.sum(soln_batch_cold.nfev))
+
+# Methods other than 'hybr' and 'lm' also report the iterations, 
+# which fall even more with the warm start for the 'krylov' method:
+soln_batch_kr = rs.root_batch(rs.my_eqns_33_p, parms_path, [1, 1, 1], 
+                              method = 'krylov')
+soln_batch_kr_cold = rs.root_batch(rs.my_eqns_33_p, parms_path, [1, 1, 1], 
+                                   method = 'krylov', warm_start = False)
+print(soln_batch_kr.nit)
+print(np.sum(soln_batch_kr.nit), np.sum(soln_batch_kr_cold.nit))
+
+# Any failures are recorded, without stopping the batch:
+print(soln_batch.num_failed)
+
+# For large batches, set num_workers to split the rows 
+# across several processes, in a script with 
+# an if __name__ == "__main__": block.
+
+
 ##################################################
 # End
 ##################################################
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Automatic Derivatives with Dual Numbers
+#
+##################################################
+#
+# Compares the hand-written derivatives f_prime() and f_2prime()
+# from scipy_optimization.py and scipy_solving.py
+# with the derivatives from auto_derivatives() in dual_numbers.py
+# in the folder demo_16_Solving_Equations,
+# for one evaluation and for a full run of Newton's method.
+#
+##################################################
+"""
+
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', 'demo_16_Solving_Equations'))
+import dual_numbers as dn
+
+
+# The cubic function from scipy_optimization.py.
+def f_cubic(x):
+    return x**3-6*x**2+4*x+2
+
+def f_cubic_prime(x):
+    return 3*x**2-12*x+4
+
+def f_cubic_2prime(x):
+    return 6*x - 12
+
+
+# The function from scipy_solving.py, written with numpy functions.
+def f_log(x):
+    return np.log(x) - np.exp(-x)
+
+def f_log_prime(x):
+    return 1/x + np.exp(-x)
+
+
+def newton_f_opt(x0, f_prime, f_2prime, maxiter = 100, tol = 0.0001):
+    """ (number, function, function) -> number
+
+    Newton's method for optimization, as in scipy_optimization.py,
+    without the printing.
+    """
+
+    x = x0
+    for i in range(maxiter):
+        x_next = x - f_prime(x)/f_2prime(x)
+        if abs(x_next - x) < tol:
+            break
+        x = x_next
+
+    return x
+
+
+def newton_root_f(f, f_prime, x0, tol, num_iter):
+    """ (function, function, number, number, int) -> number
+
+    Newton's method for roots, as in scipy_solving.py,
+    with the functions as arguments.
+    """
+
+    x_i = x0
+    for i in range(num_iter):
+        x_i = x_i - f(x_i)/f_prime(x_i)
+        if (abs(f(x_i)) < tol):
+            return x_i
+
+    return None
+
+
+def time_it(func, *args, num_reps = 10000):
+    """ (function, ...) -> (number, object)
+
+    Return the number of microseconds it takes to run func(*args),
+    averaged over num_reps runs, and the result.
+    """
+
+    t1 = time.perf_counter()
+    for k in range(num_reps):
+        result = func(*args)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000000.0 / num_reps, result
+
+
+def print_row(name, func, hand_args, auto_args):
+    """ (str, function, tuple, tuple) -> NoneType
+
+    Print the time for func(*hand_args), with the hand-written derivatives,
+    and func(*auto_args), with the automatic derivatives,
+    the ratio of the times and the results.
+    """
+
+    hand_time, hand_result = time_it(func, *hand_args)
+    auto_time, auto_result = time_it(func, *auto_args)
+    print("{0:16}\t{1:8.2f}\t{2:8.2f}\t{3:6.1f}\t{4:.12f}\t{5:.12f}".format(
+            name, hand_time, auto_time, auto_time / hand_time,
+            float(hand_result), float(auto_result)))
+
+
+if __name__ == '__main__':
+
+    cubic_prime, cubic_2prime = dn.auto_derivatives(f_cubic)
+    log_prime = dn.auto_derivative(f_log)
+    call = lambda func, x: func(x)
+
+    print("calculation\thand (us)\tauto (us)\tratio\thand result\tauto result")
+    print_row("f_prime, cubic", call, (f_cubic_prime, 0.5), (cubic_prime, 0.5))
+    print_row("f_2prime, cubic", call, (f_cubic_2prime, 0.5), (cubic_2prime, 0.5))
+    print_row("f_prime, log", call, (f_log_prime, 1.0), (log_prime, 1.0))
+    print_row("newton_f_opt", newton_f_opt,
+              (0, f_cubic_prime, f_cubic_2prime),
+              (0, cubic_prime, cubic_2prime))
+    print_row("newton_root_f", newton_root_f,
+              (f_log, f_log_prime, 1, 10**(-7), 100),
+              (f_log, log_prime, 1, 10**(-7), 100))
@@ -0,0 +1,552 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Functions for Logistic Regression
+#
+##################################################
+#
+# This module collects functions for calculating
+# the likelihood function for logistic regression,
+# its gradient vector and its Hessian matrix,
+# for use with the optimization routines in
+# logistic_calculation.py.
+#
+# The functions take numpy arrays:
+#   beta: the vector of coefficients, of length k
+#   y: the vector of binary dependent variables, of length n
+#   X: the n x k matrix of explanatory variables
+# Convert pandas objects once with np.asarray()
+# before passing them to these functions.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, LinAlgError
+from scipy.optimize import OptimizeResult
+from scipy.special import expit
+from typing import Callable, Dict, Tuple
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Work buffers
+#--------------------------------------------------
+
+def logit_work_buffers(num_obs: int, num_vars: int,
+                       chunk_size: int = 4096) -> Dict[str, np.ndarray]:
+    """
+    Allocates the arrays used in logit_fused(),
+    for a dataset with num_obs observations and num_vars variables.
+    The same buffers can be passed to every call during an optimization
+    so that no arrays of length num_obs are created in each iteration.
+    The Hessian matrix is accumulated in blocks of chunk_size rows
+    with weighted_gram(), so 'X_weighted' holds only one block.
+
+    >>> work = logit_work_buffers(5, 2)
+    >>> sorted(work.keys())
+    ['X_beta', 'X_weighted', 'error', 'grad', 'hess', 'log_terms', 'probs', 'weights']
+    >>> work['X_weighted'].shape
+    (5, 2)
+    >>> logit_work_buffers(10000, 2, chunk_size = 100)['X_weighted'].shape
+    (100, 2)
+    """
+
+    work = {'X_beta': np.empty(num_obs),
+            'log_terms': np.empty(num_obs),
+            'probs': np.empty(num_obs),
+            'error': np.empty(num_obs),
+            'weights': np.empty(num_obs),
+            'X_weighted': np.empty((max(1, min(num_obs, chunk_size)), num_vars)),
+            'grad': np.empty(num_vars),
+            'hess': np.empty((num_vars, num_vars))}
+
+    return work
+
+
+#--------------------------------------------------
+# Weighted Gram matrix for the Hessian
+#--------------------------------------------------
+
+def weighted_gram(X: np.ndarray, weights: np.ndarray,
+                  chunk_size: int = 4096, out: np.ndarray = None,
+                  X_weighted: np.ndarray = None) -> np.ndarray:
+    """
+    Calculates the matrix X^T * D * X, where D is a diagonal matrix
+    with the vector weights on the diagonal,
+    without forming D or a weighted copy of X.
+
+    The rows of X are taken in blocks of chunk_size rows
+    and the products of each block are added to the k x k result,
+    so the memory used beyond the data is of the order of
+    k*k + chunk_size*k, for k columns of X.
+    The result is written into out and the weighted block
+    into X_weighted, if these arrays are provided.
+
+    >>> X = np.array([[1.0, 0.5], [1.0, -1.0], [1.0, 2.0], [1.0, 0.0]])
+    >>> weights = np.array([0.25, 0.25, 0.25, 0.25])
+    >>> weighted_gram(X, weights)
+    array([[1.    , 0.375 ],
+           [0.375 , 1.3125]])
+    >>> weighted_gram(X, weights, chunk_size = 3)
+    array([[1.    , 0.375 ],
+           [0.375 , 1.3125]])
+    >>> weighted_gram(X, np.array([1.0, 0.0, 0.0, 2.0]), chunk_size = 1)
+    array([[3.  , 0.5 ],
+           [0.5 , 0.25]])
+    """
+
+    num_obs, num_vars = X.shape
+    chunk_size = max(1, min(num_obs, chunk_size))
+    if out is None:
+        out = np.empty((num_vars, num_vars))
+    if X_weighted is None or X_weighted.shape[0] < chunk_size:
+        X_weighted = np.empty((chunk_size, num_vars))
+
+    out[:] = 0.0
+    for start in range(0, num_obs, chunk_size):
+        stop = min(start + chunk_size, num_obs)
+        X_chunk = X[start:stop]
+        X_weighted_chunk = X_weighted[:stop - start]
+        np.multiply(X_chunk, weights[start:stop, np.newaxis], out = X_weighted_chunk)
+        out += np.dot(X_weighted_chunk.T, X_chunk)
+
+    return out
+
+
+#--------------------------------------------------
+# Likelihood, gradient and Hessian in one pass
+#--------------------------------------------------
+
+def logit_fused(beta: np.ndarray, y: np.ndarray, X: np.ndarray,
+                work: Dict[str, np.ndarray] = None,
+                calc_hess: bool = True) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Calculates the negative of the log-likelihood function
+    for logistic regression, its gradient vector and its Hessian matrix,
+    computing the linear predictor X*beta and the probabilities only once.
+
+    The negative log-likelihood is calculated as
+    sum(log(1 + exp((1 - 2*y)*X_beta))), with np.logaddexp(),
+    and the probabilities with scipy.special.expit(),
+    so that neither overflows nor loses precision
+    for large values of abs(X_beta).
+    The Hessian is X^T * D * X,
+    where D is a diagonal matrix with probs*(1 - probs) on the diagonal.
+
+    The results are written into the arrays in work,
+    from logit_work_buffers(), which are allocated if work is None.
+    The gradient and Hessian returned are the arrays work['grad']
+    and work['hess'], which are overwritten in the next call:
+    copy them if they are to be kept.
+    If calc_hess is False, the Hessian is not calculated
+    and None is returned in its place.
+
+    >>> y = np.array([1, 0, 1, 1])
+    >>> X = np.array([[1.0, 0.5], [1.0, -1.0], [1.0, 2.0], [1.0, 0.0]])
+    >>> neg_like, neg_grad, neg_hess = logit_fused(np.zeros(2), y, X)
+    >>> round(neg_like, 10)
+    2.7725887222
+    >>> neg_grad
+    array([-1.  , -1.75])
+    >>> neg_hess
+    array([[1.    , 0.375 ],
+           [0.375 , 1.3125]])
+    >>> neg_like, neg_grad, neg_hess = logit_fused(np.array([0.0, 1000.0]), y, X,
+    ...                                            calc_hess = False)
+    >>> neg_like, neg_hess
+    (0.6931471805599453, None)
+    """
+
+    if work is None:
+        work = logit_work_buffers(len(y), len(beta))
+    X_beta = work['X_beta']
+    probs = work['probs']
+
+    # Calculate the linear predictor once.
+    np.dot(X, beta, out = X_beta)
+
+    # Likelihood: - log(probs) when y == 1 and - log(1 - probs) when y == 0,
+    # which is log(1 + exp(- X_beta)) or log(1 + exp(X_beta)).
+    log_terms = work['log_terms']
+    np.multiply(y, X_beta, out = log_terms)
+    np.multiply(log_terms, -2.0, out = log_terms)
+    np.add(log_terms, X_beta, out = log_terms)
+    np.logaddexp(0, log_terms, out = log_terms)
+    neg_like = float(np.sum(log_terms))
+
+    # Gradient: X^T * (y - probs).
+    expit(X_beta, out = probs)
+    np.subtract(y, probs, out = work['error'])
+    np.dot(work['error'], X, out = work['grad'])
+    np.negative(work['grad'], out = work['grad'])
+
+    if not calc_hess:
+        return neg_like, work['grad'], None
+
+    # Hessian: X^T * D * X,
+    # accumulated over blocks of rows of X.
+    weights = work['weights']
+    np.subtract(1.0, probs, out = weights)
+    np.multiply(weights, probs, out = weights)
+    weighted_gram(X, weights, chunk_size = work['X_weighted'].shape[0],
+                  out = work['hess'], X_weighted = work['X_weighted'])
+
+    return neg_like, work['grad'], work['hess']
+
+
+#--------------------------------------------------
+# Functions in the form used by scipy.optimize.minimize
+#--------------------------------------------------
+
+def logit_like_grad(beta: np.ndarray, y: np.ndarray, X: np.ndarray,
+                    work: Dict[str, np.ndarray] = None) -> Tuple[float, np.ndarray]:
+    """
+    Calculates the negative log-likelihood and its gradient
+    with logit_fused(), for use in minimize(..., jac = True).
+    The gradient is copied, since scipy keeps the gradients
+    from previous iterations.
+
+    >>> y = np.array([1, 0, 1, 1])
+    >>> X = np.array([[1.0, 0.5], [1.0, -1.0], [1.0, 2.0], [1.0, 0.0]])
+    >>> work = logit_work_buffers(4, 2)
+    >>> neg_like, neg_grad = logit_like_grad(np.zeros(2), y, X, work)
+    >>> neg_grad is work['grad']
+    False
+    >>> neg_grad
+    array([-1.  , -1.75])
+    """
+
+    neg_like, neg_grad, neg_hess = logit_fused(beta, y, X, work, calc_hess = False)
+
+    return neg_like, neg_grad.copy()
+
+
+def logit_hess_fused(beta: np.ndarray, y: np.ndarray, X: np.ndarray,
+                     work: Dict[str, np.ndarray] = None) -> np.ndarray:
+    """
+    Calculates the Hessian matrix of the negative log-likelihood
+    with logit_fused(), for use in minimize(..., hess = logit_hess_fused).
+
+    >>> y = np.array([1, 0, 1, 1])
+    >>> X = np.array([[1.0, 0.5], [1.0, -1.0], [1.0, 2.0], [1.0, 0.0]])
+    >>> logit_hess_fused(np.zeros(2), y, X)
+    array([[1.    , 0.375 ],
+           [0.375 , 1.3125]])
+    """
+
+    neg_like, neg_grad, neg_hess = logit_fused(beta, y, X, work)
+
+    return neg_hess.copy()
+
+
+#--------------------------------------------------
+# Memoized objective for separate calls
+#--------------------------------------------------
+
+class LogitObjective:
+    """
+    The negative log-likelihood for logistic regression,
+    its gradient vector and its Hessian matrix,
+    as separate methods for minimize(fun = obj.likelihood,
+    jac = obj.gradient, hess = obj.hessian),
+    which share the calculations at the same value of beta.
+
+    The linear predictor, the probabilities, the likelihood
+    and the gradient are calculated together by logit_fused(),
+    once for each beta, and the results, with the weights
+    probs*(1 - probs) for the Hessian, are kept
+    for the last cache_size values of beta,
+    with the least recently used dropped first.
+    The Hessian is calculated from the weights by weighted_gram()
+    the first time it is requested at a beta.
+    The counters hits and misses record how many calls
+    found beta in the cache.
+
+    >>> y = np.array([1, 0, 1, 1])
+    >>> X = np.array([[1.0, 0.5], [1.0, -1.0], [1.0, 2.0], [1.0, 0.0]])
+    >>> obj = LogitObjective(y, X, cache_size = 2)
+    >>> round(obj.likelihood(np.zeros(2)), 10)
+    2.7725887222
+    >>> obj.gradient(np.zeros(2))
+    array([-1.  , -1.75])
+    >>> obj.hessian(np.zeros(2))
+    array([[1.    , 0.375 ],
+           [0.375 , 1.3125]])
+    >>> obj.hits, obj.misses
+    (2, 1)
+
+    Only the last two values of beta are kept:
+
+    >>> obj.gradient(np.ones(2)) is obj.gradient(np.ones(2))
+    False
+    >>> round(obj.likelihood(np.array([0.5, 0.5])), 10)
+    1.7555084488
+    >>> round(obj.likelihood(np.zeros(2)), 10)
+    2.7725887222
+    >>> obj.hits, obj.misses
+    (3, 4)
+
+    A view of beta that is not contiguous has the same key:
+
+    >>> obj.gradient(np.zeros(4)[::2])
+    array([-1.  , -1.75])
+    >>> obj.hits, obj.misses
+    (4, 4)
+
+    An optimizer that updates beta in place does not change the cache:
+
+    >>> beta = np.zeros(2)
+    >>> hess_0 = obj.hessian(beta)
+    >>> beta += 0.5
+    >>> round(obj.likelihood(beta), 10)
+    1.7555084488
+    >>> bool(np.allclose(obj.hessian(np.zeros(2)), hess_0))
+    True
+    """
+
+    def __init__(self, y: np.ndarray, X: np.ndarray, cache_size: int = 4):
+        self.y = np.asarray(y, dtype = float)
+        self.X = np.asarray(X, dtype = float)
+        self.work = logit_work_buffers(self.X.shape[0], self.X.shape[1])
+        self.cache_size = max(1, cache_size)
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, beta: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Returns the dictionary of calculations at beta,
+        from the cache if beta is in it.
+        The key is the shape, the type and the bytes of beta,
+        so only exactly equal values of beta share the calculations.
+        """
+
+        beta = np.array(beta, dtype = float)
+        key = (beta.shape, beta.dtype.str, beta.tobytes())
+        if key in self.cache:
+            self.hits = self.hits + 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses = self.misses + 1
+        neg_like, neg_grad, neg_hess = logit_fused(beta, self.y, self.X,
+                                                   self.work, calc_hess = False)
+        probs = self.work['probs']
+        values = {'neg_like': neg_like, 'neg_grad': neg_grad.copy(),
+                  'weights': probs*(1 - probs), 'neg_hess': None}
+
+        self.cache[key] = values
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last = False)
+
+        return values
+
+    def likelihood(self, beta: np.ndarray) -> float:
+        """Returns the negative log-likelihood at beta."""
+        return self.evaluate(beta)['neg_like']
+
+    def gradient(self, beta: np.ndarray) -> np.ndarray:
+        """Returns a copy of the gradient vector at beta."""
+        return self.evaluate(beta)['neg_grad'].copy()
+
+    def hessian(self, beta: np.ndarray) -> np.ndarray:
+        """Returns a copy of the Hessian matrix at beta."""
+        values = self.evaluate(beta)
+        if values['neg_hess'] is None:
+            values['neg_hess'] = weighted_gram(self.X, values['weights'])
+        return values['neg_hess'].copy()
+
+
+#--------------------------------------------------
+# Iteratively Reweighted Least Squares
+#--------------------------------------------------
+
+def newton_minimize(fused_func: Callable[[np.ndarray], Tuple[float, np.ndarray, np.ndarray]],
+                    beta_0: np.ndarray, tol: float = 1e-8, maxiter: int = 50,
+                    disp: bool = False) -> OptimizeResult:
+    """
+    Minimizes a convex function by Newton's method, starting at beta_0,
+    where fused_func(beta) returns the function value,
+    the gradient vector and the Hessian matrix at beta,
+    in the form returned by logit_fused().
+
+    Each iteration takes the step that solves hess * step = - grad
+    by Cholesky decomposition.
+    The step is halved while the function value does not improve,
+    and the algorithm stops with success False
+    if it has not improved after 30 halvings.
+    Otherwise, it stops when the largest element of the full Newton step,
+    before any halving, is smaller than tol.
+    The gradient and Hessian are copied at each point taken,
+    since fused_func may return buffers that it overwrites,
+    as logit_fused() does.
+
+    Returns a scipy OptimizeResult with the attributes
+    x, fun, jac, hess, nit, nfev, time (in seconds),
+    success and message, as from scipy.optimize.minimize().
+
+    >>> soln = newton_minimize(lambda b: ((b[0] - 3)**2, 2*(b - 3), 2*np.eye(1)),
+    ...                        np.zeros(1))
+    >>> soln.x, soln.nit
+    (array([3.]), 2)
+
+    With a gradient that points the wrong way, no step improves:
+
+    >>> soln = newton_minimize(lambda b: (b[0]**2, - 2*b, 2*np.eye(1)),
+    ...                        np.ones(1))
+    >>> soln.x, soln.success, soln.message
+    (array([1.]), False, 'Function value did not improve after halving the step 30 times.')
+
+    The gradient and Hessian are those at the point returned,
+    not at the last point tried, even if fused_func reuses its arrays:
+
+    >>> grad, hess = np.zeros(1), np.eye(1)
+    >>> def fused_buffers(b):
+    ...     grad[:] = - 2*b
+    ...     hess[:] = 2 + b[0]
+    ...     return b[0]**2, grad, hess
+    >>> soln = newton_minimize(fused_buffers, np.ones(1))
+    >>> float(soln.jac[0]), float(soln.hess[0, 0])
+    (-2.0, 3.0)
+
+    A step that is small only because it was halved many times
+    does not count as convergence. Here, the minimum is at 5e-9:
+
+    >>> soln = newton_minimize(lambda b: (- b[0] + 1e8*max(b[0], 0)**2,
+    ...                                   - 1 + 2e8*np.maximum(b, 0), np.eye(1)),
+    ...                        np.zeros(1))
+    >>> round(float(soln.x[0])*1e9, 6), soln.success
+    (5.0, True)
+    """
+
+    t1 = time.perf_counter()
+    beta = np.array(beta_0, dtype = float)
+
+    neg_like, neg_grad, neg_hess = fused_func(beta)
+    neg_grad = np.array(neg_grad)
+    neg_hess = np.array(neg_hess)
+    nfev = 1
+    nit = 0
+    success = False
+    message = 'Maximum number of iterations has been exceeded.'
+
+    while nit < maxiter:
+
+        nit = nit + 1
+
+        # Newton step: solve hess * step = - grad.
+        try:
+            step = - cho_solve(cho_factor(neg_hess), neg_grad)
+        except LinAlgError:
+            message = 'Hessian matrix is not positive definite.'
+            break
+        newton_step = step
+
+        # Halve the step until the function value does not get worse.
+        # If it never improves, stop at the last point that did.
+        for num_halvings in range(30):
+            beta_next = beta + step
+            neg_like_next, neg_grad_next, neg_hess_next = fused_func(beta_next)
+            nfev = nfev + 1
+            if neg_like_next <= neg_like:
+                break
+            step = step/2
+        else:
+            message = 'Function value did not improve after halving the step 30 times.'
+            break
+
+        beta = beta_next
+        neg_like = neg_like_next
+        neg_grad = np.array(neg_grad_next)
+        neg_hess = np.array(neg_hess_next)
+
+        if np.max(np.abs(newton_step)) < tol:
+            success = True
+            message = 'Optimization terminated successfully.'
+            break
+
+    t2 = time.perf_counter()
+
+    if disp:
+        print(message)
+        print('         Current function value: %f' % neg_like)
+        print('         Iterations: %d' % nit)
+        print('         Function evaluations: %d' % nfev)
+        print('         Time (ms): %.2f' % ((t2 - t1) * 1000.0))
+
+    return OptimizeResult(x = beta, fun = neg_like, jac = neg_grad,
+                          hess = neg_hess, nit = nit, nfev = nfev,
+                          time = t2 - t1, success = success, message = message)
+
+
+def logit_irls(y: np.ndarray, X: np.ndarray, beta_0: np.ndarray = None,
+               tol: float = 1e-8, maxiter: int = 50,
+               disp: bool = False) -> OptimizeResult:
+    """
+    Estimates the coefficients of the logistic regression model
+    by iteratively reweighted least squares,
+    i.e. Newton's method on the likelihood function,
+    starting at beta_0 (a vector of zeros if None).
+    A warm start from a previous estimate usually converges
+    in one or two iterations.
+
+    Each iteration calculates the likelihood, gradient and Hessian
+    with logit_fused() and takes a step with newton_minimize(),
+    which stops when the largest change in beta is smaller than tol.
+
+    Returns a scipy OptimizeResult with the attributes
+    x, fun, jac, hess, nit, nfev, time (in seconds),
+    success and message, as from scipy.optimize.minimize().
+
+    >>> y = np.array([1, 0, 1, 1, 0, 0, 1, 0])
+    >>> X = np.column_stack([np.ones(8), [0.5, -1.0, 2.0, 0.0, 1.0, -0.5, 1.5, 0.5]])
+    >>> soln = logit_irls(y, X)
+    >>> soln.x.round(6)
+    array([-0.732488,  1.464975])
+    >>> soln.nit, soln.success
+    (6, True)
+    >>> logit_irls(y, X, beta_0 = soln.x).nit
+    1
+    """
+
+    num_obs, num_vars = X.shape
+    work = logit_work_buffers(num_obs, num_vars)
+    if beta_0 is None:
+        beta_0 = np.zeros(num_vars)
+
+    def fused_func(beta: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+        return logit_fused(beta, y, X, work)
+
+    return newton_minimize(fused_func, beta_0, tol, maxiter, disp)
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
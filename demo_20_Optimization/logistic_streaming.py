@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Logistic Regression on Data Stored in Files
+#
+##################################################
+#
+# This module estimates logistic regression
+# on a dataset in a csv file that is too large
+# to hold in memory.
+# The file is read in chunks of rows with pd.read_csv()
+# and the likelihood, gradient and Hessian
+# are added up over the chunks with the functions
+# in logistic_functions.py.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import time
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeResult
+from typing import Callable, Dict, List, Tuple
+
+import logistic_functions as lf
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Reading the data in chunks
+#--------------------------------------------------
+
+def csv_chunks(csv_path: str, y_col: str, X_cols: List[str],
+               add_intercept: bool = True,
+               chunksize: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reads the csv file csv_path in chunks of chunksize rows
+    and generates the pairs (y, X) of numpy arrays for each chunk,
+    with y from the column y_col and X from the columns X_cols,
+    after a column of ones if add_intercept is True.
+
+    >>> import os
+    >>> csv_path = os.path.join(os.path.dirname(__file__), 'credit_data.csv')
+    >>> [y.shape for y, X in csv_chunks(csv_path, 'default', ['bmaxrate'],
+    ...                                 chunksize = 1000)]
+    [(1000,), (1000,), (377,)]
+    >>> y, X = next(csv_chunks(csv_path, 'default', ['bmaxrate'], chunksize = 2))
+    >>> X
+    array([[1.  , 0.29],
+           [1.  , 0.23]])
+    """
+
+    reader = pd.read_csv(csv_path, usecols = [y_col] + list(X_cols),
+                         chunksize = chunksize)
+    for chunk in reader:
+        y = chunk[y_col].to_numpy(dtype = float)
+        X = chunk[list(X_cols)].to_numpy(dtype = float)
+        if add_intercept:
+            X = np.column_stack([np.ones(len(y)), X])
+        yield y, X
+
+
+def chunk_work_buffers(work: Dict[str, np.ndarray],
+                       num_obs: int) -> Dict[str, np.ndarray]:
+    """
+    Returns views of the work buffers from lf.logit_work_buffers()
+    for a chunk of only num_obs observations,
+    such as the last chunk of a file.
+
+    >>> work = lf.logit_work_buffers(100, 3)
+    >>> chunk_work_buffers(work, 40)['X_beta'].shape
+    (40,)
+    >>> chunk_work_buffers(work, 40)['hess'].shape
+    (3, 3)
+    """
+
+    if num_obs == len(work['X_beta']):
+        return work
+
+    chunk_work = dict(work)
+    for name in ['X_beta', 'log_terms', 'probs', 'error', 'weights']:
+        chunk_work[name] = work[name][:num_obs]
+
+    return chunk_work
+
+
+#--------------------------------------------------
+# Likelihood, gradient and Hessian over the chunks
+#--------------------------------------------------
+
+def logit_fused_csv(beta: np.ndarray, csv_path: str, y_col: str,
+                    X_cols: List[str], add_intercept: bool = True,
+                    chunksize: int = 100000,
+                    work: Dict[str, np.ndarray] = None
+                    ) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Calculates the negative log-likelihood, its gradient vector
+    and its Hessian matrix for logistic regression
+    on the data in csv_path, in one pass through the file,
+    adding up the contributions of each chunk from lf.logit_fused().
+    Only one chunk of the data is in memory at a time.
+
+    >>> import os
+    >>> csv_path = os.path.join(os.path.dirname(__file__), 'credit_data.csv')
+    >>> neg_like, neg_grad, neg_hess = logit_fused_csv(np.zeros(2), csv_path,
+    ...     'default', ['bmaxrate'], chunksize = 500)
+    >>> round(neg_like, 6)
+    1647.610848
+    >>> credit = pd.read_csv(csv_path)
+    >>> X = np.column_stack([np.ones(len(credit)), credit['bmaxrate']])
+    >>> round(lf.logit_fused(np.zeros(2), credit['default'].to_numpy(), X)[0], 6)
+    1647.610848
+    """
+
+    num_vars = len(beta)
+    if work is None:
+        work = lf.logit_work_buffers(chunksize, num_vars)
+
+    neg_like = 0.0
+    neg_grad = np.zeros(num_vars)
+    neg_hess = np.zeros((num_vars, num_vars))
+    for y, X in csv_chunks(csv_path, y_col, X_cols, add_intercept, chunksize):
+        chunk_work = chunk_work_buffers(work, len(y))
+        neg_like_c, neg_grad_c, neg_hess_c = lf.logit_fused(beta, y, X, chunk_work)
+        neg_like = neg_like + neg_like_c
+        neg_grad += neg_grad_c
+        neg_hess += neg_hess_c
+
+    return neg_like, neg_grad, neg_hess
+
+
+#--------------------------------------------------
+# Newton's method over the chunks
+#--------------------------------------------------
+
+def logit_fit_csv(csv_path: str, y_col: str, X_cols: List[str],
+                  add_intercept: bool = True, chunksize: int = 100000,
+                  beta_0: np.ndarray = None, tol: float = 1e-8,
+                  maxiter: int = 50, disp: bool = False) -> OptimizeResult:
+    """
+    Estimates the coefficients of the logistic regression model
+    of y_col on X_cols (and an intercept, if add_intercept is True)
+    for the data in the csv file csv_path,
+    by Newton's method with lf.newton_minimize(),
+    reading the file in chunks of chunksize rows in each iteration
+    with logit_fused_csv(), so that the full matrix X
+    is never held in memory.
+
+    Returns a scipy OptimizeResult, as from lf.logit_irls(),
+    with the names of the coefficients in the attribute names.
+
+    >>> import os
+    >>> import statsmodels.api as sm
+    >>> csv_path = os.path.join(os.path.dirname(__file__), 'credit_data.csv')
+    >>> X_cols = ['AA', 'A', 'B', 'C', 'D']
+    >>> soln = logit_fit_csv(csv_path, 'default', X_cols, chunksize = 500)
+    >>> soln.names
+    ['Intercept', 'AA', 'A', 'B', 'C', 'D']
+    >>> soln.x.round(6)
+    array([-1.598568, -2.9727  , -2.025773, -2.208094, -1.273111, -0.888651])
+    >>> credit = pd.read_csv(csv_path)
+    >>> logit_sm = sm.Logit(credit['default'], sm.add_constant(credit[X_cols]))
+    >>> bool(np.allclose(soln.x, logit_sm.fit(disp = 0).params, atol = 1e-6))
+    True
+    """
+
+    num_vars = len(X_cols) + int(add_intercept)
+    work = lf.logit_work_buffers(chunksize, num_vars)
+    if beta_0 is None:
+        beta_0 = np.zeros(num_vars)
+
+    def fused_func(beta: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray]:
+        return logit_fused_csv(beta, csv_path, y_col, X_cols,
+                               add_intercept, chunksize, work)
+
+    soln = lf.newton_minimize(fused_func, beta_0, tol, maxiter, disp)
+    soln.names = ['Intercept']*int(add_intercept) + list(X_cols)
+
+    return soln
+
+
+#--------------------------------------------------
+# Storing the data in a memory-mapped file
+#--------------------------------------------------
+
+def csv_to_memmap(csv_path: str, npy_path: str, y_col: str,
+                  X_cols: List[str], add_intercept: bool = True,
+                  chunksize: int = 100000) -> np.ndarray:
+    """
+    Copies the columns y_col and X_cols of the csv file csv_path,
+    in chunks of chunksize rows, into a numpy file npy_path
+    with y in the first column and X in the others.
+    Returns the data as a read-only memory-mapped array,
+    which is read from the disk only as the rows are used.
+
+    >>> import os, tempfile
+    >>> csv_path = os.path.join(os.path.dirname(__file__), 'credit_data.csv')
+    >>> npy_path = os.path.join(tempfile.mkdtemp(), 'credit_data.npy')
+    >>> data = csv_to_memmap(csv_path, npy_path, 'default', ['bmaxrate'],
+    ...                      chunksize = 1000)
+    >>> data.shape
+    (2377, 3)
+    >>> data[:2]
+    memmap([[0.  , 1.  , 0.29],
+            [0.  , 1.  , 0.23]])
+    """
+
+    # First pass: count the rows.
+    num_obs = 0
+    for chunk in pd.read_csv(csv_path, usecols = [y_col], chunksize = chunksize):
+        num_obs = num_obs + len(chunk)
+
+    # Second pass: copy the data into the file.
+    num_cols = 1 + len(X_cols) + int(add_intercept)
+    data = np.lib.format.open_memmap(npy_path, mode = 'w+', dtype = float,
+                                     shape = (num_obs, num_cols))
+    start = 0
+    for y, X in csv_chunks(csv_path, y_col, X_cols, add_intercept, chunksize):
+        stop = start + len(y)
+        data[start:stop, 0] = y
+        data[start:stop, 1:] = X
+        start = stop
+    data.flush()
+    del data
+
+    return np.load(npy_path, mmap_mode = 'r')
+
+
+#--------------------------------------------------
+# Stochastic gradient descent
+#--------------------------------------------------
+
+def learning_rate_schedule(learning_rate: float, schedule: str = 'constant',
+                           decay: float = 0.01) -> Callable[[int], float]:
+    """
+    Returns a function of the number of steps t taken so far
+    that gives the learning rate for the next step:
+    'constant': learning_rate,
+    'inverse': learning_rate/(1 + decay*t),
+    'exponential': learning_rate*exp(- decay*t).
+
+    >>> lr = learning_rate_schedule(0.1, 'inverse', decay = 0.5)
+    >>> [round(lr(t), 4) for t in range(4)]
+    [0.1, 0.0667, 0.05, 0.04]
+    >>> lr = learning_rate_schedule(0.1, 'exponential', decay = 0.5)
+    >>> [round(lr(t), 4) for t in range(4)]
+    [0.1, 0.0607, 0.0368, 0.0223]
+    >>> learning_rate_schedule(0.1, 'linear')
+    Error: schedule must be 'constant', 'inverse' or 'exponential'.
+    """
+
+    if schedule == 'constant':
+        return lambda t: learning_rate
+    elif schedule == 'inverse':
+        return lambda t: learning_rate/(1.0 + decay*t)
+    elif schedule == 'exponential':
+        return lambda t: learning_rate*float(np.exp(- decay*t))
+    else:
+        print("Error: schedule must be 'constant', 'inverse' or 'exponential'.")
+        return None
+
+
+def logit_neg_like_chunked(beta: np.ndarray, data: np.ndarray,
+                           chunksize: int = 100000,
+                           work: Dict[str, np.ndarray] = None) -> float:
+    """
+    Calculates the negative log-likelihood for logistic regression
+    on the rows of data, with y in the first column and X in the others,
+    in chunks of chunksize rows,
+    for the held-out data in logit_sgd().
+
+    >>> data = np.array([[1, 1.0, 0.5], [0, 1.0, -1.0], [1, 1.0, 2.0], [1, 1.0, 0.0]])
+    >>> round(logit_neg_like_chunked(np.zeros(2), data, chunksize = 3), 10)
+    2.7725887222
+    """
+
+    if work is None:
+        work = lf.logit_work_buffers(min(chunksize, len(data)), len(beta))
+
+    neg_like = 0.0
+    for start in range(0, len(data), chunksize):
+        chunk = np.asarray(data[start:start + chunksize])
+        chunk_work = chunk_work_buffers(work, len(chunk))
+        neg_like = neg_like + lf.logit_fused(beta, chunk[:, 0], chunk[:, 1:],
+                                             chunk_work, calc_hess = False)[0]
+
+    return neg_like
+
+
+def logit_sgd(data: np.ndarray, method: str = 'adam', batch_size: int = 256,
+              learning_rate: float = 0.01, schedule: str = 'constant',
+              decay: float = 0.01, momentum: float = 0.9,
+              beta_1: float = 0.9, beta_2: float = 0.999, epsilon: float = 1e-8,
+              num_epochs: int = 10, holdout_frac: float = 0.1,
+              patience: int = 3, tol: float = 1e-6, beta_0: np.ndarray = None,
+              seed: int = 42, disp: bool = False) -> OptimizeResult:
+    """
+    Estimates the coefficients of the logistic regression model
+    by mini-batch stochastic gradient descent on the rows of data,
+    an array with y in the first column and X in the others,
+    such as the memory-mapped array from csv_to_memmap().
+
+    The method is 'sgd', 'momentum' or 'adam'.
+    The step uses the gradient of the average negative log-likelihood
+    for each batch of batch_size rows, from lf.logit_fused(),
+    with the learning rate from learning_rate_schedule().
+
+    The last holdout_frac of the rows are held out.
+    In each epoch, the batches of the other rows are visited
+    in a new random order.
+    Each batch is a block of consecutive rows,
+    so that it is read from the disk in one piece:
+    shuffle the rows of the file once beforehand
+    if they are sorted in any way.
+    After each epoch, the log-likelihood on the held-out rows
+    is calculated, and the algorithm stops early
+    if it has not improved by more than tol per observation
+    for patience epochs in a row.
+    Only then is success True: if num_epochs are completed first,
+    or no rows are held out, the held-out log-likelihood
+    may still be improving.
+
+    Returns a scipy OptimizeResult with the coefficients
+    with the best held-out log-likelihood in x,
+    the negative held-out log-likelihood in fun,
+    the history of fun over the epochs in fun_history,
+    the number of epochs in nit and the throughput in rows_per_sec.
+
+    >>> import os, tempfile
+    >>> csv_path = os.path.join(os.path.dirname(__file__), 'credit_data.csv')
+    >>> npy_path = os.path.join(tempfile.mkdtemp(), 'credit_data.npy')
+    >>> data = csv_to_memmap(csv_path, npy_path, 'default',
+    ...                      ['AA', 'A', 'B', 'C', 'D'])
+    >>> soln = logit_sgd(data, 'adam', batch_size = 64, learning_rate = 0.05,
+    ...                  num_epochs = 200, holdout_frac = 0.2)
+    >>> soln.message
+    'Held-out log-likelihood stopped improving.'
+
+    The held-out log-likelihood is close to that from Newton's method
+    on the same training rows:
+
+    >>> soln_newton = lf.logit_irls(data[:1901, 0], data[:1901, 1:])
+    >>> neg_like_newton = logit_neg_like_chunked(soln_newton.x, data[1901:])
+    >>> bool(abs(soln.fun - neg_like_newton) < 0.01*neg_like_newton)
+    True
+    >>> soln.success
+    True
+    >>> soln_sgd = logit_sgd(data, 'sgd', num_epochs = 5)
+    >>> soln_sgd.nit, len(soln_sgd.fun_history), soln_sgd.success
+    (5, 5, False)
+    >>> logit_sgd(data, 'sgd', num_epochs = 0).nit
+    0
+    >>> logit_sgd(data, 'newton')
+    Error: method must be 'sgd', 'momentum' or 'adam'.
+    """
+
+    if method not in ['sgd', 'momentum', 'adam']:
+        print("Error: method must be 'sgd', 'momentum' or 'adam'.")
+        return None
+    lr = learning_rate_schedule(learning_rate, schedule, decay)
+    if lr is None:
+        return None
+
+    t1 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    num_obs = len(data)
+    num_vars = data.shape[1] - 1
+    num_train = num_obs - int(round(holdout_frac*num_obs))
+    batch_starts = np.arange(0, num_train, batch_size)
+
+    beta = np.zeros(num_vars) if beta_0 is None else np.array(beta_0, dtype = float)
+    velocity = np.zeros(num_vars)
+    moment_1 = np.zeros(num_vars)
+    moment_2 = np.zeros(num_vars)
+    work = lf.logit_work_buffers(batch_size, num_vars)
+
+    holdout = data[num_train:]
+    best_beta = beta.copy()
+    best_neg_like = np.inf
+    fun_history = []
+    num_steps = 0
+    num_rows = 0
+    num_worse = 0
+    num_epochs_run = 0
+    success = False
+    message = 'Maximum number of epochs has been reached.'
+
+    for epoch in range(num_epochs):
+
+        num_epochs_run = num_epochs_run + 1
+        for start in rng.permutation(batch_starts):
+
+            batch = np.asarray(data[start:min(start + batch_size, num_train)])
+            batch_work = chunk_work_buffers(work, len(batch))
+            neg_grad = lf.logit_fused(beta, batch[:, 0], batch[:, 1:],
+                                      batch_work, calc_hess = False)[1]
+            neg_grad = neg_grad/len(batch)
+            step_size = lr(num_steps)
+            num_steps = num_steps + 1
+            num_rows = num_rows + len(batch)
+
+            if method == 'sgd':
+                beta -= step_size*neg_grad
+            elif method == 'momentum':
+                velocity = momentum*velocity - step_size*neg_grad
+                beta += velocity
+            else:
+                moment_1 = beta_1*moment_1 + (1 - beta_1)*neg_grad
+                moment_2 = beta_2*moment_2 + (1 - beta_2)*neg_grad**2
+                moment_1_hat = moment_1/(1 - beta_1**num_steps)
+                moment_2_hat = moment_2/(1 - beta_2**num_steps)
+                beta -= step_size*moment_1_hat/(np.sqrt(moment_2_hat) + epsilon)
+
+        # Early stopping on the held-out log-likelihood.
+        if len(holdout) == 0:
+            best_beta = beta.copy()
+            continue
+        neg_like = logit_neg_like_chunked(beta, holdout)
+        fun_history.append(neg_like)
+        if neg_like < best_neg_like - tol*len(holdout):
+            best_neg_like = neg_like
+            best_beta = beta.copy()
+            num_worse = 0
+        else:
+            num_worse = num_worse + 1
+            if num_worse >= patience:
+                success = True
+                message = 'Held-out log-likelihood stopped improving.'
+                break
+
+    t2 = time.perf_counter()
+    rows_per_sec = num_rows/(t2 - t1)
+
+    if disp:
+        print(message)
+        print('         Held-out function value: %f' % best_neg_like)
+        print('         Epochs: %d' % num_epochs_run)
+        print('         Rows per second: %.0f' % rows_per_sec)
+        print('         Time (ms): %.2f' % ((t2 - t1) * 1000.0))
+
+    return OptimizeResult(x = best_beta, fun = best_neg_like,
+                          fun_history = fun_history, nit = num_epochs_run,
+                          num_steps = num_steps, rows_per_sec = rows_per_sec,
+                          time = t2 - t1, success = success, message = message)
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
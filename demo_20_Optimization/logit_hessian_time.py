@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing the Hessian of the Logistic Likelihood
+#
+##################################################
+#
+# Compares the running time of the Hessian matrix
+# calculated with pd.concat(), as in the earlier version 
+# of logit_hessian() in logistic_calculation.py, 
+# with weighted_gram() in logistic_functions.py, 
+# for simulated data with k = 6, 50 and 500 columns.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import logistic_functions as lf
+
+
+def logit_hessian_concat(beta, y, X):
+    """ (array, Series, DataFrame) -> DataFrame
+
+    Return the Hessian of the negative log-likelihood,
+    with the weights repeated in a DataFrame of the same size as X.
+    """
+
+    X_beta = X.dot(beta)
+    probs = 1/(1 + np.exp(- X_beta))
+    diag = probs*(1 - probs)
+    rep_diag = pd.concat([diag] * len(X.columns), 
+                         axis = 1, ignore_index = True)
+    rep_diag.columns = X.columns
+    X_diag = X.multiply(rep_diag)
+    hess = X_diag.transpose().dot(X)
+
+    return hess
+
+
+def logit_hessian_gram(beta, y, X):
+    """ (array, array, array) -> array
+
+    Return the Hessian of the negative log-likelihood,
+    with weighted_gram() on the numpy arrays.
+    """
+
+    probs = 1/(1 + np.exp(- X.dot(beta)))
+    hess = lf.weighted_gram(X, probs*(1 - probs))
+
+    return hess
+
+
+def time_it(hess_func, beta, y, X, num_reps):
+    """ (function, array, object, object, int) -> number
+
+    Return the average number of milliseconds it takes 
+    to run hess_func(beta, y, X) over num_reps repetitions.
+    """
+
+    t1 = time.perf_counter()
+    for rep in range(num_reps):
+        hess_func(beta, y, X)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0 / num_reps
+
+
+def print_times(num_obs, num_vars, num_reps = 5):
+    """ (int, int, int) -> NoneType
+
+    Print the number of milliseconds it takes for each version 
+    of the Hessian to run on simulated data
+    and the largest difference between the results. 
+    """
+
+    rng = np.random.default_rng(num_vars)
+    X_array = np.column_stack([np.ones(num_obs), 
+                               rng.normal(size = (num_obs, num_vars - 1))])
+    beta = rng.normal(scale = 1/np.sqrt(num_vars), size = num_vars)
+    y_array = (rng.uniform(size = num_obs) < 1/(1 + np.exp(- X_array.dot(beta)))).astype(float)
+    X = pd.DataFrame(X_array, columns = ['x%d' % k for k in range(num_vars)])
+    y = pd.Series(y_array)
+
+    concat_time = time_it(logit_hessian_concat, beta, y, X, num_reps)
+    gram_time = time_it(logit_hessian_gram, beta, y_array, X_array, num_reps)
+    max_diff = np.max(np.abs(np.asarray(logit_hessian_concat(beta, y, X)) - 
+                             logit_hessian_gram(beta, y_array, X_array)))
+
+    print("{0}\t{1}\t{2:10.2f}\t{3:10.2f}\t{4:8.1f}\t{5:.2e}".format(
+            num_obs, num_vars, concat_time, gram_time, 
+            concat_time / gram_time, max_diff))
+
+
+print("n\tk\tconcat (ms)\tgram (ms)\tspeedup\t\tmax diff")
+for num_vars in [6, 50, 500]:
+    print_times(20000, num_vars)
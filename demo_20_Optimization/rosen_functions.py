@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# The Rosenbrock Function in Many Dimensions
+#
+##################################################
+#
+# This module contains the Rosenbrock function from
+# scipy_optimization.py, with its gradient vector
+# and its Hessian matrix, in forms that can be used
+# with a large number of variables n:
+#   the Hessian-vector product rosen_hess_p(),
+#   which needs O(n) memory, and
+#   the Hessian as a sparse tridiagonal matrix,
+# in place of the dense Hessian rosen_hess(),
+# which needs O(n**2) memory.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import numpy as np
+from scipy import sparse
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# The function and its gradient
+#--------------------------------------------------
+
+def rosen(x: np.ndarray) -> float:
+    """
+    The Rosenbrock function, as in scipy_optimization.py,
+    with np.sum() instead of sum(),
+    so that it does not loop over the elements in Python.
+
+    >>> rosen(np.ones(5))
+    0.0
+    >>> rosen(np.array([1.3, 0.7, 0.8, 1.9, 1.2]))
+    848.22
+    """
+
+    return float(np.sum(100.0*(x[1:] - x[:-1]**2.0)**2.0 + (1 - x[:-1])**2.0))
+
+
+def rosen_der(x: np.ndarray) -> np.ndarray:
+    """
+    The gradient vector of the Rosenbrock function.
+
+    >>> bool(np.all(rosen_der(np.ones(4)) == 0))
+    True
+    >>> rosen_der(np.array([0.0, 0.0, 0.0]))
+    array([-2., -2.,  0.])
+    """
+
+    xm = x[1:-1]
+    xm_m1 = x[:-2]
+    xm_p1 = x[2:]
+    der = np.zeros_like(x)
+    der[1:-1] = 200*(xm - xm_m1**2) - 400*(xm_p1 - xm**2)*xm - 2*(1 - xm)
+    der[0] = -400*x[0]*(x[1] - x[0]**2) - 2*(1 - x[0])
+    der[-1] = 200*(x[-1] - x[-2]**2)
+    return der
+
+
+#--------------------------------------------------
+# The Hessian matrix in three forms
+#--------------------------------------------------
+
+def rosen_hess(x: np.ndarray) -> np.ndarray:
+    """
+    The Hessian matrix of the Rosenbrock function,
+    as a dense n-by-n array.
+
+    >>> rosen_hess(np.ones(3))
+    array([[ 802., -400.,    0.],
+           [-400., 1002., -400.],
+           [   0., -400.,  200.]])
+    """
+
+    x = np.asarray(x)
+    H = np.diag(-400*x[:-1], 1) - np.diag(400*x[:-1], -1)
+    diagonal = np.zeros_like(x)
+    diagonal[0] = 1200*x[0]**2 - 400*x[1] + 2
+    diagonal[-1] = 200
+    diagonal[1:-1] = 202 + 1200*x[1:-1]**2 - 400*x[2:]
+    H = H + np.diag(diagonal)
+    return H
+
+
+def rosen_hess_p(x: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """
+    The product of the Hessian matrix of the Rosenbrock function
+    with the vector p, calculated without forming the matrix.
+
+    >>> x = np.array([1.3, 0.7, 0.8, 1.9, 1.2])
+    >>> p = np.array([1.0, -1.0, 2.0, 0.5, 0.0])
+    >>> bool(np.allclose(rosen_hess_p(x, p), rosen_hess(x).dot(p)))
+    True
+    """
+
+    x = np.asarray(x)
+    Hp = np.zeros_like(x)
+    Hp[0] = (1200*x[0]**2 - 400*x[1] + 2)*p[0] - 400*x[0]*p[1]
+    Hp[1:-1] = (-400*x[:-2]*p[:-2] + (202 + 1200*x[1:-1]**2 - 400*x[2:])*p[1:-1]
+                - 400*x[1:-1]*p[2:])
+    Hp[-1] = -400*x[-2]*p[-2] + 200*p[-1]
+    return Hp
+
+
+def rosen_hess_sparse(x: np.ndarray) -> sparse.csr_matrix:
+    """
+    The Hessian matrix of the Rosenbrock function
+    as a sparse matrix, which stores only the three diagonals
+    that are not zero.
+
+    >>> x = np.array([1.3, 0.7, 0.8, 1.9, 1.2])
+    >>> H = rosen_hess_sparse(x)
+    >>> H.nnz
+    13
+    >>> bool(np.allclose(H.toarray(), rosen_hess(x)))
+    True
+    """
+
+    x = np.asarray(x)
+    diagonal = np.zeros_like(x)
+    diagonal[0] = 1200*x[0]**2 - 400*x[1] + 2
+    diagonal[-1] = 200
+    diagonal[1:-1] = 202 + 1200*x[1:-1]**2 - 400*x[2:]
+    off_diagonal = -400*x[:-1]
+    return sparse.diags([off_diagonal, diagonal, off_diagonal], [-1, 0, 1],
+                        format = 'csr')
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
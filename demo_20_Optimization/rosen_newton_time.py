@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Newton Methods on the Rosenbrock Function
+#
+##################################################
+#
+# Compares the running time and the peak memory of
+# minimize() with the Newton-CG and trust-region methods
+# on the Rosenbrock function in n = 10**2 to 10**6 variables,
+# with the Hessian in the forms in rosen_functions.py:
+#   'hessp':  only the Hessian-vector product rosen_hess_p(),
+#   'sparse': the sparse tridiagonal Hessian rosen_hess_sparse(),
+#   'dense':  the dense Hessian rosen_hess(), as in scipy_optimization.py.
+#
+# The dense Hessian takes 8*n**2 bytes, 800 MB at n = 10**4,
+# so it is only run for n <= MAX_N_DENSE.
+# The trust-krylov method stores a Lanczos basis
+# of up to 1000 vectors of length n, 4.8 GB at n = 10**4,
+# so it is only run for n <= MAX_N_KRYLOV.
+#
+##################################################
+"""
+
+
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.optimize import minimize
+
+import rosen_functions as rf
+
+
+MAX_N_DENSE = 10**3
+MAX_N_KRYLOV = 10**3
+
+# The method and the form of the Hessian for each run.
+SOLVERS = [('Newton-CG', 'hessp'),
+           ('trust-ncg', 'hessp'),
+           ('trust-krylov', 'hessp'),
+           ('Newton-CG', 'sparse'),
+           ('Newton-CG', 'dense')]
+
+
+def starting_point(n):
+    """ (int) -> array
+
+    Return a starting point away from the minimum at x = 1,
+    which is the same for every method.
+    """
+
+    return 1 + 0.3*np.sin(np.arange(n))
+
+
+def hessian_args(hess_form):
+    """ (str) -> dict
+
+    Return the arguments of minimize() for the form of the Hessian.
+    """
+
+    if hess_form == 'hessp':
+        return {'hessp': rf.rosen_hess_p}
+    elif hess_form == 'sparse':
+        return {'hess': rf.rosen_hess_sparse}
+    return {'hess': rf.rosen_hess}
+
+
+def solver_options(method):
+    """ (str) -> dict
+
+    Return the options for minimize(), with the tolerance
+    used for Newton-CG in scipy_optimization.py.
+    """
+
+    if method == 'Newton-CG':
+        return {'xtol': 1e-8}
+    return {}
+
+
+def run_solver(method, hess_form, n):
+    """ (str, str, int) -> (number, number, OptimizeResult)
+
+    Return the wall time in seconds and the peak memory in MB
+    to minimize the Rosenbrock function in n variables,
+    and the result from minimize().
+    The memory is measured with tracemalloc, in a separate run,
+    since tracing the allocations slows down the calculation.
+    """
+
+    x0 = starting_point(n)
+    kwargs = hessian_args(hess_form)
+    kwargs['options'] = solver_options(method)
+
+    t1 = time.perf_counter()
+    res = minimize(rf.rosen, x0, method = method, jac = rf.rosen_der, **kwargs)
+    t2 = time.perf_counter()
+
+    tracemalloc.start()
+    minimize(rf.rosen, x0, method = method, jac = rf.rosen_der, **kwargs)
+    peak_mem = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return t2 - t1, peak_mem/10**6, res
+
+
+def print_times(n_list):
+    """ (list) -> NoneType
+
+    Print the wall time, peak memory, number of iterations
+    and the minimum for each method and form of the Hessian
+    and each number of variables n in n_list.
+    """
+
+    print("n\tmethod\t\thessian\ttime (s)\tpeak (MB)\tnit\tfun")
+    for n in n_list:
+        for method, hess_form in SOLVERS:
+            if hess_form == 'dense' and n > MAX_N_DENSE:
+                continue
+            if method == 'trust-krylov' and n > MAX_N_KRYLOV:
+                continue
+            run_time, peak_mem, res = run_solver(method, hess_form, n)
+            print("{0}\t{1:12}\t{2}\t{3:8.3f}\t{4:9.1f}\t{5}\t{6:.2e}".format(
+                    n, method, hess_form, run_time, peak_mem, res.nit, res.fun))
+
+
+if __name__ == '__main__':
+
+    print_times([10**2, 10**3, 10**4, 10**5, 10**6])
@@ -35,6 +35,13 @@ import matplotlib.pyplot as plt
 # THese modules optimize by minimizing. 
 from scipy.optimize import minimize_scalar
 from scipy.optimize import minimize
+# Automatic derivatives, in the module dual_numbers.py 
+# in the folder demo_16_Solving_Equations.
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 
+                             '..', 'demo_16_Solving_Equations'))
+import dual_numbers as dn
 # Other modules to use when you have constraints:
 # from scipy.optimize import Bounds
 # from scipy.optimize import LinearConstraint
@@ -135,6 +142,25 @@ print(f_prime(x_star))
 # Seems like an optimum but it's lower.
 
 
+# Writing the derivatives by hand is tedious and easy to get wrong. 
+# Instead, the derivatives can be calculated exactly 
+# from f alone with dual numbers, which carry the derivative
+# along with the value through each step of the calculation. 
+f_prime_auto, f_2prime_auto = dn.auto_derivatives(f)
+
+# These match the hand-written derivatives:
+print(f_prime_auto(0.5), f_prime(0.5))
+print(f_2prime_auto(0.5), f_2prime(0.5))
+
+# So Newton's method can be used with only the function f:
+x_star_auto = newton_f_opt(0, f_prime_auto, f_2prime_auto)
+print(x_star_auto)
+
+# Each derivative takes a few microseconds longer to calculate 
+# than the hand-written formula: 
+# see the script dual_numbers_time.py. 
+
+
 # Calculate the graph on a wider grid of values.
 x_grid = np.arange(-1.0, 5, 0.01)
 f_grid = f(x_grid)
@@ -336,6 +362,37 @@ print(res_hp.fun)
 print(rosen(res_hp.x))
 
 
+#--------------------------------------------------
+# Many variables: the Hessian without the matrix
+#--------------------------------------------------
+
+# The dense matrix from rosen_hess() takes 8*n**2 bytes,
+# which is 8 terabytes for n = 10**6 variables.
+# The Rosenbrock function and its derivatives are in
+# the module rosen_functions.py in this folder,
+# with the Hessian as a sparse matrix of only the three diagonals.
+import rosen_functions as rf
+
+n = 10**5
+x0_big = 1 + 0.3*np.sin(np.arange(n))
+
+# Newton-CG and the trust-region methods only need the product:
+res_big = minimize(rf.rosen, x0_big, method='trust-ncg',
+                   jac=rf.rosen_der, hessp=rf.rosen_hess_p)
+print(res_big.nit)
+print(res_big.fun)
+
+# Or use the sparse Hessian matrix:
+res_big = minimize(rf.rosen, x0_big, method='Newton-CG',
+                   jac=rf.rosen_der, hess=rf.rosen_hess_sparse,
+                   options={'xtol': 1e-8})
+print(res_big.nit)
+print(res_big.fun)
+
+# The times and memory for n up to 10**6
+# are compared in rosen_newton_time.py.
+
+
 
 # ... and many more ...
 
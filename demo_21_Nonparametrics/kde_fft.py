@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Kernel Density Estimation with Binning and the FFT
+#
+##################################################
+#
+# This module calculates the Gaussian kernel density
+# drawn by dist.plot.kde() in python_nonparametrics.py,
+# which calls scipy.stats.gaussian_kde().
+# That adds up a kernel for every observation
+# at every point on the plot: n*m terms for n observations
+# and m points.
+#
+# Here, the observations are first spread over an
+# equally spaced grid of G points by linear binning,
+# and the kernel is applied to the G bin counts
+# as a convolution, calculated with the Fast Fourier Transform
+# in O(G*log(G)) operations, which does not depend on n.
+# The transform of the bin counts is reused
+# for every bandwidth.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import numpy as np
+from typing import List, Tuple, Union
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Bandwidth
+#--------------------------------------------------
+
+def kde_bandwidth(x: np.ndarray, bw_method: Union[str, float] = None) -> float:
+    """
+    Calculates the bandwidth, the standard deviation of the
+    Gaussian kernel, as in gaussian_kde(x, bw_method):
+    the sample standard deviation of x times a factor, which is
+    n**(-1/5) for 'scott' (the default),
+    (n*3/4)**(-1/5) for 'silverman',
+    or the number bw_method.
+
+    >>> x = np.array([1.0, 2.0, 4.0, 7.0])
+    >>> round(kde_bandwidth(x, 0.5), 10)
+    1.3228756555
+    >>> round(kde_bandwidth(x), 10)
+    2.0051045465
+    >>> kde_bandwidth(x, 'wide')
+    Error in kde_bandwidth: bw_method must be 'scott', 'silverman' or a number.
+    """
+
+    num_obs = len(x)
+    if bw_method is None or bw_method == 'scott':
+        factor = num_obs**(-1/5)
+    elif bw_method == 'silverman':
+        factor = (num_obs*3/4)**(-1/5)
+    elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+        factor = bw_method
+    else:
+        print("Error in kde_bandwidth: bw_method must be 'scott', 'silverman' or a number.")
+        return None
+
+    return float(factor*np.std(x, ddof = 1))
+
+
+#--------------------------------------------------
+# Linear binning
+#--------------------------------------------------
+
+def linear_binning(x: np.ndarray, grid_min: float, grid_max: float,
+                   num_grid: int) -> np.ndarray:
+    """
+    Spreads the observations x over the num_grid equally spaced
+    points from grid_min to grid_max:
+    each observation is split between the two nearest grid points,
+    in proportion to how close it is to each,
+    so that the counts add up to the number of observations
+    and their mean is the mean of x.
+    Every x must be between grid_min and grid_max.
+
+    >>> linear_binning(np.array([0.0, 0.25, 1.0, 2.0]), 0, 2, 3)
+    array([1.75, 1.25, 1.  ])
+    """
+
+    delta = (grid_max - grid_min)/(num_grid - 1)
+    position = (np.asarray(x, dtype = float) - grid_min)/delta
+    left = np.clip(np.floor(position).astype(np.int64), 0, num_grid - 2)
+    frac = position - left
+
+    counts = np.bincount(left, weights = 1 - frac, minlength = num_grid)
+    counts += np.bincount(left + 1, weights = frac, minlength = num_grid)
+
+    return counts
+
+
+#--------------------------------------------------
+# Kernel density by FFT
+#--------------------------------------------------
+
+def kde_fft_grid(x: np.ndarray, bandwidths: List[float],
+                 grid_min: float, grid_max: float,
+                 num_grid: int = 16384,
+                 num_sd: float = 6.0) -> np.ndarray:
+    """
+    Calculates the Gaussian kernel density of x
+    on num_grid equally spaced points from grid_min to grid_max,
+    for each bandwidth in bandwidths,
+    returned as the rows of an array.
+
+    The observations are binned once with linear_binning(),
+    and each kernel, cut off at num_sd bandwidths,
+    is convolved with the bin counts using np.fft.rfft().
+
+    >>> x = np.array([-1.0, 0.0, 0.5, 2.0])
+    >>> density = kde_fft_grid(x, [0.5, 1.0], -5, 5, num_grid = 1001)
+    >>> density.shape
+    (2, 1001)
+
+    Each density adds up to nearly 1 over the grid, with a spacing of 0.01,
+    and matches gaussian_kde() at x = 0 and x = 1:
+
+    >>> (density.sum(axis = 1)*0.01).round(3)
+    array([1., 1.])
+    >>> density[:, [500, 600]].round(4)
+    array([[0.3475, 0.175 ],
+           [0.2617, 0.2225]])
+    >>> kde_fft_grid(x, [0.0], -5, 5)
+    Error in kde_fft_grid: bandwidths must be positive.
+    >>> kde_fft_grid(x, [0.5], 1, 1)
+    Error in kde_fft_grid: grid_max must be greater than grid_min.
+    """
+
+    if not all(h > 0 for h in bandwidths):
+        print("Error in kde_fft_grid: bandwidths must be positive.")
+        return None
+    if not grid_max > grid_min:
+        print("Error in kde_fft_grid: grid_max must be greater than grid_min.")
+        return None
+
+    num_obs = len(x)
+    delta = (grid_max - grid_min)/(num_grid - 1)
+    counts = linear_binning(x, grid_min, grid_max, num_grid)
+
+    # The kernel for each bandwidth at the offsets -L*delta, ..., L*delta,
+    # up to num_sd bandwidths or the width of the grid.
+    half_widths = [int(min(num_grid - 1, np.ceil(num_sd*h/delta)))
+                   for h in bandwidths]
+
+    # Pad with zeros so that the circular convolution of the FFT
+    # does not wrap around the ends of the grid.
+    num_fft = 1
+    while num_fft < num_grid + 2*max(half_widths):
+        num_fft = 2*num_fft
+    counts_fft = np.fft.rfft(counts, num_fft)
+
+    density = np.empty((len(bandwidths), num_grid))
+    for k, h in enumerate(bandwidths):
+        L = half_widths[k]
+        offsets = np.arange(- L, L + 1)*delta
+        kernel = np.exp(- 0.5*(offsets/h)**2)/(h*np.sqrt(2*np.pi))
+        conv = np.fft.irfft(counts_fft*np.fft.rfft(kernel, num_fft), num_fft)
+        density[k] = conv[L:L + num_grid]/num_obs
+
+    # Rounding in the FFT leaves tiny negative values
+    # where the density is nearly zero.
+    return np.maximum(density, 0.0)
+
+
+def kde_fft(x: np.ndarray, x_eval: np.ndarray = None,
+            bw_method: Union[str, float, List] = None,
+            num_grid: int = 16384) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the Gaussian kernel density of x at the points x_eval,
+    with the bandwidth set by bw_method as in gaussian_kde(),
+    which can also be a list of values of bw_method,
+    so that the densities for several bandwidths
+    are calculated from one set of bin counts.
+    By default, x_eval is the 1000 points plotted by dist.plot.kde().
+
+    The density is calculated on a grid of num_grid points
+    with kde_fft_grid() and interpolated to x_eval.
+    Returns x_eval and the density, with one row for each
+    value of bw_method if bw_method is a list.
+
+    >>> from scipy.stats import gaussian_kde
+    >>> x = np.random.default_rng(42).normal(size = 500)
+    >>> x_eval, density = kde_fft(x)
+    >>> len(x_eval), float(x_eval[0]) == float(x.min() - 0.5*np.ptp(x))
+    (1000, True)
+    >>> direct = gaussian_kde(x).evaluate(x_eval)
+    >>> float(np.max(np.abs(density - direct))) < 1e-5
+    True
+    >>> x_eval, density = kde_fft(x, np.array([0.0, 1.0]), [0.1, 'silverman'])
+    >>> bool(np.allclose(density[0], gaussian_kde(x, 0.1).evaluate(x_eval),
+    ...                  atol = 1e-5))
+    True
+
+    If all the observations are equal, their standard deviation
+    and the bandwidth are zero:
+
+    >>> kde_fft(np.ones(10), bw_method = 0.5)
+    Error in kde_fft: the bandwidth is zero, as when all of x are equal.
+    """
+
+    x = np.asarray(x, dtype = float)
+    x = x[~ np.isnan(x)]
+    if x_eval is None:
+        sample_range = np.ptp(x)
+        x_eval = np.linspace(x.min() - 0.5*sample_range,
+                             x.max() + 0.5*sample_range, 1000)
+    x_eval = np.asarray(x_eval, dtype = float)
+
+    bw_list = bw_method if isinstance(bw_method, list) else [bw_method]
+    bandwidths = [kde_bandwidth(x, bw) for bw in bw_list]
+    if any(h is None for h in bandwidths):
+        return None
+    if not all(h > 0 for h in bandwidths):
+        print("Error in kde_fft: the bandwidth is zero, as when all of x are equal.")
+        return None
+
+    grid_min = min(x.min(), x_eval.min())
+    grid_max = max(x.max(), x_eval.max())
+    grid = np.linspace(grid_min, grid_max, num_grid)
+    density = kde_fft_grid(x, bandwidths, grid_min, grid_max, num_grid)
+    density = np.array([np.interp(x_eval, grid, d) for d in density])
+
+    if not isinstance(bw_method, list):
+        density = density[0]
+
+    return x_eval, density
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Kernel Density Estimation with the FFT
+#
+##################################################
+#
+# Checks kde_fft() in kde_fft.py against gaussian_kde(),
+# which dist.plot.kde() uses in python_nonparametrics.py,
+# for the densities of the tractor prices and log prices,
+# and compares the running time of the two
+# for simulated prices with up to 10**6 observations.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import gaussian_kde
+
+import kde_fft as kf
+
+
+# The bandwidths plotted in python_nonparametrics.py.
+BW_METHODS = [None, 1, 0.1]
+
+
+def time_it(func, *args, num_reps = 1):
+    """ (function, ...) -> (number, object)
+
+    Return the number of seconds it takes to run func(*args),
+    averaged over num_reps runs, and the result.
+    """
+
+    t1 = time.perf_counter()
+    for k in range(num_reps):
+        result = func(*args)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) / num_reps, result
+
+
+def kde_direct(x, bw_methods):
+    """ (array, list) -> (array, array)
+
+    Return the points plotted by dist.plot.kde()
+    and the density from gaussian_kde() for each bandwidth.
+    """
+
+    sample_range = np.ptp(x)
+    x_eval = np.linspace(x.min() - 0.5*sample_range,
+                         x.max() + 0.5*sample_range, 1000)
+    density = np.array([gaussian_kde(x, bw).evaluate(x_eval)
+                        for bw in bw_methods])
+
+    return x_eval, density
+
+
+def print_errors(tractors):
+    """ (DataFrame) -> NoneType
+
+    Print the largest difference between the densities
+    from kde_fft() and gaussian_kde(), relative to the
+    highest value of the density, for the tractor prices.
+    """
+
+    print("variable\tbw_method\tmax density\trelative error")
+    for col, bw_methods in [('saleprice', BW_METHODS),
+                            ('log_saleprice', [0.5])]:
+        x = tractors[col].values
+        x_eval, direct = kde_direct(x, bw_methods)
+        x_eval, fft = kf.kde_fft(x, x_eval, list(bw_methods))
+        for k, bw in enumerate(bw_methods):
+            max_density = direct[k].max()
+            error = np.max(np.abs(fft[k] - direct[k]))/max_density
+            print("{0:13}\t{1}\t\t{2:.4e}\t{3:.2e}".format(
+                    col, bw, max_density, error))
+
+
+def print_times(n_list):
+    """ (list) -> NoneType
+
+    Print the time in seconds to calculate the densities
+    for the three bandwidths with gaussian_kde() and kde_fft(),
+    for simulated prices with n observations for each n in n_list.
+    """
+
+    rng = np.random.default_rng(42)
+    print("n\tdirect (s)\tfft (s)\tratio\trelative error")
+    for n in n_list:
+        x = np.exp(rng.normal(11, 0.8, size = n))
+        direct_time, (x_eval, direct) = time_it(kde_direct, x, BW_METHODS)
+        fft_time, (x_eval, fft) = time_it(kf.kde_fft, x, x_eval,
+                                          BW_METHODS, num_reps = 10)
+        error = np.max(np.abs(fft - direct))/direct.max()
+        print("{0}\t{1:10.4f}\t{2:.4f}\t{3:6.0f}\t{4:.2e}".format(
+                n, direct_time, fft_time, direct_time/fft_time, error))
+
+
+if __name__ == '__main__':
+
+    tractors = pd.read_csv('tractor_sales.csv')
+    tractors['log_saleprice'] = np.log(tractors['saleprice'])
+    print_errors(tractors)
+    print()
+    print_times([10**3, 10**4, 10**5, 10**6])
@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Fast Kernel Regression with One Regressor
+#
+##################################################
+#
+# This module calculates the kernel regression
+# estimated by npreg.KernelReg() in python_nonparametrics.py,
+# for one continuous variable x, such as horsepower.
+# KernelReg.fit() adds up a kernel weight for every observation
+# at every prediction point: n*m terms for n observations
+# and m points.
+#
+# Here, the data are sorted once, so that the observations
+# with positive weight at each prediction point,
+# those within one bandwidth for kernels with compact support,
+# are a window of consecutive observations, found by binary search.
+# For the polynomial kernels, such as the Epanechnikov kernel,
+# the sums over each window are differences of
+# cumulative sums, so a fit takes O((n + m)*log(n)) operations.
+# The Gaussian kernel used by KernelReg is cut off at num_sd
+# bandwidths and added up over the window.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import time
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+from scipy.special import comb
+from typing import Dict, List
+
+
+##################################################
+# Kernel Functions
+##################################################
+
+
+# The kernels with compact support, as the coefficients
+# of polynomials in abs(u), from the constant term up,
+# for abs(u) <= 1, where u = (x_i - x)/bw.
+# The 'tricube' kernel is zero for abs(u) > 1;
+# note that the tricube kernel in statsmodels is not,
+# so its results differ.
+COMPACT_KERNELS = {
+    'uniform': np.array([0.5]),
+    'epanechnikov': 0.75*np.array([1.0, 0.0, -1.0]),
+    'biweight': 15/16*np.polynomial.polynomial.polypow([1.0, 0.0, -1.0], 2),
+    'triweight': 35/32*np.polynomial.polynomial.polypow([1.0, 0.0, -1.0], 3),
+    'tricube': 70/81*np.polynomial.polynomial.polypow([1.0, 0.0, 0.0, -1.0], 3)
+}
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Sorting the data
+#--------------------------------------------------
+
+def kernel_reg_prepare(x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sorts the data by x once, for any number of fits
+    with kernel_reg_fit().
+    The dictionary holds the sorted 'x' and 'y'
+    and the 'order' that sorts the original data.
+
+    >>> data = kernel_reg_prepare([3.0, 1.0, 2.0], [30.0, 10.0, 20.0])
+    >>> data['x'], data['y'], data['order']
+    (array([1., 2., 3.]), array([10., 20., 30.]), array([1, 2, 0]))
+    """
+
+    x = np.asarray(x, dtype = float)
+    order = np.argsort(x, kind = 'stable')
+
+    return {'x': x[order],
+            'y': np.asarray(y, dtype = float)[order],
+            'order': order}
+
+
+#--------------------------------------------------
+# Window sums
+#--------------------------------------------------
+
+def compact_window_sums(data: Dict[str, np.ndarray], bw: float,
+                        x_pred: np.ndarray,
+                        kernel: str = 'epanechnikov') -> np.ndarray:
+    """
+    Calculates the sums of K(u_i)*(x_i - x)**q and K(u_i)*(x_i - x)**q*y_i,
+    for q = 0, 1, 2, with u_i = (x_i - x)/bw,
+    at each point x in x_pred, for a kernel in COMPACT_KERNELS.
+    Returns an array with these six sums in the rows.
+
+    The sorted x_i are divided into cells of width bw.
+    The window from x - bw to x + bw spans at most three cells
+    and is split into pieces on the left and the right of x
+    within one cell, where K(u) is a polynomial in u.
+    The sums over each piece are differences of the cumulative sums
+    of the powers of the distance from the middle of the cell,
+    which are between -1/2 and 1/2 so that little precision is lost.
+
+    >>> data = kernel_reg_prepare([0.0, 0.5, 1.0, 3.0], [1.0, 2.0, 3.0, 4.0])
+    >>> compact_window_sums(data, 1.0, np.array([0.5, 3.0])).round(6)
+    array([[1.875  , 0.75   ],
+           [0.     , 0.     ],
+           [0.28125, 0.     ],
+           [3.75   , 3.     ],
+           [0.5625 , 0.     ],
+           [0.5625 , 0.     ]])
+    """
+
+    kernel_coefs = COMPACT_KERNELS[kernel]
+    max_power = len(kernel_coefs) + 1
+    x = data['x']
+    y = data['y']
+    x_pred = np.asarray(x_pred, dtype = float)
+
+    # Positions in units of the bandwidth, from the smallest x.
+    z = (x - x[0])/bw
+    z_pred = (x_pred - x[0])/bw
+    cell = np.floor(z)
+    w = z - cell - 0.5
+
+    # Cumulative sums of w**m and y*w**m, with a 0 in front,
+    # where w is the distance from the middle of the cell.
+    # They are added up in extended precision, since the rounding error
+    # in a cumulative sum grows with the number of observations
+    # and the sums over small windows are differences of large sums.
+    w_powers = np.ones((max_power + 1, len(x)))
+    for m in range(1, max_power + 1):
+        np.multiply(w_powers[m - 1], w, out = w_powers[m])
+    cum_w = np.zeros((max_power + 1, len(x) + 1), dtype = np.longdouble)
+    cum_yw = np.zeros((max_power + 1, len(x) + 1), dtype = np.longdouble)
+    np.cumsum(w_powers, axis = 1, out = cum_w[:, 1:])
+    np.cumsum(w_powers*y, axis = 1, out = cum_yw[:, 1:])
+
+    # Ends of the window and the pieces within each cell.
+    cell_pred = np.floor(z_pred)
+    lo = np.searchsorted(z, z_pred - 1, side = 'left')
+    mid = np.searchsorted(z, z_pred, side = 'left')
+    hi = np.searchsorted(z, z_pred + 1, side = 'right')
+    start_cell = np.searchsorted(cell, cell_pred, side = 'left')
+    start_next = np.searchsorted(cell, cell_pred + 1, side = 'left')
+    pieces = [(lo, start_cell, cell_pred - 1, -1),
+              (start_cell, mid, cell_pred, -1),
+              (mid, start_next, cell_pred, 1),
+              (start_next, hi, cell_pred + 1, 1)]
+
+    sums = np.zeros((6, len(x_pred)))
+    for start, stop, cell_start, sign in pieces:
+        sum_w = (cum_w[:, stop] - cum_w[:, start]).astype(float)
+        sum_yw = (cum_yw[:, stop] - cum_yw[:, start]).astype(float)
+
+        # Sums of u**r and y*u**r, where u = w - shift within this piece,
+        # expanding each power of u in powers of w.
+        neg_shift = cell_start + 0.5 - z_pred
+        shift_powers = np.ones((max_power + 1, len(x_pred)))
+        for m in range(1, max_power + 1):
+            np.multiply(shift_powers[m - 1], neg_shift, out = shift_powers[m])
+        sum_u = np.zeros_like(sum_w)
+        sum_yu = np.zeros_like(sum_yw)
+        for r in range(max_power + 1):
+            for m in range(r + 1):
+                coef = comb(r, m)*shift_powers[r - m]
+                sum_u[r] += coef*sum_w[m]
+                sum_yu[r] += coef*sum_yw[m]
+
+        # K(abs(u))*u**q = sum of kernel_coefs[p]*sign**p*u**(p + q).
+        signed_coefs = kernel_coefs*sign**np.arange(len(kernel_coefs))
+        for q in range(3):
+            for p, coef in enumerate(signed_coefs):
+                if coef != 0:
+                    sums[q] += coef*sum_u[p + q]*bw**q
+                    sums[3 + q] += coef*sum_yu[p + q]*bw**q
+
+    return sums
+
+
+def gaussian_window_sums(data: Dict[str, np.ndarray], bw: float,
+                         x_pred: np.ndarray, num_sd: float = 10.0,
+                         chunk_size: int = 2**20) -> np.ndarray:
+    """
+    Calculates the same sums as compact_window_sums()
+    for the Gaussian kernel, which is cut off at num_sd bandwidths,
+    where it is less than 1e-21 of its peak,
+    by adding up the weights within the window at each point.
+    The windows are processed in chunks of about chunk_size weights.
+
+    >>> data = kernel_reg_prepare([0.0, 0.5, 1.0, 3.0], [1.0, 2.0, 3.0, 4.0])
+    >>> gaussian_window_sums(data, 1.0, np.array([0.5]))[:, 0].round(6)
+    array([1.120601, 0.043821, 0.285585, 2.276259, 0.527348, 0.790273])
+    """
+
+    x = data['x']
+    y = data['y']
+    x_pred = np.asarray(x_pred, dtype = float)
+    lo = np.searchsorted(x, x_pred - num_sd*bw, side = 'left')
+    hi = np.searchsorted(x, x_pred + num_sd*bw, side = 'right')
+    counts = hi - lo
+
+    sums = np.zeros((6, len(x_pred)))
+    first = 0
+    while first < len(x_pred):
+        # Take prediction points until the chunk is full.
+        cum_counts = np.cumsum(counts[first:])
+        last = first + max(1, int(np.searchsorted(cum_counts, chunk_size)))
+        num_points = last - first
+
+        # Indices of the observations in every window of the chunk.
+        window = np.repeat(np.arange(num_points), counts[first:last])
+        window_start = np.repeat(lo[first:last] - np.concatenate(
+            [[0], np.cumsum(counts[first:last])[:-1]]), counts[first:last])
+        obs = np.arange(len(window)) + window_start
+
+        dist = x[obs] - x_pred[first:last][window]
+        weights = np.exp(- 0.5*(dist/bw)**2)/np.sqrt(2*np.pi)
+        for q in range(3):
+            sums[q, first:last] = np.bincount(window, weights = weights,
+                                              minlength = num_points)
+            sums[3 + q, first:last] = np.bincount(window, weights = weights*y[obs],
+                                                  minlength = num_points)
+            weights = weights*dist
+
+        first = last
+
+    return sums
+
+
+#--------------------------------------------------
+# Kernel regression
+#--------------------------------------------------
+
+def kernel_reg_mean(sums: np.ndarray, reg_type: str = 'll') -> np.ndarray:
+    """
+    Calculates the kernel regression estimates from the window sums
+    from compact_window_sums() or gaussian_window_sums():
+    the weighted mean of y for the local constant estimator ('lc'),
+    or the intercept of the weighted least squares line
+    for the local linear estimator ('ll').
+
+    >>> sums = np.array([[2.0, 0.0], [0.0, 0.0], [2.0, 0.0],
+    ...                  [4.0, 0.0], [2.0, 0.0], [0.0, 0.0]])
+    >>> kernel_reg_mean(sums, 'lc'), kernel_reg_mean(sums, 'll')
+    (array([ 2., nan]), array([2., 0.]))
+    """
+
+    if reg_type == 'lc':
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            mean = sums[3]/sums[0]
+    else:
+        # The weighted least squares problem for the intercept and slope,
+        # solved directly where the 2 x 2 matrix is well conditioned
+        # and with the pseudo-inverse elsewhere.
+        det = sums[0]*sums[2] - sums[1]**2
+        is_regular = det > 1e-10*(sums[0] + sums[2])**2
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            mean = (sums[2]*sums[3] - sums[1]*sums[4])/det
+        if not np.all(is_regular):
+            M = np.empty((np.sum(~ is_regular), 2, 2))
+            M[:, 0, 0] = sums[0, ~ is_regular]
+            M[:, 0, 1] = sums[1, ~ is_regular]
+            M[:, 1, 0] = sums[1, ~ is_regular]
+            M[:, 1, 1] = sums[2, ~ is_regular]
+            V = sums[3:5, ~ is_regular].T[:, :, np.newaxis]
+            mean[~ is_regular] = np.matmul(np.linalg.pinv(M), V)[:, 0, 0]
+
+    return mean
+
+
+def kernel_reg_fit(data: Dict[str, np.ndarray], bw: float,
+                   x_pred: np.ndarray = None,
+                   reg_type: str = 'll',
+                   kernel: str = 'gaussian',
+                   num_sd: float = 10.0) -> np.ndarray:
+    """
+    Calculates the kernel regression of y on x at the points x_pred,
+    as in KernelReg(y, x, var_type = 'c', reg_type, bw = [bw]).fit(x_pred)[0],
+    for the data from kernel_reg_prepare().
+    By default, the fitted values are calculated at the observations,
+    in the original order, as in KernelReg.fit().
+
+    The reg_type is 'lc' for the local constant (Nadaraya-Watson)
+    estimator, or 'll' for the local linear estimator, the default
+    in KernelReg, which solves a weighted least squares problem
+    at each point with np.linalg.pinv(), as KernelReg does.
+    The kernel is 'gaussian', the default in KernelReg,
+    or one of the COMPACT_KERNELS.
+    Where no observations are within the window,
+    such as in a gap in the data, both estimates are nan.
+
+    >>> import statsmodels.nonparametric.kernel_regression as npreg
+    >>> rng = np.random.default_rng(42)
+    >>> x = rng.uniform(0, 10, size = 200)
+    >>> y = np.sin(x) + rng.normal(scale = 0.3, size = 200)
+    >>> data = kernel_reg_prepare(x, y)
+    >>> x_grid = np.arange(0, 10, 0.5)
+    >>> for reg_type in ['lc', 'll']:
+    ...     kde_reg = npreg.KernelReg(y, x, 'c', reg_type, bw = [0.5])
+    ...     print(bool(np.allclose(kernel_reg_fit(data, 0.5, x_grid, reg_type),
+    ...                            kde_reg.fit(x_grid)[0], rtol = 0, atol = 1e-10)))
+    True
+    True
+
+    With no prediction points, it returns the fitted values:
+
+    >>> fitted = kernel_reg_fit(data, 0.5)
+    >>> bool(np.allclose(fitted, kde_reg.fit()[0], rtol = 0, atol = 1e-10))
+    True
+    >>> kernel_reg_fit(data, 0.5, x_grid, 'local')
+    Error in kernel_reg_fit: reg_type must be 'lc' or 'll'.
+
+    At x = 5, the observations at 2 and 8 are at the ends of the window,
+    where these kernels are zero:
+
+    >>> data = kernel_reg_prepare(np.array([0.0, 1.0, 2.0, 8.0, 9.0]),
+    ...                           np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    >>> [float(kernel_reg_fit(data, 3, [5.0], 'lc', kernel)[0])
+    ...  for kernel in ['epanechnikov', 'biweight', 'tricube']]
+    [nan, nan, nan]
+
+    With a smaller bandwidth, x = 5 is in a gap in the data,
+    as is x = 20 for the Gaussian kernel cut off at 2 bandwidths:
+
+    >>> [kernel_reg_fit(data, 1.5, [4.0, 5.0], reg_type, 'epanechnikov')
+    ...  for reg_type in ['lc', 'll']]
+    [array([nan, nan]), array([nan, nan])]
+    >>> [kernel_reg_fit(data, 1.5, [8.5, 20.0], reg_type, num_sd = 2).round(6)
+    ...  for reg_type in ['lc', 'll']]
+    [array([4.5, nan]), array([4.5, nan])]
+    """
+
+    if reg_type not in ['lc', 'll']:
+        print("Error in kernel_reg_fit: reg_type must be 'lc' or 'll'.")
+        return None
+    if kernel != 'gaussian' and kernel not in COMPACT_KERNELS:
+        print("Error in kernel_reg_fit: kernel must be 'gaussian' or in COMPACT_KERNELS.")
+        return None
+
+    fitted_obs = x_pred is None
+    if fitted_obs:
+        x_pred = data['x']
+    x_pred = np.asarray(x_pred, dtype = float)
+
+    if kernel == 'gaussian':
+        sums = gaussian_window_sums(data, bw, x_pred, num_sd)
+        num_inside = (np.searchsorted(data['x'], x_pred + num_sd*bw, side = 'right') -
+                      np.searchsorted(data['x'], x_pred - num_sd*bw, side = 'left'))
+        is_empty = (num_inside == 0) | (sums[0] <= 0)
+    else:
+        sums = compact_window_sums(data, bw, x_pred, kernel)
+
+        # Where no observation has positive weight, such as
+        # observations only at the ends of the window, where K(1) = 0,
+        # the differences of cumulative sums leave rounding error,
+        # so the sums are set to zero, as in kernel_reg_loo().
+        # Observations at the ends count only for the uniform kernel.
+        kernel_coefs = COMPACT_KERNELS[kernel]
+        if np.polynomial.polynomial.polyval(1.0, kernel_coefs) > 0:
+            num_inside = (np.searchsorted(data['x'], x_pred + bw, side = 'right') -
+                          np.searchsorted(data['x'], x_pred - bw, side = 'left'))
+        else:
+            num_inside = (np.searchsorted(data['x'], x_pred + bw, side = 'left') -
+                          np.searchsorted(data['x'], x_pred - bw, side = 'right'))
+        is_empty = (num_inside == 0) | (sums[0] <= 1e-10*kernel_coefs[0])
+        sums[:, is_empty] = 0.0
+
+    mean = kernel_reg_mean(sums, reg_type)
+    mean[is_empty] = np.nan
+
+    if fitted_obs:
+        # Return to the original order of the observations.
+        mean_obs = np.empty_like(mean)
+        mean_obs[data['order']] = mean
+        mean = mean_obs
+
+    return mean
+
+
+#--------------------------------------------------
+# Bandwidth selection
+#--------------------------------------------------
+
+def kernel_reg_loo(data: Dict[str, np.ndarray], bw: float,
+                   reg_type: str = 'll',
+                   kernel: str = 'epanechnikov',
+                   num_sd: float = 10.0) -> np.ndarray:
+    """
+    Calculates the leave-one-out estimates at each observation,
+    from the regression on all the other observations,
+    in the sorted order of data from kernel_reg_prepare().
+
+    The window sums at each observation include the observation itself,
+    with weight K(0) and distance 0, so its terms are subtracted
+    from the sums, instead of fitting the regression n times.
+    Where no other observation has positive weight,
+    or, for the local linear estimator, fewer than two others
+    are within the window, so that the line is not determined,
+    the estimate is nan.
+
+    >>> import statsmodels.nonparametric.kernel_regression as npreg
+    >>> rng = np.random.default_rng(42)
+    >>> x = rng.uniform(0, 10, size = 100)
+    >>> y = np.sin(x) + rng.normal(scale = 0.3, size = 100)
+    >>> data = kernel_reg_prepare(x, y)
+    >>> loo = kernel_reg_loo(data, 0.5, 'll', 'gaussian')
+    >>> kde_reg = npreg.KernelReg(y, x, 'c', 'll', bw = [0.5])
+    >>> cv = kde_reg.cv_loo(np.array([0.5]), kde_reg._est_loc_linear)
+    >>> bool(np.isclose(np.mean((data['y'] - loo)**2), cv, rtol = 1e-10))
+    True
+    """
+
+    x = data['x']
+    if kernel == 'gaussian':
+        sums = gaussian_window_sums(data, bw, x, num_sd)
+        weight_0 = 1/np.sqrt(2*np.pi)
+        half_width = num_sd*bw
+    else:
+        sums = compact_window_sums(data, bw, x, kernel)
+        weight_0 = COMPACT_KERNELS[kernel][0]
+        half_width = bw
+
+    # Remove each observation from its own window.
+    sums[0] -= weight_0
+    sums[3] -= weight_0*data['y']
+    num_others = (np.searchsorted(x, x + half_width, side = 'right') -
+                  np.searchsorted(x, x - half_width, side = 'left') - 1)
+    min_others = 1 if reg_type == 'lc' else 2
+    is_alone = (num_others < min_others) | (sums[0] <= 1e-10*weight_0)
+    sums[:, is_alone] = 0.0
+
+    loo = kernel_reg_mean(sums, reg_type)
+    loo[is_alone] = np.nan
+
+    return loo
+
+
+def loo_cv_bandwidth(data: Dict[str, np.ndarray],
+                     bw_grid: List[float] = None,
+                     reg_type: str = 'll',
+                     kernel: str = 'epanechnikov',
+                     num_sd: float = 10.0,
+                     max_alone: float = 0.01) -> OptimizeResult:
+    """
+    Chooses the bandwidth in bw_grid that minimizes the
+    leave-one-out cross-validation criterion, the mean squared error
+    of the estimates from kernel_reg_loo(), which KernelReg
+    minimizes with bw = 'cv_ls' by refitting the regression
+    without each observation, one at a time.
+    With a kernel with compact support, a small bandwidth can leave
+    an observation, such as an outlier in x, with no other
+    observations in its window. These observations are left out
+    of the mean, unless they are more than the fraction max_alone
+    of the data, in which case the criterion is inf.
+
+    By default, bw_grid is 30 values from 0.1 to 3 times
+    the rule-of-thumb bandwidth 1.06*std(x)*n**(-1/5),
+    the starting value in KernelReg.
+
+    Returns an OptimizeResult with the chosen bandwidth x,
+    the criterion at x as fun, the grid bw_grid,
+    the criterion at each bandwidth cv, the number of observations
+    left out at each bandwidth num_alone,
+    and the time in seconds for each bandwidth times.
+
+    >>> rng = np.random.default_rng(42)
+    >>> x = rng.uniform(0, 10, size = 1000)
+    >>> y = np.sin(x) + rng.normal(scale = 0.3, size = 1000)
+    >>> data = kernel_reg_prepare(x, y)
+    >>> cv_result = loo_cv_bandwidth(data, [0.05, 0.2, 0.5, 1.0, 2.0])
+    >>> float(cv_result.x), cv_result.cv.round(4)
+    (0.5, array([0.1035, 0.0938, 0.0929, 0.0966, 0.1427]))
+    >>> cv_result.num_alone
+    array([2, 0, 0, 0, 0])
+    >>> loo_cv_bandwidth(data, [0.05, 0.2], max_alone = 0).cv.round(4)
+    array([   inf, 0.0938])
+    >>> len(cv_result.times)
+    5
+    """
+
+    if bw_grid is None:
+        bw_0 = 1.06*np.std(data['x'])*len(data['x'])**(-1/5)
+        bw_grid = bw_0*np.geomspace(0.1, 3, 30)
+    bw_grid = np.asarray(bw_grid, dtype = float)
+
+    cv = np.empty(len(bw_grid))
+    num_alone = np.empty(len(bw_grid), dtype = int)
+    times = np.empty(len(bw_grid))
+    for k, bw in enumerate(bw_grid):
+        t1 = time.perf_counter()
+        loo = kernel_reg_loo(data, bw, reg_type, kernel, num_sd)
+        is_alone = np.isnan(loo)
+        num_alone[k] = np.sum(is_alone)
+        if num_alone[k] > max_alone*len(loo):
+            cv[k] = np.inf
+        else:
+            cv[k] = np.mean((data['y'][~ is_alone] - loo[~ is_alone])**2)
+        times[k] = time.perf_counter() - t1
+
+    k_best = int(np.argmin(cv))
+
+    return OptimizeResult(x = bw_grid[k_best], fun = cv[k_best],
+                          bw_grid = bw_grid, cv = cv, num_alone = num_alone,
+                          times = times, nfev = len(bw_grid),
+                          success = bool(np.isfinite(cv[k_best])))
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
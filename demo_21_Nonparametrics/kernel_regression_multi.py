@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Kernel Regression with Several Regressors
+#
+##################################################
+#
+# This module calculates the kernel regression
+# estimated by npreg.KernelReg() with several regressors,
+# such as horsepower, age and enghours,
+# which are continuous (var_type 'c'),
+# and the indicators diesel, fwd and cab,
+# which are unordered discrete variables (var_type 'u').
+# The weight of each observation is the product
+# of a kernel for each variable, with the
+# Aitchison-Aitken kernel for the discrete variables, as in KernelReg.
+#
+# KernelReg.fit() adds up the weights of all n observations
+# at each of the m prediction points.
+# Here, the continuous variables, divided by their bandwidths,
+# are stored in a KD-tree, scipy.spatial.cKDTree,
+# which finds the observations within the support of the kernel
+# around each point: within one bandwidth in every direction
+# for the kernels with compact support in kernel_regression.py,
+# such as the Epanechnikov kernel,
+# or num_sd bandwidths for the Gaussian kernel, which is cut off there.
+# The prediction points are handled in chunks,
+# which are shared among several threads.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict
+
+from kernel_regression import COMPACT_KERNELS
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Preparing the data
+#--------------------------------------------------
+
+def mixed_kernel_reg_prepare(X: np.ndarray, y: np.ndarray,
+                             var_type: str) -> Dict[str, np.ndarray]:
+    """
+    Stores the regressors X, with one column for each
+    character in var_type, 'c' for a continuous variable
+    or 'u' for an unordered discrete variable, as in KernelReg,
+    and the dependent variable y,
+    with the number of levels of each discrete variable.
+    At least one variable must be continuous.
+
+    >>> X = np.array([[1.0, 0], [2.0, 1], [3.0, 1]])
+    >>> data = mixed_kernel_reg_prepare(X, [1.0, 2.0, 4.0], 'cu')
+    >>> data['is_cont'], data['num_levels']
+    (array([ True, False]), array([0, 2]))
+    >>> mixed_kernel_reg_prepare(X, [1.0, 2.0, 4.0], 'co')
+    Error in mixed_kernel_reg_prepare: var_type must contain only 'c' and 'u'.
+    """
+
+    if any(vtype not in 'cu' for vtype in var_type) or 'c' not in var_type:
+        print("Error in mixed_kernel_reg_prepare: var_type must contain only 'c' and 'u'.")
+        return None
+
+    X = np.asarray(X, dtype = float).reshape(len(y), len(var_type))
+    is_cont = np.array([vtype == 'c' for vtype in var_type])
+    num_levels = np.array([0 if is_cont[j] else np.unique(X[:, j]).size
+                           for j in range(len(var_type))])
+
+    return {'X': X, 'y': np.asarray(y, dtype = float),
+            'is_cont': is_cont, 'num_levels': num_levels}
+
+
+#--------------------------------------------------
+# Kernel weights
+#--------------------------------------------------
+
+def product_kernel_weights(data: Dict[str, np.ndarray], bw: np.ndarray,
+                           dist: np.ndarray, kernel: str = 'gaussian') -> np.ndarray:
+    """
+    Calculates the product kernel weights as in gpke() in statsmodels,
+    up to a constant factor, for the differences dist
+    between the observations and the prediction points,
+    with one row for each pair and one column for each variable.
+    The continuous variables have the kernel 'gaussian'
+    or one of the COMPACT_KERNELS,
+    and the discrete variables have the Aitchison-Aitken kernel:
+    1 - bw for the same level and bw/(c - 1) otherwise,
+    with c levels.
+
+    >>> data = mixed_kernel_reg_prepare([[0.0, 0], [1.0, 1]], [1.0, 2.0], 'cu')
+    >>> dist = np.array([[0.0, 0], [0.5, 1], [2.0, 0]])
+    >>> product_kernel_weights(data, np.array([1.0, 0.2]), dist).round(4)
+    array([0.3192, 0.0704, 0.0432])
+    >>> product_kernel_weights(data, np.array([1.0, 0.2]), dist, 'epanechnikov')
+    array([0.6   , 0.1125, 0.    ])
+    """
+
+    weights = np.ones(len(dist))
+    for j in range(len(bw)):
+        if data['is_cont'][j]:
+            u = dist[:, j]/bw[j]
+            if kernel == 'gaussian':
+                weights *= np.exp(- 0.5*u**2)/np.sqrt(2*np.pi)
+            else:
+                weights *= np.where(np.abs(u) <= 1, np.polynomial.polynomial.polyval(
+                    np.abs(u), COMPACT_KERNELS[kernel]), 0.0)
+        else:
+            weights *= np.where(dist[:, j] == 0, 1 - bw[j],
+                                bw[j]/(data['num_levels'][j] - 1))
+
+    return weights
+
+
+#--------------------------------------------------
+# Kernel regression
+#--------------------------------------------------
+
+def mixed_kernel_reg_chunk(data: Dict[str, np.ndarray], bw: np.ndarray,
+                           tree: cKDTree, X_pred: np.ndarray,
+                           radius: float, reg_type: str = 'll',
+                           kernel: str = 'gaussian') -> np.ndarray:
+    """
+    Calculates the kernel regression at the rows of X_pred,
+    using the observations found in the KD-tree
+    within radius bandwidths of each point
+    in every continuous variable, as in mixed_kernel_reg_fit().
+
+    For the local linear estimator, the weighted least squares problem
+    for the intercept and the slopes on all of the variables,
+    as in KernelReg, is solved at each point with np.linalg.pinv(),
+    which drops a discrete variable that does not vary among the
+    observations with positive weight.
+    """
+
+    is_cont = data['is_cont']
+    neighbours = tree.query_ball_point(X_pred[:, is_cont]/bw[is_cont],
+                                       r = radius, p = np.inf)
+    counts = np.array([len(obs) for obs in neighbours])
+    num_points = len(X_pred)
+    num_vars = X_pred.shape[1]
+
+    # All the pairs of a prediction point and a nearby observation,
+    # in order of the prediction points.
+    point = np.repeat(np.arange(num_points), counts)
+    obs = np.concatenate([np.asarray(obs, dtype = np.int64) for obs in neighbours])
+    dist = data['X'][obs] - X_pred[point]
+    weights = product_kernel_weights(data, bw, dist, kernel)
+
+    if reg_type == 'lc':
+        sum_weights = np.bincount(point, weights = weights, minlength = num_points)
+        sum_weights_y = np.bincount(point, weights = weights*data['y'][obs],
+                                    minlength = num_points)
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            return sum_weights_y/sum_weights
+
+    # The weighted sums of products of (1, dist, y) at each point,
+    # from the block of pairs for that point:
+    # the moment matrix M of (1, dist) and the vector V of its products with y.
+    # Each block is one matrix product, which BLAS calculates
+    # without holding the GIL, so the threads run in parallel.
+    design = np.column_stack([np.ones(len(obs)), dist, data['y'][obs]])
+    weighted = design*weights[:, np.newaxis]
+    ends = np.cumsum(counts)
+    moments = np.empty((num_points, num_vars + 2, num_vars + 2))
+    for i in range(num_points):
+        block = slice(ends[i] - counts[i], ends[i])
+        moments[i] = weighted[block].T @ design[block]
+    M = moments[:, :-1, :-1]
+    V = moments[:, :-1, -1:]
+    mean = np.matmul(np.linalg.pinv(M), V)[:, 0, 0]
+
+    # No observation has positive weight, as in kernel_reg_fit().
+    mean[moments[:, 0, 0] <= 0] = np.nan
+
+    return mean
+
+
+def mixed_kernel_reg_fit(data: Dict[str, np.ndarray], bw: np.ndarray,
+                         X_pred: np.ndarray = None,
+                         reg_type: str = 'll',
+                         kernel: str = 'gaussian',
+                         num_sd: float = 10.0,
+                         chunk_size: int = 1024,
+                         num_workers: int = None) -> np.ndarray:
+    """
+    Calculates the kernel regression of y on X at the rows of X_pred,
+    as in KernelReg(y, X, var_type, reg_type, bw = bw).fit(X_pred)[0],
+    for the data from mixed_kernel_reg_prepare(),
+    with one bandwidth in bw for each variable.
+    By default, the fitted values are calculated at the observations.
+
+    The reg_type is 'lc' for the local constant estimator,
+    or 'll' for the local linear estimator, the default in KernelReg.
+    The kernel for the continuous variables is 'gaussian',
+    the default in KernelReg, cut off at num_sd bandwidths,
+    or one of the COMPACT_KERNELS.
+    The prediction points are handled in chunks of chunk_size points,
+    by num_workers threads, which is the number of processors by default.
+    Where no observations are within the window,
+    both estimates are nan, as in kernel_reg_fit().
+
+    >>> import statsmodels.nonparametric.kernel_regression as npreg
+    >>> rng = np.random.default_rng(42)
+    >>> X = np.column_stack([rng.uniform(0, 10, size = 300),
+    ...                      rng.uniform(0, 5, size = 300),
+    ...                      rng.integers(0, 2, size = 300)])
+    >>> y = np.sin(X[:, 0]) + X[:, 1] + X[:, 2] + rng.normal(scale = 0.3, size = 300)
+    >>> data = mixed_kernel_reg_prepare(X, y, 'ccu')
+    >>> bw = np.array([1.0, 1.5, 0.2])
+    >>> X_grid = np.array([[2.0, 1.0, 0], [5.0, 2.5, 1], [8.0, 4.0, 1]])
+    >>> for reg_type in ['lc', 'll']:
+    ...     kde_reg = npreg.KernelReg(y, X, 'ccu', reg_type, bw = bw)
+    ...     print(bool(np.allclose(mixed_kernel_reg_fit(data, bw, X_grid, reg_type),
+    ...                            kde_reg.fit(X_grid)[0], rtol = 0, atol = 1e-10)))
+    True
+    True
+
+    With no prediction points, it returns the fitted values:
+
+    >>> fitted = mixed_kernel_reg_fit(data, bw, chunk_size = 64, num_workers = 2)
+    >>> bool(np.allclose(fitted, kde_reg.fit()[0], rtol = 0, atol = 1e-10))
+    True
+    >>> [mixed_kernel_reg_fit(data, bw, [[20.0, 2.5, 1]], reg_type, 'epanechnikov')
+    ...  for reg_type in ['lc', 'll']]
+    [array([nan]), array([nan])]
+    >>> mixed_kernel_reg_fit(data, bw, kernel = 'cosine')
+    Error in mixed_kernel_reg_fit: kernel must be 'gaussian' or in COMPACT_KERNELS.
+    """
+
+    if reg_type not in ['lc', 'll']:
+        print("Error in mixed_kernel_reg_fit: reg_type must be 'lc' or 'll'.")
+        return None
+    if kernel != 'gaussian' and kernel not in COMPACT_KERNELS:
+        print("Error in mixed_kernel_reg_fit: kernel must be 'gaussian' or in COMPACT_KERNELS.")
+        return None
+
+    bw = np.asarray(bw, dtype = float)
+    if X_pred is None:
+        X_pred = data['X']
+    X_pred = np.asarray(X_pred, dtype = float).reshape(-1, len(bw))
+
+    is_cont = data['is_cont']
+    tree = cKDTree(data['X'][:, is_cont]/bw[is_cont])
+    radius = num_sd if kernel == 'gaussian' else 1.0
+
+    mean = np.empty(len(X_pred))
+    def fit_chunk(first):
+        last = min(first + chunk_size, len(X_pred))
+        mean[first:last] = mixed_kernel_reg_chunk(data, bw, tree, X_pred[first:last],
+                                                  radius, reg_type, kernel)
+
+    if num_workers is None:
+        num_workers = os.cpu_count()
+    with ThreadPoolExecutor(max_workers = num_workers) as executor:
+        # list() waits for every chunk and raises any error.
+        list(executor.map(fit_chunk, range(0, len(X_pred), chunk_size)))
+
+    return mean
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Kernel Regression with Several Regressors
+#
+##################################################
+#
+# Checks mixed_kernel_reg_fit() in kernel_regression_multi.py
+# against KernelReg.fit() for the regression of the log of the
+# tractor prices on horsepower, age and enghours,
+# with the indicators diesel, fwd and cab,
+# and compares the running time of the two
+# for simulated data with up to 10**5 observations.
+# KernelReg is only run for n <= MAX_N_KERNELREG
+# and the Gaussian kernel for n <= MAX_N_GAUSSIAN:
+# it is cut off at 10 bandwidths, which covers most of the data,
+# so it gains nothing from the KD-tree
+# and is no faster than KernelReg for 10**4 observations.
+# The Epanechnikov kernel, with compact support, is run for every n,
+# with one thread and with one for each processor.
+#
+##################################################
+"""
+
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.nonparametric.kernel_regression as npreg
+
+import kernel_regression_multi as km
+
+
+MAX_N_KERNELREG = 10**4
+MAX_N_GAUSSIAN = 10**3
+
+VAR_NAMES = ['horsepower', 'age', 'enghours', 'diesel', 'fwd', 'cab']
+VAR_TYPE = 'cccuuu'
+
+
+def time_it(func, *args, num_reps = 1, **kwargs):
+    """ (function, ...) -> (number, object)
+
+    Return the number of seconds it takes to run func(*args, **kwargs),
+    averaged over num_reps runs, and the result.
+    """
+
+    t1 = time.perf_counter()
+    for k in range(num_reps):
+        result = func(*args, **kwargs)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) / num_reps, result
+
+
+def simulate_data(n, rng):
+    """ (int, Generator) -> (array, array, array)
+
+    Return simulated regressors like those of the tractors,
+    with the dependent variable and the bandwidths
+    from the normal reference rule, with 0.1 for the indicators.
+    """
+
+    X = np.column_stack([rng.lognormal(4.4, 0.6, size = n),
+                         rng.uniform(0, 30, size = n),
+                         rng.lognormal(7.5, 1.0, size = n),
+                         rng.integers(0, 2, size = (n, 3))])
+    y = (10 + 0.01*X[:, 0] - 0.00001*X[:, 0]**2 - 0.05*X[:, 1]
+         + 0.1*X[:, 3] + 0.2*X[:, 5] + rng.normal(scale = 0.5, size = n))
+    bw = np.concatenate([1.06*np.std(X[:, :3], axis = 0)*n**(-1/7), [0.1]*3])
+
+    return X, y, bw
+
+
+def print_errors(tractors, bw):
+    """ (DataFrame, array) -> NoneType
+
+    Print the largest difference between the fits from
+    mixed_kernel_reg_fit() and KernelReg.fit() with bandwidths bw,
+    at the observations, and the times for both.
+    """
+
+    y = tractors['log_saleprice']
+    X = tractors[VAR_NAMES]
+    data = km.mixed_kernel_reg_prepare(X, y, VAR_TYPE)
+
+    print("reg_type\tKernelReg (s)\tfast (s)\tmax difference")
+    for reg_type in ['lc', 'll']:
+        kde_reg = npreg.KernelReg(endog = y, exog = X, var_type = VAR_TYPE,
+                                  reg_type = reg_type, bw = bw)
+        sm_time, sm_pred = time_it(kde_reg.fit)
+        fast_time, fast_pred = time_it(km.mixed_kernel_reg_fit, data, bw,
+                                       reg_type = reg_type, num_reps = 10)
+        print("{0}\t\t{1:10.4f}\t{2:.6f}\t{3:.2e}".format(
+                reg_type, sm_time, fast_time,
+                np.max(np.abs(fast_pred - sm_pred[0]))))
+
+
+def print_times(n_list):
+    """ (list) -> NoneType
+
+    Print the time in seconds for the local linear fitted values
+    at the observations with KernelReg and mixed_kernel_reg_fit(),
+    with the Gaussian and Epanechnikov kernels,
+    for simulated data with n observations for each n in n_list.
+    """
+
+    rng = np.random.default_rng(42)
+    num_cpus = os.cpu_count()
+    print("n\tKernelReg (s)\tgaussian (s)\tepanechnikov (s)\t%d threads (s)"
+          % num_cpus)
+    for n in n_list:
+        X, y, bw = simulate_data(n, rng)
+        data = km.mixed_kernel_reg_prepare(X, y, VAR_TYPE)
+
+        sm_time = np.nan
+        if n <= MAX_N_KERNELREG:
+            kde_reg = npreg.KernelReg(y, X, VAR_TYPE, bw = bw)
+            sm_time = time_it(kde_reg.fit)[0]
+        gauss_time = np.nan
+        if n <= MAX_N_GAUSSIAN:
+            gauss_time = time_it(km.mixed_kernel_reg_fit, data, bw,
+                                 num_workers = num_cpus)[0]
+        epan_time = time_it(km.mixed_kernel_reg_fit, data, bw,
+                            kernel = 'epanechnikov', num_workers = 1)[0]
+        thread_time = time_it(km.mixed_kernel_reg_fit, data, bw,
+                              kernel = 'epanechnikov', num_workers = num_cpus)[0]
+        print("{0}\t{1:10.4f}\t{2:10.4f}\t{3:10.4f}\t\t{4:10.4f}".format(
+                n, sm_time, gauss_time, epan_time, thread_time))
+
+
+if __name__ == '__main__':
+
+    tractors = pd.read_csv('tractor_sales.csv')
+    tractors['log_saleprice'] = np.log(tractors['saleprice'])
+    print_errors(tractors, np.array([20.0, 3.0, 1000.0, 0.1, 0.1, 0.1]))
+    print()
+    print_times([10**3, 10**4, 10**5])
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing Fast Kernel Regression
+#
+##################################################
+#
+# Checks kernel_reg_fit() in kernel_regression.py against
+# KernelReg.fit() for the regressions of the log of the tractor prices
+# on horsepower in python_nonparametrics.py,
+# and compares the running time of the two
+# for simulated data with up to 10**6 observations.
+# KernelReg is only run for n <= MAX_N_KERNELREG,
+# since it takes n*m operations for m prediction points,
+# and so is the Gaussian kernel in kernel_reg_fit(),
+# since its window of 10 bandwidths covers most of the data.
+# The Epanechnikov kernel, with compact support, is run for every n.
+#
+# It also compares the bandwidth chosen by leave-one-out
+# cross-validation in loo_cv_bandwidth() with the one chosen
+# by KernelReg, and times the selection for 2 million observations.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.nonparametric.kernel_regression as npreg
+
+import kernel_regression as kr
+
+
+MAX_N_KERNELREG = 10**4
+
+
+def time_it(func, *args, num_reps = 1):
+    """ (function, ...) -> (number, object)
+
+    Return the number of seconds it takes to run func(*args),
+    averaged over num_reps runs, and the result.
+    """
+
+    t1 = time.perf_counter()
+    for k in range(num_reps):
+        result = func(*args)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) / num_reps, result
+
+
+def print_errors(tractors):
+    """ (DataFrame) -> NoneType
+
+    Print the largest difference between the fits from
+    kernel_reg_fit() and KernelReg.fit() for the bandwidths
+    in python_nonparametrics.py, on the grid of horsepower
+    and at the observations, and the times for both.
+    """
+
+    y = tractors['log_saleprice']
+    X = tractors['horsepower']
+    data = kr.kernel_reg_prepare(X, y)
+    X_grid = np.arange(0, 535, 10)
+
+    # The bandwidth chosen by KernelReg, as in the default.
+    bw_default = npreg.KernelReg(endog = y, exog = X, var_type = 'c').bw[0]
+
+    print("bw\t\tpoints\tKernelReg (s)\tfast (s)\tmax difference")
+    for bw in [bw_default, 10, 50]:
+        kde_reg = npreg.KernelReg(endog = y, exog = X, var_type = 'c',
+                                  bw = np.array([bw]))
+        for name, x_pred in [('grid', X_grid), ('obs', None)]:
+            args = () if x_pred is None else (x_pred,)
+            sm_time, sm_pred = time_it(kde_reg.fit, *args)
+            fast_time, fast_pred = time_it(kr.kernel_reg_fit, data, bw, x_pred,
+                                           num_reps = 100)
+            print("{0:8.4f}\t{1}\t{2:10.4f}\t{3:.6f}\t{4:.2e}".format(
+                    bw, name, sm_time, fast_time,
+                    np.max(np.abs(fast_pred - sm_pred[0]))))
+
+
+def print_times(n_list):
+    """ (list) -> NoneType
+
+    Print the time in seconds for the fitted values at the observations
+    with KernelReg and kernel_reg_fit(), with the Gaussian
+    and Epanechnikov kernels, including the sorting,
+    for simulated data with n observations for each n in n_list.
+    """
+
+    rng = np.random.default_rng(42)
+    print("n\tKernelReg (s)\tgaussian (s)\tepanechnikov (s)")
+    fit = lambda x, y, bw, kernel: kr.kernel_reg_fit(kr.kernel_reg_prepare(x, y),
+                                                      bw, None, 'll', kernel)
+    for n in n_list:
+        x = rng.lognormal(4.4, 0.6, size = n)
+        y = 10 + 0.01*x - 0.00001*x**2 + rng.normal(scale = 0.5, size = n)
+        bw = 1.06*np.std(x)*n**(-1/5)
+
+        if n <= MAX_N_KERNELREG:
+            kde_reg = npreg.KernelReg(y, x, 'c', bw = np.array([bw]))
+            sm_time = time_it(kde_reg.fit)[0]
+            gauss_time = time_it(fit, x, y, bw, 'gaussian')[0]
+        else:
+            sm_time = np.nan
+            gauss_time = np.nan
+        epan_time = time_it(fit, x, y, bw, 'epanechnikov')[0]
+        print("{0}\t{1:10.4f}\t{2:10.4f}\t{3:10.4f}".format(
+                n, sm_time, gauss_time, epan_time))
+
+
+def print_cv(tractors):
+    """ (DataFrame) -> NoneType
+
+    Print the bandwidth chosen by KernelReg with bw = 'cv_ls',
+    which minimizes the cross-validation criterion with fmin(),
+    and by loo_cv_bandwidth() on a grid, for the tractor data.
+    """
+
+    y = tractors['log_saleprice']
+    X = tractors['horsepower']
+    data = kr.kernel_reg_prepare(X, y)
+
+    sm_time, kde_reg = time_it(npreg.KernelReg, y, X, 'c')
+    bw_grid = np.arange(5, 40.5, 0.5)
+    fast_time, cv_result = time_it(kr.loo_cv_bandwidth, data, bw_grid,
+                                   'll', 'gaussian')
+    print("method\t\tbw\ttime (s)")
+    print("KernelReg\t{0:.4f}\t{1:.4f}".format(kde_reg.bw[0], sm_time))
+    print("loo_cv grid\t{0:.4f}\t{1:.4f}".format(cv_result.x, fast_time))
+
+
+def print_cv_times(n, num_bw = 12):
+    """ (int, int) -> NoneType
+
+    Print the cross-validation criterion and the time in seconds
+    for each of num_bw bandwidths from loo_cv_bandwidth()
+    with the Epanechnikov kernel, for simulated data with n observations.
+    """
+
+    rng = np.random.default_rng(42)
+    x = rng.lognormal(4.4, 0.6, size = n)
+    y = 10 + 0.01*x - 0.00001*x**2 + rng.normal(scale = 0.5, size = n)
+
+    sort_time, data = time_it(kr.kernel_reg_prepare, x, y)
+    bw_0 = 1.06*np.std(x)*n**(-1/5)
+    cv_result = kr.loo_cv_bandwidth(data, bw_0*np.geomspace(0.5, 20, num_bw))
+
+    print("n = %d, sorted in %.4f seconds" % (n, sort_time))
+    print("bw\tcv\t\tleft out\ttime (s)")
+    for k, bw in enumerate(cv_result.bw_grid):
+        print("{0:.4f}\t{1:.6f}\t{2}\t\t{3:.4f}".format(
+                bw, cv_result.cv[k], cv_result.num_alone[k], cv_result.times[k]))
+    print("chosen bw = %.4f" % cv_result.x)
+
+
+if __name__ == '__main__':
+
+    tractors = pd.read_csv('tractor_sales.csv')
+    tractors['log_saleprice'] = np.log(tractors['saleprice'])
+    print_errors(tractors)
+    print()
+    print_times([10**3, 10**4, 10**5, 10**6])
+    print()
+    print_cv(tractors)
+    print()
+    print_cv_times(2*10**6)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# A Saved Kernel Regression for Semiparametric Models
+#
+##################################################
+#
+# In the semiparametric estimation in python_nonparametrics.py,
+# the kernel regression of the log price on horsepower
+# creates the variable horsepower_np for the linear regression.
+# Any change in the linear regression
+# would otherwise fit the kernel regression again.
+#
+# A KernelSmoother calculates the kernel regression once
+# on a fine grid of x, with kernel_reg_fit() in kernel_regression.py,
+# and predicts at any x by linear interpolation on the grid.
+# It can be saved to a file and loaded again,
+# and cached_smoother() reuses a saved smoother
+# for the same data, bandwidth and kernel.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Modules.
+##################################################
+
+
+import hashlib
+import os
+
+import numpy as np
+
+import kernel_regression as kr
+
+
+##################################################
+# Function Definitions
+##################################################
+
+
+#--------------------------------------------------
+# Identifying the data
+#--------------------------------------------------
+
+def data_fingerprint(x: np.ndarray, y: np.ndarray) -> str:
+    """
+    Returns a short hash of the values of x and y,
+    which changes if any value changes.
+
+    >>> data_fingerprint([1.0, 2.0], [3.0, 4.0])
+    '6bab56d2f81d4b5a'
+    >>> data_fingerprint([1.0, 2.0], [3.0, 4.5])
+    'e805f41e61d9b38f'
+    """
+
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(x, dtype = float).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype = float).tobytes())
+
+    return digest.hexdigest()[:16]
+
+
+#--------------------------------------------------
+# The smoother
+#--------------------------------------------------
+
+class KernelSmoother:
+    """
+    The kernel regression of y on x, as from kernel_reg_fit(),
+    calculated at num_grid equally spaced points
+    from the smallest to the largest x, so that predict()
+    only interpolates between these values.
+    The values are nan at the points of the grid
+    where no observations are within the window,
+    so that predict() returns nan in gaps in the data.
+    If bw is None, the bandwidth is chosen with loo_cv_bandwidth().
+
+    >>> rng = np.random.default_rng(42)
+    >>> x = rng.uniform(0, 10, size = 500)
+    >>> y = np.sin(x) + rng.normal(scale = 0.3, size = 500)
+    >>> smoother = KernelSmoother(x, y, 0.5)
+    >>> exact = kr.kernel_reg_fit(kr.kernel_reg_prepare(x, y), 0.5)
+    >>> bool(np.max(np.abs(smoother.predict(x) - exact)) < 1e-5)
+    True
+    >>> smoother.predict(np.array([-1.0, 5.0])).round(4)
+    array([    nan, -0.8544])
+    >>> smoother.key == (data_fingerprint(x, y), 0.5, 'll', 'gaussian')
+    True
+
+    With no data between 4 and 6, there is no estimate near 5:
+
+    >>> x_gap = np.concatenate([x[x < 4], x[x > 6]])
+    >>> smoother = KernelSmoother(x_gap, np.sin(x_gap), 0.5, kernel = 'epanechnikov')
+    >>> smoother.predict(np.array([3.0, 5.0, 7.0])).round(4)
+    array([0.1385,    nan, 0.6409])
+    """
+
+    def __init__(self, x: np.ndarray = None, y: np.ndarray = None,
+                 bw: float = None, reg_type: str = 'll',
+                 kernel: str = 'gaussian', num_grid: int = 2001):
+        self.reg_type = reg_type
+        self.kernel = kernel
+        if x is None:
+            # An empty smoother, to be filled in by load().
+            return
+
+        data = kr.kernel_reg_prepare(x, y)
+        if bw is None:
+            bw = kr.loo_cv_bandwidth(data, reg_type = reg_type, kernel = kernel).x
+        self.bw = float(bw)
+        self.fingerprint = data_fingerprint(x, y)
+        self.grid = np.linspace(data['x'][0], data['x'][-1], num_grid)
+        self.values = kr.kernel_reg_fit(data, self.bw, self.grid,
+                                        reg_type, kernel)
+
+    @property
+    def key(self):
+        """The data fingerprint, bandwidth, reg_type and kernel."""
+        return (self.fingerprint, self.bw, self.reg_type, self.kernel)
+
+    def predict(self, x_new: np.ndarray) -> np.ndarray:
+        """
+        Returns the kernel regression at x_new,
+        interpolated from the values on the grid,
+        or nan outside the range of the data.
+        np.interp() also returns nan between a point of the grid
+        with an empty window, where the value is nan, and its neighbors.
+        """
+
+        return np.interp(np.asarray(x_new, dtype = float), self.grid, self.values,
+                         left = np.nan, right = np.nan)
+
+    def save(self, path: str) -> None:
+        """Saves the smoother to the .npz file path."""
+        np.savez(path, grid = self.grid, values = self.values,
+                 bw = self.bw, reg_type = self.reg_type, kernel = self.kernel,
+                 fingerprint = self.fingerprint)
+
+    @classmethod
+    def load(cls, path: str) -> 'KernelSmoother':
+        """Loads a smoother saved with save()."""
+        with np.load(path) as saved:
+            smoother = cls(reg_type = str(saved['reg_type']),
+                           kernel = str(saved['kernel']))
+            smoother.bw = float(saved['bw'])
+            smoother.fingerprint = str(saved['fingerprint'])
+            smoother.grid = saved['grid']
+            smoother.values = saved['values']
+        return smoother
+
+
+def cached_smoother(x: np.ndarray, y: np.ndarray, bw: float = None,
+                    reg_type: str = 'll', kernel: str = 'gaussian',
+                    cache_dir: str = 'smoother_cache') -> KernelSmoother:
+    """
+    Returns the KernelSmoother for the data x and y, bandwidth bw,
+    reg_type and kernel from the folder cache_dir,
+    if it was saved there before, or fits and saves it otherwise.
+    The file name is made from the fingerprint of the data
+    and the other settings, with 'cv' for bw = None,
+    when the bandwidth is chosen by cross-validation.
+
+    >>> import tempfile
+    >>> rng = np.random.default_rng(42)
+    >>> x = rng.uniform(0, 10, size = 500)
+    >>> y = np.sin(x) + rng.normal(scale = 0.3, size = 500)
+    >>> with tempfile.TemporaryDirectory() as cache_dir:
+    ...     smoother = cached_smoother(x, y, 0.5, cache_dir = cache_dir)
+    ...     print(os.listdir(cache_dir))
+    ...     smoother_saved = cached_smoother(x, y, 0.5, cache_dir = cache_dir)
+    ['smoother_5aa01ca1f49d0dfd_0.5_ll_gaussian.npz']
+    >>> smoother_saved.key == smoother.key
+    True
+    >>> bool(np.array_equal(smoother_saved.predict(x), smoother.predict(x)))
+    True
+    """
+
+    bw_name = 'cv' if bw is None else repr(float(bw))
+    file_name = 'smoother_%s_%s_%s_%s.npz' % (data_fingerprint(x, y), bw_name,
+                                              reg_type, kernel)
+    path = os.path.join(cache_dir, file_name)
+    if os.path.exists(path):
+        return KernelSmoother.load(path)
+
+    smoother = KernelSmoother(x, y, bw, reg_type, kernel)
+    os.makedirs(cache_dir, exist_ok = True)
+    smoother.save(path)
+
+    return smoother
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
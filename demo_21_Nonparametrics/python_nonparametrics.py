@@ -54,6 +54,10 @@ import statsmodels.nonparametric.kernel_regression as npreg
 # FOr nonparametric kernel regression
 
 import matplotlib.pyplot as plt  # To plot regression results
+import kde_fft as kf # Kernel densities with the FFT, in this folder
+import kernel_regression as kr # Fast kernel regression, in this folder
+import kernel_smoother as ks # Saved kernel regression, in this folder
+import kernel_regression_multi as km # Several regressors, in this folder
 # import seaborn as sns # Another package for plotting data
 # sns.set(style="white")
 # sns.set(style="whitegrid", color_codes=True)
@@ -333,6 +337,33 @@ plt.show()
 
 
 
+#--------------------------------------------------
+# Comparing bandwidths quickly
+#--------------------------------------------------
+
+# dist.plot.kde() adds up a kernel for every observation 
+# at each of the 1000 points on the plot, 
+# so it slows down with large datasets. 
+# kde_fft() spreads the observations over a fine grid first
+# and calculates the densities for several bandwidths at once.
+
+x_eval, densities = kf.kde_fft(dist, bw_method = [None, 1, 0.1])
+
+fig, ax = plt.subplots()
+for k, label in enumerate(['default', 'bw = 1', 'bw = 0.1']):
+    ax.plot(x_eval, densities[k], label = label)
+dist.plot.hist(density = True, ax = ax)
+ax.set_title('Density of Tractor Sales Prices')
+ax.set_ylabel('Probability')
+ax.legend()
+plt.show()
+
+# These match the densities from dist.plot.kde() above.
+# The timing for up to a million observations
+# is in kde_fft_time.py.
+
+
+
 ##################################################
 # Linear Regression.
 ##################################################
@@ -517,6 +548,58 @@ plt.show()
 
 
 
+#--------------------------------------------------
+# Faster kernel regression
+#--------------------------------------------------
+
+# KernelReg.fit() adds up a weight for every observation
+# at every point on the grid, which is slow for large datasets. 
+# The module kernel_regression.py sorts the data once
+# and only adds up the observations within a window
+# around each point.
+
+hp_data = kr.kernel_reg_prepare(X, y)
+
+# This matches KernelReg with the same bandwidths.
+kde_pred_fast = kr.kernel_reg_fit(hp_data, 50, X_grid)
+print(np.max(np.abs(kde_pred_fast - kde_pred[0])))
+
+# With a kernel that is zero beyond one bandwidth, 
+# such as the Epanechnikov kernel, 
+# the sums within each window are calculated from cumulative sums, 
+# so it can be used with millions of observations
+# (see kernel_regression_time.py).
+fig, ax = plt.subplots()
+ax.plot(tractors['horsepower'], tractors['log_saleprice'], 
+        '.', alpha = 0.5)
+for bw in [25, 50, 100]:
+    ax.plot(X_grid, kr.kernel_reg_fit(hp_data, bw, X_grid, 
+                                      kernel = 'epanechnikov'), 
+            '-', label = 'bw = %d' % bw)
+ax.legend()
+plt.show()
+
+
+
+# The default bandwidth in KernelReg minimizes the 
+# leave-one-out cross-validation criterion: 
+# the mean squared error of predicting each observation
+# from all the others. 
+# loo_cv_bandwidth() calculates this criterion for a grid 
+# of bandwidths without refitting the regression n times.
+cv_result = kr.loo_cv_bandwidth(hp_data, np.arange(5, 40.5, 0.5), 
+                                kernel = 'gaussian')
+print(cv_result.x)
+print(npreg.KernelReg(endog = y, exog = X, var_type = 'c').bw)
+
+# Plot the criterion against the bandwidth.
+plt.plot(cv_result.bw_grid, cv_result.cv)
+plt.xlabel('Bandwidth')
+plt.ylabel('Cross-validation criterion')
+plt.show()
+
+
+
 ##################################################
 # Semiparametric estimation
 ##################################################
@@ -556,6 +639,79 @@ print(reg_model_fit_sm.summary())
 # for horsepower was fairly good. 
 
 
+#--------------------------------------------------
+# Saving the smoother for the semiparametric model
+#--------------------------------------------------
+
+# Every time we change the linear part of the model,
+# the kernel regression for horsepower_np is the same,
+# so it can be calculated once and saved.
+# cached_smoother() in kernel_smoother.py fits the kernel regression
+# on a fine grid of horsepower and saves it in the folder smoother_cache,
+# under a name made from a fingerprint of the data and the bandwidth.
+# The next time, it is loaded from the file.
+hp_smoother = ks.cached_smoother(X, y, kde_reg.bw[0])
+print(hp_smoother.key)
+
+# The predictions are interpolated from the grid,
+# which is very close to the values from KernelReg.
+tractors['horsepower_np'] = hp_smoother.predict(X)
+print(np.max(np.abs(tractors['horsepower_np'] - kde_pred[0])))
+
+# Now the linear part can be estimated again in milliseconds,
+# for example, without the seasonal indicators.
+sm_fmla = "log_saleprice ~ \
+    horsepower_np + \
+    age + enghours + \
+    diesel + fwd + manual + johndeere + cab"
+
+reg_model_fit_sm = sm.ols(formula = sm_fmla,
+                          data = tractors).fit()
+print(reg_model_fit_sm.summary())
+
+# The smoother also predicts at new values of horsepower.
+hp_smoother.predict(np.array([50, 100, 200]))
+
+
+##################################################
+# Kernel regression with several regressors
+##################################################
+
+# KernelReg can also use several regressors at once,
+# with a product of kernels for the continuous variables
+# horsepower, age and enghours
+# and the Aitchison-Aitken kernel for the indicators
+# diesel, fwd and cab, which are unordered discrete variables.
+X_multi = tractors[['horsepower', 'age', 'enghours', 'diesel', 'fwd', 'cab']]
+
+# Choosing these bandwidths by cross-validation is very slow,
+# so we set them by hand.
+bw_multi = np.array([20.0, 3.0, 1000.0, 0.1, 0.1, 0.1])
+kde_reg_multi = npreg.KernelReg(endog = y, exog = X_multi, var_type = 'cccuuu',
+                                bw = bw_multi)
+kde_pred_multi = kde_reg_multi.fit()
+
+# KernelReg adds up the kernel weights of every observation
+# at every point, which is too slow for large datasets.
+# mixed_kernel_reg_fit() in kernel_regression_multi.py finds
+# the nearby observations with a KD-tree,
+# so that, with a kernel with compact support,
+# only the observations within one bandwidth are added up,
+# and it shares the prediction points among several threads.
+# With the same Gaussian kernel, it gives the same predictions.
+multi_data = km.mixed_kernel_reg_prepare(X_multi, y, 'cccuuu')
+multi_pred = km.mixed_kernel_reg_fit(multi_data, bw_multi)
+print(np.max(np.abs(multi_pred - kde_pred_multi[0])))
+
+# With the Epanechnikov kernel, the fit is a little different.
+multi_pred_epan = km.mixed_kernel_reg_fit(multi_data, bw_multi,
+                                          kernel = 'epanechnikov')
+print(np.corrcoef(multi_pred_epan, multi_pred)[0, 1])
+
+# Compare the fit with the linear regression models.
+print(np.corrcoef(multi_pred, y)[0, 1]**2)
+
+
 ##################################################
 # End
 ##################################################
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Cost Functions for the Profit Maximization Problem
+#
+##################################################
+#
+# This module defines several forms of cost function,
+# in addition to total_cost() in my_production_midterm_soln.py,
+# which is fixed_cost + multiplier*num_units**2:
+#   polynomial cost functions,
+#   piecewise linear cost functions with a capacity limit, and
+#   cost functions interpolated from a table of costs.
+#
+# Each cost curve is a dictionary with the total cost function 'cost',
+# the marginal cost function 'marginal_cost', the 'capacity',
+# the largest quantity that can be produced, and the 'kinks',
+# the quantities where the marginal cost jumps.
+#
+# The quantity that maximizes profit is found by solving
+# marginal revenue = marginal cost with a bracketing root finder,
+# instead of the grid search in profit_max_q().
+#
+##################################################
+"""
+
+
+##################################################
+# Import Required Modules
+##################################################
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.optimize import brentq
+from typing import Callable, Dict, List
+
+import my_production_midterm_soln as my_production
+
+
+##################################################
+# Function Definitions
+##################################################
+
+#--------------------------------------------------
+# Cost curves
+#--------------------------------------------------
+
+def polynomial_cost(coefs: List[float]) -> Dict[str, Callable]:
+    """
+    Returns the cost curve for the polynomial cost function
+    coefs[0] + coefs[1]*q + coefs[2]*q**2 + ...,
+    where coefs[0] is the fixed cost.
+    The capacity is unlimited.
+    total_cost(q, multiplier, fixed_cost) is
+    polynomial_cost([fixed_cost, 0, multiplier]).
+
+    >>> cost_curve = polynomial_cost([50, 0, 20])
+    >>> float(cost_curve['cost'](10)), my_production.total_cost(10, 20, 50)
+    (2050.0, 2050)
+    >>> float(cost_curve['marginal_cost'](10))
+    400.0
+    >>> cost_curve['capacity']
+    inf
+    """
+
+    coefs = np.asarray(coefs, dtype = float)
+    mc_coefs = np.polynomial.polynomial.polyder(coefs)
+
+    return {'cost': lambda q: np.polynomial.polynomial.polyval(q, coefs),
+            'marginal_cost': lambda q: np.polynomial.polynomial.polyval(q, mc_coefs),
+            'capacity': np.inf,
+            'kinks': []}
+
+
+def piecewise_linear_cost(fixed_cost: float, breakpoints: List[float],
+                          marginal_costs: List[float]) -> Dict[str, Callable]:
+    """
+    Returns the cost curve for a piecewise linear cost function,
+    with the fixed cost fixed_cost and the constant marginal cost
+    marginal_costs[k] between breakpoints[k] and breakpoints[k + 1],
+    where breakpoints starts at 0 and ends at the capacity,
+    e.g. when overtime is paid above a normal level of output.
+    At a breakpoint, the marginal cost is that of the next segment.
+
+    >>> cost_curve = piecewise_linear_cost(100, [0, 50, 80], [10, 25])
+    >>> [float(cost_curve['cost'](q)) for q in [0, 50, 60, 80]]
+    [100.0, 600.0, 850.0, 1350.0]
+    >>> [float(cost_curve['marginal_cost'](q)) for q in [0, 49.9, 50, 80]]
+    [10.0, 10.0, 25.0, 25.0]
+    >>> cost_curve['capacity']
+    80.0
+    >>> piecewise_linear_cost(100, [0, 50, 40], [10, 25])
+    Error in piecewise_linear_cost: breakpoints are not increasing from 0.
+    """
+
+    breakpoints = np.asarray(breakpoints, dtype = float)
+    marginal_costs = np.asarray(marginal_costs, dtype = float)
+    if breakpoints[0] != 0 or np.any(np.diff(breakpoints) <= 0):
+        print('Error in piecewise_linear_cost: breakpoints are not increasing from 0.')
+        return None
+    if len(marginal_costs) != len(breakpoints) - 1:
+        print('Error in piecewise_linear_cost: need one marginal cost per segment.')
+        return None
+
+    # Total cost at each breakpoint.
+    costs = fixed_cost + np.concatenate([[0.0], np.cumsum(marginal_costs*
+                                                           np.diff(breakpoints))])
+
+    def marginal_cost(q):
+        k = np.searchsorted(breakpoints, q, side = 'right') - 1
+        return marginal_costs[np.clip(k, 0, len(marginal_costs) - 1)]
+
+    return {'cost': lambda q: np.interp(q, breakpoints, costs),
+            'marginal_cost': marginal_cost,
+            'capacity': float(breakpoints[-1]),
+            'kinks': [float(q) for q in breakpoints[1:-1]]}
+
+
+def tabulated_cost(quantities: List[float],
+                   costs: List[float]) -> Dict[str, Callable]:
+    """
+    Returns the cost curve interpolated from a table of total costs
+    at the quantities, which start at 0, so that costs[0] is the fixed cost.
+    The curve is a cubic spline interpolation,
+    so that the marginal cost is continuous,
+    and the cost curve is exact if the costs in the table
+    are from a polynomial of degree 3 or less.
+    The capacity is the largest quantity in the table.
+
+    >>> q_table = np.arange(0, 101, 10.0)
+    >>> cost_curve = tabulated_cost(q_table, 50 + 0.5*q_table**2)
+    >>> float(cost_curve['cost'](40))
+    850.0
+    >>> round(float(cost_curve['marginal_cost'](40)), 6)
+    40.0
+    >>> tabulated_cost([10, 20], [5, 6])
+    Error in tabulated_cost: quantities are not increasing from 0.
+    """
+
+    quantities = np.asarray(quantities, dtype = float)
+    if quantities[0] != 0 or np.any(np.diff(quantities) <= 0):
+        print('Error in tabulated_cost: quantities are not increasing from 0.')
+        return None
+
+    cost = CubicSpline(quantities, np.asarray(costs, dtype = float))
+
+    return {'cost': cost,
+            'marginal_cost': cost.derivative(),
+            'capacity': float(quantities[-1]),
+            'kinks': []}
+
+
+#--------------------------------------------------
+# Profit maximization
+#--------------------------------------------------
+
+def total_profit_curve(num_units: float, unit_price: float,
+                       cost_curve: Dict[str, Callable]) -> float:
+    """
+    Calculates the total profit, as in total_profit(),
+    for the cost function in cost_curve.
+
+    >>> total_profit_curve(10, 300, polynomial_cost([50, 0, 20]))
+    950.0
+    >>> my_production.total_profit(10, 300, 20, 50)
+    950
+    """
+
+    revenue = my_production.total_revenue(num_units, unit_price)
+    return float(revenue - cost_curve['cost'](num_units))
+
+
+def profit_max_mc(unit_price: float, cost_curve: Dict[str, Callable],
+                  q_max: float = None, num_scan: int = 16,
+                  xtol: float = 1e-10, verbose: bool = False) -> float:
+    """
+    Calculates the quantity to produce that maximizes profit
+    for the cost function in cost_curve,
+    by solving marginal revenue = marginal cost,
+    where the marginal revenue is unit_price.
+
+    The interval from 0 to q_max (by default, the capacity)
+    is scanned at num_scan points for changes in the sign of
+    unit_price - marginal_cost, and the quantity where
+    it changes from positive to negative is found by brentq().
+    If the capacity is unlimited and q_max is None, the interval
+    is doubled until the marginal cost reaches the price,
+    or returns None if it does not after 100 doublings,
+    since the profit has no maximum.
+    The profit at these quantities, at the kinks in the cost curve
+    and at the ends of the interval is compared, and, as in max_profit_calc(), the firm
+    produces 0 if the highest profit is negative.
+    If verbose is True, it prints the number of evaluations of
+    the marginal cost function.
+
+    >>> profit_max_mc(100, polynomial_cost([2, 0, 0.10]))
+    500.0
+    >>> my_production.max_profit_calc(100, 0.10, 2)
+    500.0
+    >>> profit_max_mc(200, polynomial_cost([5, 0, 2.5]), verbose = True)
+    Evaluated marginal cost 24 times.
+    40.0
+    >>> profit_max_mc(100, polynomial_cost([50001, 0, 0.10]))
+    0
+    >>> profit_max_mc(100, polynomial_cost([2, 10]))
+    Error in profit_max_mc: marginal cost stays below unit_price, so profit is unbounded.
+    >>> profit_max_mc(20, piecewise_linear_cost(100, [0, 50, 80], [10, 25]))
+    50.0
+    >>> profit_max_mc(30, piecewise_linear_cost(100, [0, 50, 80], [10, 25]))
+    80.0
+    >>> profit_max_mc(100, piecewise_linear_cost(100, [0, 400, 600, 800], 
+    ...                                          [20, 60, 150]))
+    600.0
+    >>> q_table = np.arange(0, 101, 10.0)
+    >>> round(profit_max_mc(40, tabulated_cost(q_table, 50 + 0.5*q_table**2)), 6)
+    40.0
+    """
+
+    marginal_cost = cost_curve['marginal_cost']
+    num_evals = 0
+
+    def marginal_profit(q):
+        nonlocal num_evals
+        num_evals = num_evals + 1
+        return unit_price - float(marginal_cost(q))
+
+    if q_max is None:
+        q_max = cost_curve['capacity']
+    if np.isinf(q_max):
+        q_max = 1.0
+        for num_doublings in range(100):
+            if marginal_profit(q_max) <= 0:
+                break
+            q_max = 2*q_max
+        else:
+            print('Error in profit_max_mc: marginal cost stays below unit_price, so profit is unbounded.')
+            return None
+
+    # Scan for the quantities where the marginal profit
+    # changes from positive to negative.
+    q_scan = np.linspace(0, q_max, num_scan + 1)
+    mp_scan = [marginal_profit(q) for q in q_scan]
+    q_candidates = [0.0, float(q_max)] + [q for q in cost_curve['kinks']
+                                          if q < q_max]
+    for k in range(num_scan):
+        if mp_scan[k] > 0 and mp_scan[k + 1] < 0:
+            q_candidates.append(brentq(marginal_profit, q_scan[k], q_scan[k + 1],
+                                       xtol = xtol))
+        elif mp_scan[k + 1] == 0:
+            q_candidates.append(float(q_scan[k + 1]))
+
+    if verbose:
+        print("Evaluated marginal cost %d times." % num_evals)
+
+    profits = [total_profit_curve(q, unit_price, cost_curve) for q in q_candidates]
+    k_max = int(np.argmax(profits))
+    if profits[k_max] < 0:
+        return 0
+
+    return float(q_candidates[k_max])
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing the Marginal Cost Root Finder
+#
+##################################################
+#
+# Compares the grid search profit_max_q() at step 0.001
+# with profit_max_mc(), which solves
+# marginal revenue = marginal cost with brentq(),
+# in the number of evaluations of the profit
+# or marginal cost function and the running time.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+
+import my_production_midterm_soln as my_production
+import cost_curves as cc
+
+
+def time_it(search, *args, **kwargs):
+    """ (function, ...) -> (number, object)
+
+    Return the number of milliseconds it takes to run
+    search(*args, **kwargs) and the result.
+    """
+
+    t1 = time.perf_counter()
+    result = search(*args, **kwargs)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0, result
+
+
+def count_evals(cost_curve):
+    """ (dict) -> (dict, list)
+
+    Return a copy of cost_curve with a marginal cost function
+    that counts its calls in the first element of the list.
+    """
+
+    counter = [0]
+    marginal_cost = cost_curve['marginal_cost']
+
+    def counted(q):
+        counter[0] = counter[0] + 1
+        return marginal_cost(q)
+
+    return dict(cost_curve, marginal_cost = counted), counter
+
+
+def print_comparison(q_max, unit_price, multiplier, fixed_cost):
+    """ (number, number, number, number) -> NoneType
+
+    Print the evaluations, time and result of profit_max_q() at step 0.001
+    and of profit_max_mc() with the same quadratic cost function.
+    """
+
+    step = 0.001
+    print("\nunit_price = {0}, multiplier = {1}, fixed_cost = {2}".format(
+            unit_price, multiplier, fixed_cost))
+    print("search\t\tevals\t\ttime (ms)\tresult")
+
+    run_time, result = time_it(my_production.profit_max_q, q_max, step,
+                               unit_price, multiplier, fixed_cost)
+    num_evals = len(np.arange(0, q_max, step))
+    print("profit_max_q\t{0:9d}\t{1:9.1f}\t{2}".format(num_evals, run_time, result))
+
+    cost_curve, counter = count_evals(cc.polynomial_cost([fixed_cost, 0, multiplier]))
+    run_time, result = time_it(cc.profit_max_mc, unit_price, cost_curve)
+    print("profit_max_mc\t{0:9d}\t{1:9.1f}\t{2}".format(counter[0], run_time, result))
+
+
+def print_other_curves():
+    """ () -> NoneType
+
+    Print the evaluations, time and result of profit_max_mc()
+    for the piecewise linear and tabulated cost functions.
+    """
+
+    q_table = np.arange(0, 1001, 50.0)
+    curves = [('piecewise', cc.piecewise_linear_cost(100, [0, 400, 600, 800],
+                                                     [20, 60, 150])),
+              ('tabulated', cc.tabulated_cost(q_table, 2 + 0.10*q_table**2))]
+
+    print("\nOther cost functions, unit_price = 100")
+    print("cost curve\tevals\t\ttime (ms)\tresult")
+    for name, cost_curve in curves:
+        cost_curve, counter = count_evals(cost_curve)
+        run_time, result = time_it(cc.profit_max_mc, 100, cost_curve)
+        print("{0}\t{1:9d}\t{2:9.1f}\t{3}".format(name, counter[0], run_time, result))
+
+
+if __name__ == '__main__':
+
+    print_comparison(1000, 100, 0.10, 2)
+    print_comparison(100, 200, 2.5, 5)
+    print_other_curves()
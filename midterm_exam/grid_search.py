@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Coarse-to-Fine Grid Search
+#
+##################################################
+#
+# This module defines the adaptive grid search used by
+# max_logit_adaptive() in my_logit_midterm_soln.py,
+# max_CES_xy_adaptive() in my_CES_midterm_soln.py and
+# profit_max_q_adaptive() in my_production_midterm_soln.py,
+# which search the same grids as the exhaustive searches
+# max_logit(), max_CES_xy() and profit_max_q()
+# at only a fraction of the points.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Required Modules
+##################################################
+
+from typing import Callable, Dict, List
+
+
+##################################################
+# Function Definitions
+##################################################
+
+#--------------------------------------------------
+# Adaptive Grid Search
+#--------------------------------------------------
+
+def adaptive_grid_max(value_ij: Callable[[int, int], float], 
+                      num_i: int, num_j: int, 
+                      num_coarse: int = 10, num_best: int = 5) -> List[int]:
+    """
+    Searches for the indices i and j that maximize value_ij(i, j)
+    over range(num_i) and range(num_j). 
+    
+    The search begins on a coarse grid of about num_coarse points 
+    in each direction. 
+    Then the search is repeated on grids with half the spacing, 
+    in the neighborhoods of the num_best highest points so far, 
+    until the spacing is one index. 
+    value_ij(i, j) may return None for points that are not admissible. 
+    
+    Returns [i_max, j_max, num_evals], where num_evals is the number 
+    of distinct points at which value_ij was evaluated, 
+    or [None, None, 0] if either range is empty. 
+    Ties are broken in favor of the first values of i and j, 
+    as in the exhaustive grid search. 
+    Note that the result matches the exhaustive search 
+    only if the best points on the coarse grids
+    are near the maximum on the full grid. 
+    
+    >>> adaptive_grid_max(lambda i, j: - (i - 37)**2 - (j - 5)**2, 100, 20)
+    [37, 5, 198]
+    >>> adaptive_grid_max(lambda i, j: - (i - 3)**2, 10, 1)
+    [3, 0, 10]
+    >>> adaptive_grid_max(lambda i, j: None, 10, 10)
+    [None, None, 100]
+    >>> adaptive_grid_max(lambda i, j: - (i - 3)**2, 10, 0)
+    [None, None, 0]
+    """
+    
+    # An empty grid has no points to evaluate.
+    if num_i <= 0 or num_j <= 0:
+        return [None, None, 0]
+    
+    # Record the values already calculated, 
+    # since the grids at each level overlap.
+    values = {}
+    
+    # Start with the coarse grid on the full range of indices.
+    stride_i = max(1, -(-num_i // num_coarse))
+    stride_j = max(1, -(-num_j // num_coarse))
+    windows = [[0, num_i - 1, 0, num_j - 1]]
+    
+    while len(windows) > 0:
+        
+        # Collect the grid points in all windows at this level.
+        for i_lo, i_hi, j_lo, j_hi in windows:
+            for i in list(range(i_lo, i_hi, stride_i)) + [i_hi]:
+                for j in list(range(j_lo, j_hi, stride_j)) + [j_hi]:
+                    if (i, j) not in values:
+                        values[(i, j)] = value_ij(i, j)
+        
+        if stride_i == 1 and stride_j == 1:
+            break
+        
+        # Zoom in on the neighborhoods of the best points 
+        # with a grid of half the spacing.
+        ranked = sorted([ij for ij in values if values[ij] is not None], 
+                        key = lambda ij: (- values[ij], ij))
+        windows = []
+        for i, j in ranked[:num_best]:
+            windows.append([max(0, i - stride_i), min(num_i - 1, i + stride_i), 
+                            max(0, j - stride_j), min(num_j - 1, j + stride_j)])
+        stride_i = -(-stride_i // 2)
+        stride_j = -(-stride_j // 2)
+    
+    # Select the first of the highest values, 
+    # in the order of the exhaustive search.
+    max_value = float('-inf')
+    i_max = None
+    j_max = None
+    for i, j in sorted(values):
+        if values[(i, j)] is not None and values[(i, j)] > max_value:
+            max_value = values[(i, j)]
+            i_max = i
+            j_max = j
+    
+    return [i_max, j_max, len(values)]
+
+
+def grid_savings(num_evals: int, num_points: int) -> Dict[str, int]:
+    """
+    Returns a dictionary that reports the savings 
+    of the adaptive grid search: the number of evaluations 'num_evals', 
+    the number of points 'num_points' on the full grid 
+    and the number of evaluations saved 'num_saved' 
+    compared to the exhaustive search. 
+    
+    >>> grid_savings(198, 2000)
+    {'num_evals': 198, 'num_points': 2000, 'num_saved': 1802}
+    """
+    
+    return {'num_evals': num_evals, 'num_points': num_points, 
+            'num_saved': num_points - num_evals}
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())
+
+
+##################################################
+# End
+##################################################
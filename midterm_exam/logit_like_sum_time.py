@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing the Logit Likelihood Calculations
+#
+##################################################
+#
+# Compares the running time of the loop in logit_like_sum()
+# with the vectorized calculation in logit_like_sum_vec()
+# for datasets of 10^3, 10^5 and 10^7 observations.
+# The last column times a batch of 100 candidate values 
+# of (beta_0, beta_1) in one call to logit_like_sum_vec().
+#
+# The loop takes several seconds with 10^7 observations.
+#
+##################################################
+"""
+
+
+import time
+
+import numpy as np
+
+from my_logit_midterm_soln import logit_like_sum
+from my_logit_midterm_soln import logit_like_sum_vec
+
+
+def time_it(like_func, y, x, beta_0, beta_1):
+    """ (function, list, list, object, object) -> number
+
+    Return the number of milliseconds it takes to run 
+    like_func(y, x, beta_0, beta_1).
+    """
+
+    t1 = time.perf_counter()
+    like_func(y, x, beta_0, beta_1)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0
+
+
+def print_times(num_obs):
+    """ (int) -> NoneType
+
+    Print the number of milliseconds it takes for logit_like_sum
+    and logit_like_sum_vec to run on num_obs simulated observations, 
+    the speedup and the time per candidate in a batch of 100.
+    """
+
+    # Simulate data similar to the credit data, 
+    # with a default rate around 15 percent.
+    rng = np.random.default_rng(num_obs)
+    x_array = rng.uniform(0.05, 0.35, size = num_obs)
+    prob = 1/(1 + np.exp(4.0 - 8.0*x_array))
+    y_array = (rng.uniform(size = num_obs) < prob).astype(int)
+    x = list(x_array)
+    y = list(y_array)
+
+    loop_time = time_it(logit_like_sum, y, x, -4.0, 8.0)
+    vec_time = time_it(logit_like_sum_vec, y_array, x_array, -4.0, 8.0)
+
+    beta_0 = np.linspace(-5.0, -3.0, 100)
+    beta_1 = np.linspace(6.0, 10.0, 100)
+    batch_time = time_it(logit_like_sum_vec, y_array, x_array, beta_0, beta_1)
+
+    print("{0:10d}\t{1:10.2f}\t{2:8.2f}\t{3:8.1f}\t{4:8.2f}".format(
+            num_obs, loop_time, vec_time, loop_time / vec_time, 
+            batch_time / len(beta_0)))
+
+
+print("num_obs\t\tloop (ms)\tvec (ms)\tspeedup\t\tbatch (ms/candidate)")
+for num_obs in [10**3, 10**5, 10**7]:
+    print_times(num_obs)
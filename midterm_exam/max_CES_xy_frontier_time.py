@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing the Budget-Frontier Grid Search
+#
+##################################################
+#
+# Compares the running time of the exhaustive grid search
+# max_CES_xy() with the search along the budget line
+# max_CES_xy_frontier() and the search over the whole
+# budget set max_util_xy_interior(),
+# for grids with N = 100, 300 and 1000 points on each axis.
+# The exhaustive search takes O(N**2) evaluations
+# and the frontier search takes O(N).
+#
+##################################################
+"""
+
+
+import time
+
+import my_CES_midterm_soln as my_CES
+
+
+def time_it(search, *args):
+    """ (function, ...) -> (number, list)
+
+    Return the number of milliseconds it takes to run
+    search(*args) and the result.
+    """
+
+    t1 = time.perf_counter()
+    result = search(*args)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0, result
+
+
+def CES_interior(x_min, x_max, y_min, y_max, step, r, p_x, p_y, w):
+    """ (number, ...) -> list
+
+    Return the result of max_util_xy_interior() for the CES utility function,
+    with the same arguments as max_CES_xy().
+    """
+
+    return my_CES.max_util_xy_interior(lambda x, y: (x**r + y**r)**(1/r),
+                                       x_min, x_max, y_min, y_max, step,
+                                       p_x, p_y, w)
+
+
+def print_times(num_points):
+    """ (int) -> NoneType
+
+    Print the number of milliseconds it takes to run each search
+    on a grid of num_points on each axis.
+    """
+
+    r, p_x, p_y, w = 1/2, 2, 4, 12
+    step = (w/p_x)/num_points
+    args = (0, w/p_x, 0, w/p_y + step, step, r, p_x, p_y, w)
+
+    print("\nN = {0}".format(num_points))
+    print("search\t\ttime (ms)\tspeedup\tresult")
+    base_time = None
+    for name, search in [('exhaustive', my_CES.max_CES_xy),
+                         ('frontier', my_CES.max_CES_xy_frontier),
+                         ('interior', CES_interior)]:
+        run_time, result = time_it(search, *args)
+        if base_time is None:
+            base_time = run_time
+        print("{0:10}\t{1:9.1f}\t{2:7.1f}\t{3}".format(
+                name, run_time, base_time / run_time, result))
+
+
+if __name__ == '__main__':
+
+    for num_points in [100, 300, 1000]:
+        print_times(num_points)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Timing the Parallel Grid Search
+#
+##################################################
+#
+# Compares the running time of the grid searches 
+# max_CES_xy_parallel() and max_logit_CES_xy_parallel()
+# with 1, 2, 4, 8 and 16 worker processes.
+# The speedup is relative to one worker 
+# and is limited by the number of cores on the computer.
+#
+##################################################
+"""
+
+
+import os
+import time
+
+import numpy as np
+
+import my_CES_midterm_soln as my_CES
+import my_logit_midterm_soln as my_logit
+
+
+def time_it(search, *args, num_workers):
+    """ (function, ...) -> (number, list)
+
+    Return the number of milliseconds it takes to run 
+    search(*args, num_workers = num_workers) and the result.
+    """
+
+    t1 = time.perf_counter()
+    result = search(*args, num_workers = num_workers)
+    t2 = time.perf_counter()
+
+    return (t2 - t1) * 1000.0, result
+
+
+def print_times(search, *args):
+    """ (function, ...) -> NoneType
+
+    Print the number of milliseconds it takes to run search(*args)
+    with 1, 2, 4, 8 and 16 workers and the speedup relative to one worker. 
+    """
+
+    print("workers\ttime (ms)\tspeedup\tresult")
+    base_time = None
+    for num_workers in [1, 2, 4, 8, 16]:
+        run_time, result = time_it(search, *args, num_workers = num_workers)
+        if base_time is None:
+            base_time = run_time
+        print("{0}\t{1:9.1f}\t{2:7.2f}\t{3}".format(
+                num_workers, run_time, base_time / run_time, result))
+
+
+if __name__ == '__main__':
+
+    print("Number of cores: {0}".format(os.cpu_count()))
+
+    print("\nmax_CES_xy_parallel: 800 x 400 grid")
+    print_times(my_CES.max_CES_xy_parallel, 
+                0, 8/2, 0, 8/4, 0.005, 1/2, 2, 4, 8)
+
+    # Simulate a sample of data for the logistic regression.
+    rng = np.random.default_rng(3311)
+    x = list(rng.normal(size = 200))
+    y = list((rng.uniform(size = 200) < 1/(1 + np.exp(-0.5 - np.array(x)))).astype(int))
+
+    print("\nmax_logit_CES_xy_parallel: 100 x 100 grid, 200 observations")
+    print_times(my_logit.max_logit_CES_xy_parallel, 
+                y, x, -1.0, 1.0, 0.0, 2.0, 0.02)
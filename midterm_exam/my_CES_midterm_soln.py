@@ -42,7 +42,10 @@
 # import name_of_module
 # import math
 import numpy as np
-from typing import List
+from typing import Callable, List
+from concurrent.futures import ProcessPoolExecutor
+
+from grid_search import adaptive_grid_max, grid_savings
 
 
 ##################################################
@@ -409,6 +412,588 @@ def max_CES_util_v2(
 
 
 
+#--------------------------------------------------
+# Adaptive Grid Search
+#--------------------------------------------------
+
+# Coarse-to-fine search over the same grid points 
+# as the exhaustive search above, 
+# with adaptive_grid_max() from grid_search.py.
+
+def max_CES_xy_adaptive(
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        r: float, p_x: float, p_y: float, w: float, 
+        num_coarse: int = 10, num_best: int = 5, 
+        verbose: bool = False, full_output: bool = False) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y 
+    by grid search to maximize the Constant Elasticity 
+    of Substitution utility function.
+    
+    The candidate values of x_i and y_j are taken from 
+    np.arange(x_min, x_max, step) and
+    np.arange(y_min, y_max, step), as in max_CES_xy(), 
+    but the grid is searched from coarse to fine 
+    with adaptive_grid_max(), 
+    so the utility is calculated at only a fraction of the points. 
+    If verbose is True, it prints the number of evaluations saved
+    compared to the exhaustive search. 
+    If full_output is True, it returns a list of the result 
+    and the report of the savings from grid_savings(). 
+    
+    Along the budget line, the utility on the grid rises and falls 
+    with the distance of each point from the line, 
+    so several of the best points are refined at each step (num_best). 
+    
+    >>> max_CES_xy_adaptive(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_CES_xy_adaptive(0, 127*8*5/4, 0, 27*8*5/9, 1, 1/3, 4, 9, 27*8*5, 
+    ...     verbose = True)
+    Evaluated utility at 438 of 152400 grid points (151962 saved).
+    [162.0, 48.0]
+    >>> max_CES_xy_adaptive(0, 8/2, 0, 8/4, 0.01, 0.001, 2, 4, 8)
+    [2.0, 1.0]
+    >>> max_CES_xy_adaptive(0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2)
+    [0.01, 1.99]
+    >>> max_CES_xy_adaptive(0, 100/4, 0, 100/3, 1.0, 2, 4, 3, 100)
+    [0.0, 33.0]
+    >>> max_CES_xy_adaptive(0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000)
+    [248.57142857142858, 0.0]
+    >>> max_CES_xy_adaptive(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12, 
+    ...     full_output = True)[1]['num_points']
+    1800
+    >>> max_CES_xy_adaptive(0, 0, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    No value of utility was higher than the initial value.
+    Choose different values of the parameters for x and y.
+    """
+    
+    # Define grid of parameters for search.
+    x_list = np.arange(x_min, x_max, step)
+    y_list = np.arange(y_min, y_max, step)
+    
+    def CES_ij(i: int, j: int) -> float:
+        # Turn off the warning message, as in max_CES_xy().
+        if p_x*x_list[i] + p_y*y_list[j] <= w:
+            return CESutility_in_budget(x_list[i], y_list[j], r, p_x, p_y, w)
+        else:
+            return None
+    
+    i_max, j_max, num_evals = adaptive_grid_max(CES_ij, len(x_list), len(y_list), 
+                                                num_coarse, num_best)
+    
+    savings = grid_savings(num_evals, len(x_list)*len(y_list))
+    if verbose:
+        print("Evaluated utility at %d of %d grid points (%d saved)." % 
+              (savings['num_evals'], savings['num_points'], savings['num_saved']))
+    
+    # At the end, if a highest value was found, 
+    # output those values.
+    if (i_max is not None and j_max is not None):
+        xy_best = [float(x_list[i_max]), float(y_list[j_max])]
+    else:
+        print("No value of utility was higher than the initial value.")
+        print("Choose different values of the parameters for x and y.")
+        xy_best = None
+    
+    if full_output:
+        return [xy_best, savings]
+    return xy_best
+
+
+
+#--------------------------------------------------
+# Parallel Grid Search
+#--------------------------------------------------
+
+# The rows of the grid of x are split into chunks
+# and searched in separate processes. 
+# The chunk function must be defined at the top level of the module
+# so that it can be sent to the worker processes.
+
+def max_CES_xy_chunk(
+        i_start: int, i_stop: int, 
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        r: float, p_x: float, p_y: float, w: float) -> List[float]:
+    """
+    Calculates the highest value of the CES utility function 
+    on the rows i_start to i_stop - 1 of the grid searched in max_CES_xy().
+    Returns [max_CES, i_max, j_max], with the indices relative to 
+    the full grid, or [float('-inf'), None, None] 
+    if no point on these rows is within the budget.
+    
+    >>> max_CES_xy_chunk(0, 60, 0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    [9.0, 40, 10]
+    >>> max_CES_xy_chunk(0, 20, 0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    [7.798717737923586, 19, 20]
+    >>> max_CES_xy_chunk(0, 5, 0, 2, 0, 2, 0.1, 1/2, 1, 1, -1)
+    [-inf, None, None]
+    """
+    
+    # Define grid of parameters for search.
+    x_list = np.arange(x_min, x_max, step)
+    y_list = np.arange(y_min, y_max, step)
+    
+    # Initialize utility function and indices (in case no optimum found).
+    max_CES = float('-inf')
+    i_max = None
+    j_max = None
+    
+    # Loop over candidate values in this chunk of rows.
+    for i in range(i_start, min(i_stop, len(x_list))):
+        for j in range(len(y_list)):
+            
+            # Extract candidate values of parameters.
+            x_i = x_list[i]
+            y_j = y_list[j]
+            
+            # Calculate candidate value of utility.
+            if p_x*x_i + p_y*y_j <= w:
+                CES_ij = CESutility_in_budget(x_i, y_j, r, p_x, p_y, w)
+            else:
+                CES_ij = None
+            
+            # Replace values if CES_ij is a new high (and the inputs are valid).
+            if not CES_ij == None and CES_ij > max_CES:
+                max_CES = float(CES_ij)
+                i_max = i
+                j_max = j
+    
+    return [max_CES, i_max, j_max]
+
+
+def max_CES_xy_parallel(
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        r: float, p_x: float, p_y: float, w: float, 
+        num_workers: int = 2) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y 
+    by grid search to maximize the Constant Elasticity 
+    of Substitution utility function.
+    
+    The search is taken over the same grid as in max_CES_xy(), 
+    with the values of x split into chunks of rows 
+    that are searched with max_CES_xy_chunk() 
+    in num_workers processes. 
+    The best points in the chunks are compared in order, 
+    so ties are broken in favor of the first values of x and y, 
+    as in max_CES_xy(). 
+    With num_workers = 1, the chunks are searched in this process. 
+    
+    Run this in a script under if __name__ == "__main__": 
+    so that the worker processes do not run the script again. 
+    
+    >>> max_CES_xy_parallel(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_CES_xy_parallel(0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2, num_workers = 3)
+    [0.01, 1.99]
+    >>> max_CES_xy_parallel(0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000, num_workers = 1)
+    [248.57142857142858, 0.0]
+    """
+    
+    # Split the values of x into chunks of rows, 
+    # a few for each worker to balance the load.
+    num_rows = len(np.arange(x_min, x_max, step))
+    num_chunks = max(1, min(num_rows, 4*num_workers))
+    bounds = np.linspace(0, num_rows, num_chunks + 1).astype(int)
+    chunk_args = [(bounds[k], bounds[k + 1], x_min, x_max, y_min, y_max, 
+                   step, r, p_x, p_y, w) for k in range(num_chunks)]
+    
+    if num_workers == 1:
+        chunk_results = [max_CES_xy_chunk(*args) for args in chunk_args]
+    else:
+        with ProcessPoolExecutor(max_workers = num_workers) as executor:
+            futures = [executor.submit(max_CES_xy_chunk, *args) 
+                       for args in chunk_args]
+            chunk_results = [future.result() for future in futures]
+    
+    # Reduce the results in the order of the chunks, 
+    # keeping the first of any tied values.
+    max_CES = float('-inf')
+    i_max = None
+    j_max = None
+    for CES_k, i_k, j_k in chunk_results:
+        if i_k is not None and CES_k > max_CES:
+            max_CES = CES_k
+            i_max = i_k
+            j_max = j_k
+    
+    # At the end, if a highest value was found, 
+    # output those values.
+    if (i_max is not None and j_max is not None):
+        x_list = np.arange(x_min, x_max, step)
+        y_list = np.arange(y_min, y_max, step)
+        return [float(x_list[i_max]), float(y_list[j_max])]
+    else:
+        print("No value of utility was higher than the initial value.")
+        print("Choose different values of the parameters for x and y.")
+        return None
+
+#--------------------------------------------------
+# Closed-form Demand for Many Consumers
+#--------------------------------------------------
+
+# Array versions of CESdemand_calc(), which solve
+# for any number of combinations of r, p_x, p_y and w at once.
+# The arguments are broadcast against each other, 
+# as in numpy arithmetic.
+
+def CES_valid_params(r: np.ndarray, p_x: np.ndarray, 
+                     p_y: np.ndarray, w: np.ndarray) -> bool:
+    """
+    Determines whether the parameters of the CES demand problem are valid, 
+    i.e. r, p_x and p_y are positive and w is nonnegative 
+    for every element of the arrays, 
+    printing an error message for each invalid parameter.
+    
+    >>> CES_valid_params(np.array([1/2, 2]), 1, 2, 10)
+    True
+    >>> CES_valid_params(np.array([1/2, 0]), 1, 2, 10)
+    Error in CES_valid_params: r is not positive.
+    False
+    >>> CES_valid_params(1/2, np.array([1, -1]), 0, -10)
+    Error in CES_valid_params: p_x is not positive.
+    Error in CES_valid_params: p_y is not positive.
+    Error in CES_valid_params: w is negative.
+    False
+    """
+    
+    is_valid = True
+    if np.any(np.asarray(r) <= 0):
+        print('Error in CES_valid_params: r is not positive.')
+        is_valid = False
+    if np.any(np.asarray(p_x) <= 0):
+        print('Error in CES_valid_params: p_x is not positive.')
+        is_valid = False
+    if np.any(np.asarray(p_y) <= 0):
+        print('Error in CES_valid_params: p_y is not positive.')
+        is_valid = False
+    if np.any(np.asarray(w) < 0):
+        print('Error in CES_valid_params: w is negative.')
+        is_valid = False
+    
+    return is_valid
+
+
+def CESdemand_vec(r: np.ndarray, p_x: np.ndarray, 
+                  p_y: np.ndarray, w: np.ndarray) -> List[np.ndarray]:
+    """
+    Calculates the optimal bundles of goods x and y 
+    for arrays of the parameters r, p_x, p_y and w, 
+    which are broadcast against each other.
+    Returns the list [x_star, y_star] of arrays 
+    with the broadcast shape.
+    
+    When 0 < r < 1, the optimum is the interior solution
+    from CESdemand_calc(). 
+    The share of wealth spent on x is calculated as
+    1/(1 + (p_y/p_x)**(r/(r - 1))), 
+    in logarithms, so that the powers do not overflow
+    when r is close to 1. 
+    When r >= 1, the optimum is a *corner solution*:
+    the consumer spends all the wealth on the cheaper good, 
+    or on y when the prices are equal, 
+    which is the bundle that max_CES_xy() approaches. 
+    
+    >>> [float(q) for q in CESdemand_vec(1/2, 2, 4, 12)]
+    [4.0, 1.0]
+    >>> x_star, y_star = CESdemand_vec(np.array([1/2, 1/3, 10**(-20)]), 
+    ...                                np.array([2, 4, 2]), np.array([4, 9, 4]), 
+    ...                                np.array([12, 27*8*5, 8]))
+    >>> x_star.round(8), y_star.round(8)
+    (array([  4., 162.,   2.]), array([ 1., 48.,  1.]))
+    >>> CESdemand_vec(np.array([2, 2, 3]), np.array([1, 4, 4]), 
+    ...               np.array([1, 3, 9]), np.array([2, 100, 1000]))
+    [array([  0.,   0., 250.]), array([ 2.        , 33.33333333,  0.        ])]
+    >>> x_star, y_star = CESdemand_vec(1/2, np.array([[1], [2]]), 4, 
+    ...                                np.array([10, 20, 30]))
+    >>> x_star.shape
+    (2, 3)
+    >>> CESdemand_vec(1/2, 2, 4, -12)
+    Error in CES_valid_params: w is negative.
+    """
+    
+    if not CES_valid_params(r, p_x, p_y, w):
+        return None
+    r, p_x, p_y, w = np.broadcast_arrays(*[np.asarray(param, dtype = float) 
+                                           for param in [r, p_x, p_y, w]])
+    
+    # Share of wealth spent on x at the interior solution
+    # (the exponent is only used where r < 1).
+    is_interior = r < 1
+    exponent = r/np.where(is_interior, r - 1, -1.0)
+    log_price_ratio = np.log(p_y) - np.log(p_x)
+    share_x = np.exp(- np.logaddexp(0, exponent*log_price_ratio))
+    
+    # Corner solution: all on the cheaper good, y if tied.
+    share_x = np.where(is_interior, share_x, (p_x < p_y).astype(float))
+    
+    x_star = share_x*w/p_x
+    y_star = (1 - share_x)*w/p_y
+    
+    return [x_star, y_star]
+
+
+def CESindirect_util_vec(r: np.ndarray, p_x: np.ndarray, 
+                         p_y: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """
+    Calculates the indirect utility function, 
+    the maximum value of the CES utility function
+    on the budget constraint, for arrays of the parameters 
+    r, p_x, p_y and w, which are broadcast against each other.
+    
+    When 0 < r < 1, this is w/(p_x**k + p_y**k)**(1/k), with k = r/(r - 1), 
+    calculated in logarithms; when r >= 1, it is w/min(p_x, p_y). 
+    For r close to 0, the utility is too large to represent 
+    and the value is inf, as it is for CESutility(). 
+    
+    >>> CESindirect_util_vec(np.array([1/2, 1/3]), np.array([2, 4]), 
+    ...                      np.array([4, 9]), np.array([12, 27*8*5])).round(8)
+    array([  9., 750.])
+    >>> CESutility(4, 1, 1/2), CESutility(162, 48, 1/3)
+    (9.0, 749.9999999999999)
+    >>> CESindirect_util_vec(np.array([2, 3]), np.array([4, 4]), 
+    ...                      np.array([3, 9]), np.array([100, 1000])).round(8)
+    array([ 33.33333333, 250.        ])
+    >>> CESindirect_util_vec(0, 2, 4, 12)
+    Error in CES_valid_params: r is not positive.
+    """
+    
+    if not CES_valid_params(r, p_x, p_y, w):
+        return None
+    r, p_x, p_y, w = np.broadcast_arrays(*[np.asarray(param, dtype = float) 
+                                           for param in [r, p_x, p_y, w]])
+    
+    is_interior = r < 1
+    exponent = r/np.where(is_interior, r - 1, -1.0)
+    log_price_index = np.logaddexp(exponent*np.log(p_x), 
+                                   exponent*np.log(p_y))/exponent
+    with np.errstate(over = 'ignore', divide = 'ignore'):
+        util_interior = w*np.exp(- log_price_index)
+    util_corner = w/np.minimum(p_x, p_y)
+    
+    return np.where(is_interior, util_interior, util_corner)
+
+#--------------------------------------------------
+# Searching Along the Budget Line
+#--------------------------------------------------
+
+# When utility is increasing in both goods, 
+# the best bundle with x_i is the one with the largest y_j
+# that satisfies the budget constraint, 
+# so only one point per value of x_i needs to be evaluated.
+
+def budget_frontier_index(x_list: np.ndarray, y_list: np.ndarray, 
+                          p_x: float, p_y: float, w: float) -> np.ndarray:
+    """
+    Calculates, for each x_i in x_list, the index j of the largest y_j 
+    in the increasing array y_list such that p_x*x_i + p_y*y_j <= w, 
+    or -1 if there is no such y_j. 
+    The index is found by solving the budget constraint for y
+    and then adjusted so that it satisfies the same comparison 
+    as in max_CES_xy(), in floating point arithmetic.
+    
+    >>> budget_frontier_index(np.arange(0, 6, 1.0), np.arange(0, 3, 1.0), 2, 4, 10)
+    array([2, 2, 1, 1, 0, 0])
+    >>> budget_frontier_index(np.arange(0, 3, 1.0), np.arange(1, 3, 1.0), 2, 4, 6)
+    array([ 0,  0, -1])
+    
+    Rounding error can exclude points that are exactly on the budget line: 
+    
+    >>> x_list = np.arange(0, 2, 0.1)
+    >>> y_list = np.arange(0, 2, 0.1)
+    >>> j_max = budget_frontier_index(x_list, y_list, 1, 1, 1.2)
+    >>> [float(y_list[j].round(8)) for j in j_max[:4]]
+    [1.1, 1.0, 1.0, 0.8]
+    >>> bool(x_list[1] + y_list[11] <= 1.2)
+    False
+    """
+    
+    num_y = len(y_list)
+    x_list = np.asarray(x_list)
+    y_limit = (w - p_x*x_list)/p_y
+    j_max = np.searchsorted(y_list, y_limit, side = 'right') - 1
+    j_max = np.clip(j_max, -1, num_y - 1)
+    
+    # Correct the index for rounding error in y_limit.
+    for num_fixes in range(3):
+        in_range = j_max >= 0
+        over = np.zeros(len(x_list), dtype = bool)
+        over[in_range] = (p_x*x_list[in_range] + 
+                          p_y*y_list[j_max[in_range]] > w)
+        j_next = np.minimum(j_max + 1, num_y - 1)
+        under = ((j_next > j_max) & 
+                 (p_x*x_list + p_y*y_list[j_next] <= w))
+        if not (np.any(over) or np.any(under)):
+            break
+        j_max = j_max - over + under
+    
+    return j_max
+
+
+def max_util_xy_frontier(
+        util_func: Callable[[np.ndarray, np.ndarray], np.ndarray], 
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        p_x: float, p_y: float, w: float) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y 
+    on the grid of np.arange(x_min, x_max, step) and
+    np.arange(y_min, y_max, step) 
+    for a utility function util_func(x, y), 
+    which takes arrays of x and y, 
+    and is increasing in y. 
+    
+    Only the bundles on the frontier of the grid points
+    within the budget constraint, from budget_frontier_index(),
+    are evaluated: one for each x_i, instead of one for each (x_i, y_j). 
+    The first of the highest values is selected, 
+    in the order of the exhaustive search. 
+    For utility functions that are not increasing, 
+    use max_util_xy_interior(). 
+    
+    >>> max_util_xy_frontier(lambda x, y: np.sqrt(x) + np.sqrt(y), 
+    ...                      0, 12/2, 0, 12/4, 0.1, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_util_xy_frontier(lambda x, y: np.minimum(x, 2*y), 
+    ...                      0, 6, 0, 6, 1.0, 1, 1, 6)
+    [4.0, 2.0]
+    >>> max_util_xy_frontier(lambda x, y: x + y, 1, 2, 1, 2, 0.5, 1, 1, 1)
+    No value of utility was higher than the initial value.
+    Choose different values of the parameters for x and y.
+    """
+    
+    x_list = np.arange(x_min, x_max, step)
+    y_list = np.arange(y_min, y_max, step)
+    
+    # Exclude negative quantities, as CESutility_valid() does.
+    j_max = budget_frontier_index(x_list, y_list, p_x, p_y, w)
+    is_valid = (j_max >= 0) & (x_list >= 0)
+    j_max = np.where(is_valid, j_max, 0)
+    is_valid = is_valid & (y_list[j_max] >= 0)
+    
+    if not np.any(is_valid):
+        print("No value of utility was higher than the initial value.")
+        print("Choose different values of the parameters for x and y.")
+        return None
+    
+    util = np.full(len(x_list), - np.inf)
+    util[is_valid] = util_func(x_list[is_valid], y_list[j_max[is_valid]])
+    i_max = int(np.argmax(util))
+    
+    return [float(x_list[i_max]), float(y_list[j_max[i_max]])]
+
+
+def max_util_xy_interior(
+        util_func: Callable[[np.ndarray, np.ndarray], np.ndarray], 
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        p_x: float, p_y: float, w: float) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y 
+    on the grid of np.arange(x_min, x_max, step) and
+    np.arange(y_min, y_max, step) 
+    for any utility function util_func(x, y), 
+    which takes arrays of x and y. 
+    
+    All of the grid points within the budget constraint 
+    are evaluated, including those inside the budget set, 
+    so this search finds the optimum 
+    even if the utility function is not increasing
+    (e.g. a satiation point inside the budget set). 
+    The points outside the budget constraint are skipped, 
+    and the values of y_j for each x_i are evaluated
+    in one call to util_func. 
+    The first of the highest values is selected, 
+    in the order of the exhaustive search. 
+    
+    >>> max_util_xy_interior(lambda x, y: np.sqrt(x) + np.sqrt(y), 
+    ...                      0, 12/2, 0, 12/4, 0.1, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_util_xy_interior(lambda x, y: - (x - 1)**2 - (y - 2)**2, 
+    ...                      0, 10, 0, 10, 0.5, 1, 1, 10)
+    [1.0, 2.0]
+    >>> max_util_xy_frontier(lambda x, y: - (x - 1)**2 - (y - 2)**2, 
+    ...                      0, 10, 0, 10, 0.5, 1, 1, 10)
+    [4.5, 5.5]
+    """
+    
+    x_list = np.arange(x_min, x_max, step)
+    y_list = np.arange(y_min, y_max, step)
+    j_max = budget_frontier_index(x_list, y_list, p_x, p_y, w)
+    is_valid_y = y_list >= 0
+    
+    max_util = float('-inf')
+    i_best = None
+    j_best = None
+    for i in range(len(x_list)):
+        if x_list[i] < 0 or j_max[i] < 0:
+            continue
+        util_i = util_func(np.full(j_max[i] + 1, x_list[i]), 
+                           y_list[:j_max[i] + 1])
+        util_i = np.where(is_valid_y[:j_max[i] + 1], util_i, - np.inf)
+        j = int(np.argmax(util_i))
+        if util_i[j] > max_util:
+            max_util = util_i[j]
+            i_best = i
+            j_best = j
+    
+    if i_best is None:
+        print("No value of utility was higher than the initial value.")
+        print("Choose different values of the parameters for x and y.")
+        return None
+    
+    return [float(x_list[i_best]), float(y_list[j_best])]
+
+
+def max_CES_xy_frontier(
+        x_min: float, x_max: float, 
+        y_min: float, y_max: float, 
+        step: float, 
+        r: float, p_x: float, p_y: float, w: float) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y 
+    by grid search to maximize the Constant Elasticity 
+    of Substitution utility function, 
+    over the same grid as max_CES_xy(), 
+    but searching only along the budget line 
+    with max_util_xy_frontier(), 
+    since the CES utility function is increasing in x and y. 
+    This takes O(N) evaluations, instead of O(N**2), 
+    for N points on each axis. 
+    
+    >>> max_CES_xy_frontier(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_CES_xy_frontier(0, 127*8*5/4, 0, 27*8*5/9, 1, 1/3, 4, 9, 27*8*5)
+    [162.0, 48.0]
+    >>> max_CES_xy_frontier(0, 8/2, 0, 8/4, 0.01, 0.001, 2, 4, 8)
+    [2.0, 1.0]
+    >>> max_CES_xy_frontier(0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2)
+    [0.01, 1.99]
+    >>> max_CES_xy_frontier(0, 100/4, 0, 100/3, 1.0, 2, 4, 3, 100)
+    [0.0, 33.0]
+    >>> max_CES_xy_frontier(0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000)
+    [248.57142857142858, 0.0]
+    >>> max_CES_xy_frontier(0, 12/2, 0, 12/4, 0.1, 0, 2, 4, 12)
+    Error in max_CES_xy_frontier: r is not positive.
+    """
+    
+    if r <= 0:
+        print('Error in max_CES_xy_frontier: r is not positive.')
+        return None
+    
+    return max_util_xy_frontier(lambda x, y: (x**r + y**r)**(1/r), 
+                                x_min, x_max, y_min, y_max, step, p_x, p_y, w)
+
+
+
 # Only function definitions above this point. 
 
 
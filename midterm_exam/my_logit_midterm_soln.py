@@ -43,6 +43,9 @@
 import math
 import numpy as np
 from typing import List
+from concurrent.futures import ProcessPoolExecutor
+
+from grid_search import adaptive_grid_max, grid_savings
 
 
 ##################################################
@@ -135,6 +138,70 @@ def logit_like_sum(y: list, x: list, beta_0: float, beta_1: float) -> float:
     return like_sum
 
 
+# Vectorized version of logit_like_sum, 
+# for large datasets and many candidate values of the parameters.
+
+def logit_like_sum_vec(y: List[int], x: List[float], 
+                       beta_0: float, beta_1: float) -> float:
+    """Calculates the value of the likelihood function
+    for the bivariate logistic regression model
+    for several pairs of observations in the lists x and y
+    and coefficients beta_0 and beta_1.
+    
+    This version calculates with numpy arrays instead of looping 
+    over the observations with logit_like(). 
+    If beta_0 and beta_1 are arrays of candidate values, 
+    the likelihood is calculated for each pair (beta_0[i], beta_1[i])
+    and an array of the same shape is returned. 
+    Otherwise, a single float is returned, as in logit_like_sum(). 
+    
+    The log of the logit link function is calculated as 
+    beta_0 + x*beta_1 - log(1 + exp(beta_0 + x*beta_1)), 
+    using np.logaddexp(), which does not overflow for large values of x. 
+    logit_like_sum() remains the reference version of the calculation.
+    
+    >>> round(logit_like_sum_vec([1, 1, 1], [13.7, 12, 437], 0.0, 0.0), 12)
+    -2.07944154168
+    >>> round(logit_like_sum_vec([1, 0], [1, 1], 0.0, math.log(2)), 12)
+    -1.504077396776
+    >>> round(logit_like_sum_vec([1, 0], [2, 3], math.log(5), math.log(2)), 12)
+    -3.762362230874
+    >>> logit_like_sum_vec([1, 0], [2, 3], [0.0, math.log(5)], [0.0, math.log(2)]).round(8)
+    array([-1.38629436, -3.76236223])
+    >>> logit_like_sum_vec([1, 2], [2, 3], 0.0, 0.0)
+    Error: Observations in y must be either zero or one.
+    """
+    
+    y = np.asarray(y, dtype = float)
+    x = np.asarray(x, dtype = float)
+    if not np.all((y == 0) | (y == 1)):
+        print('Error: Observations in y must be either zero or one.')
+        return None
+    
+    # Arrange the candidate parameters in a column, 
+    # so that each row corresponds to one pair (beta_0, beta_1).
+    beta_0, beta_1 = np.broadcast_arrays(np.asarray(beta_0, dtype = float), 
+                                         np.asarray(beta_1, dtype = float))
+    beta_shape = beta_0.shape
+    beta_0 = beta_0.reshape(-1, 1)
+    beta_1 = beta_1.reshape(-1, 1)
+    
+    # The terms y*(beta_0 + x*beta_1) only require sums over the data.
+    like_sum = beta_0[:, 0]*np.sum(y) + beta_1[:, 0]*np.sum(y*x)
+    
+    # The terms log(1 + exp(beta_0 + x*beta_1)) are calculated in blocks 
+    # of observations, to limit the size of the temporary arrays.
+    block_size = max(1, 2**20 // len(beta_0))
+    for start in range(0, len(x), block_size):
+        x_block = x[start:start + block_size]
+        like_sum = like_sum - np.logaddexp(0, beta_0 + beta_1*x_block).sum(axis = 1)
+    
+    if beta_shape == ():
+        return float(like_sum[0])
+    else:
+        return like_sum.reshape(beta_shape)
+
+
 
 # Assignment 5, Exercise 1
 # For completeness. Not used here.
@@ -258,6 +325,112 @@ def max_logit(y: List[float], x: List[float],
 
 
 
+# Vectorized version of max_logit, 
+# which evaluates the likelihood on blocks of the grid at once.
+
+def max_logit_vec(y: List[float], x: List[float], 
+        beta_0_min: float, beta_0_max: float, 
+        beta_1_min: float, beta_1_max: float, 
+        step: float, max_bytes: int = 2**27) -> List[float]:
+    """
+    Calculates the estimated coefficients 
+    by grid search on the value of the logit_like_sum function
+    for the logistic regesssion model 
+    given two lists of data y and x.
+    
+    The search is taken over a grid of candidate values
+    of beta_0 and beta_1 defined over
+    np.arange(beta_0_min, beta_0_max, step) and
+    np.arange(beta_1_min, beta_1_max, step), respectively.
+    
+    Instead of looping over the grid, as in max_logit(), 
+    the likelihood is calculated as an array of dimension
+    (beta_0 x beta_1 x observations), 
+    in tiles of consecutive values of beta_0 
+    (and of the observations, if necessary). 
+    Each tile is calculated in place, so the memory used 
+    is that of the tile and of the products x*beta_1 
+    for its block of observations, 
+    which together take no more than max_bytes, 
+    unless a single value of beta_0 and observation do not fit. 
+    Ties are broken in favor of the first values of beta_0 and beta_1, 
+    as in max_logit(). 
+    
+    >>> [round(beta, 10) for beta in max_logit_vec(
+    ...     [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], -2.0, 2.0, -2.0, 2.0, 0.10)]
+    [0.0, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_vec(
+    ...     [1, 0, 1], [15.0, 10.0, 5.0], -1.0, 1.0, -1.0, 1.0, 0.01)]
+    [0.69, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_vec(
+    ...     [1, 0, 1, 0, 1], [0, 0, 1, 1, 1], -1.0, 1.0, -1.0, 1.0, 0.01, 
+    ...     max_bytes = 2**12)]
+    [0.0, 0.69]
+    """
+    
+    y = np.asarray(y, dtype = float)
+    x = np.asarray(x, dtype = float)
+    if not np.all((y == 0) | (y == 1)):
+        print('Error: Observations in y must be either zero or one.')
+        return None
+    
+    # Define grid of parameters for search.
+    beta_0_list = np.arange(beta_0_min, beta_0_max, step)
+    beta_1_list = np.arange(beta_1_min, beta_1_max, step)
+    
+    # Choose the size of the tiles: 
+    # a block of observations, with at most half of max_bytes 
+    # for the products x*beta_1, 
+    # and as many rows of values of beta_0 as fit in the rest.
+    bytes_per_row = 8*max(1, len(beta_1_list))
+    obs_block = int(min(max(1, len(x)), max(1, max_bytes // (2*bytes_per_row))))
+    bytes_per_block = bytes_per_row*obs_block
+    tile_rows = int(max(1, (max_bytes - bytes_per_block) // bytes_per_block))
+    
+    # The terms y*(beta_0 + x*beta_1) only require sums over the data.
+    sum_y = np.sum(y)
+    sum_xy = np.sum(x*y)
+    beta_1_row = beta_1_list[np.newaxis, :, np.newaxis]
+    
+    # Initialize logit and index numbers. 
+    max_logit_sum = float("-inf")
+    i_max = None
+    j_max = None
+    
+    # Loop over tiles of the grid to find a maximum logit_like_sum.
+    for i_start in range(0, len(beta_0_list), tile_rows):
+        
+        beta_0_tile = beta_0_list[i_start:i_start + tile_rows]
+        beta_0_col = beta_0_tile[:, np.newaxis, np.newaxis]
+        like_tile = (beta_0_col[:, :, 0]*sum_y + 
+                     beta_1_row[:, :, 0]*sum_xy)
+        
+        for k_start in range(0, len(x), obs_block):
+            x_block = x[np.newaxis, np.newaxis, k_start:k_start + obs_block]
+            log_terms = beta_0_col + beta_1_row*x_block
+            np.logaddexp(0, log_terms, out = log_terms)
+            like_tile = like_tile - log_terms.sum(axis = 2)
+        
+        # Replace values if the best in the tile is a new high.
+        # np.argmax() returns the first location of the maximum.
+        ij_tile = np.argmax(like_tile)
+        i_tile, j_tile = np.unravel_index(ij_tile, like_tile.shape)
+        if like_tile[i_tile, j_tile] > max_logit_sum:
+            max_logit_sum = like_tile[i_tile, j_tile]
+            i_max = i_start + i_tile
+            j_max = j_tile
+    
+    # At the end, if a highest value was found, 
+    # output those values.
+    if (i_max is not None and j_max is not None):
+        return [float(beta_0_list[i_max]), float(beta_1_list[j_max])]
+    else:
+        print("No value of logit_like_sum was higher than the initial value.")
+        print("Choose different values of the parameters for beta_0 and beta_1.")
+        return None
+
+
+
 # Ugly version that works and is directly stolen from Assignment 5.
 # Only a few lines of code had to be changed, outlined by #---.
 
@@ -353,6 +526,220 @@ def max_logit_CES_xy(y: List[float], x: List[float],
 
 
 
+#--------------------------------------------------
+# Adaptive Grid Search
+#--------------------------------------------------
+
+# Coarse-to-fine search over the same grid points 
+# as the exhaustive search above, 
+# with adaptive_grid_max() from grid_search.py.
+
+def max_logit_adaptive(y: List[float], x: List[float], 
+        beta_0_min: float, beta_0_max: float, 
+        beta_1_min: float, beta_1_max: float, 
+        step: float, num_coarse: int = 10, num_best: int = 5, 
+        verbose: bool = False, full_output: bool = False) -> List[float]:
+    """
+    Calculates the estimated coefficients 
+    by grid search on the value of the logit_like_sum function
+    for the logistic regesssion model 
+    given two lists of data y and x.
+    
+    The candidate values of beta_0 and beta_1 are taken from 
+    np.arange(beta_0_min, beta_0_max, step) and
+    np.arange(beta_1_min, beta_1_max, step), as in max_logit(), 
+    but the grid is searched from coarse to fine 
+    with adaptive_grid_max(), 
+    so logit_like_sum is calculated at only a fraction of the points. 
+    If verbose is True, it prints the number of evaluations saved
+    compared to the exhaustive search. 
+    If full_output is True, it returns a list of the result 
+    and the report of the savings from grid_savings(). 
+    
+    >>> [round(beta, 10) for beta in max_logit_adaptive(
+    ...     [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], -2.0, 2.0, -2.0, 2.0, 0.10)]
+    [0.0, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_adaptive(
+    ...     [1, 0, 1], [15.0, 10.0, 5.0], -1.0, 1.0, -1.0, 1.0, 0.01, 
+    ...     verbose = True)]
+    Evaluated logit_like_sum at 391 of 40000 grid points (39609 saved).
+    [0.69, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_adaptive(
+    ...     [1, 0, 1, 0, 1], [0, 0, 1, 1, 1], -1.0, 1.0, -1.0, 1.0, 0.01)]
+    [0.0, 0.69]
+    >>> max_logit_adaptive([1, 0, 1], [15.0, 10.0, 5.0], 
+    ...     -1.0, 1.0, -1.0, 1.0, 0.01, full_output = True)[1]
+    {'num_evals': 391, 'num_points': 40000, 'num_saved': 39609}
+    >>> max_logit_adaptive([1, 0, 1], [15.0, 10.0, 5.0], 
+    ...     1.0, -1.0, -1.0, 1.0, 0.01)
+    No value of logit_like_sum was higher than the initial value.
+    Choose different values of the parameters for beta_0 and beta_1.
+    """
+    
+    # Define grid of parameters for search.
+    beta_0_list = np.arange(beta_0_min, beta_0_max, step)
+    beta_1_list = np.arange(beta_1_min, beta_1_max, step)
+    
+    def logit_sum_ij(i: int, j: int) -> float:
+        return logit_like_sum(y, x, beta_0_list[i], beta_1_list[j])
+    
+    i_max, j_max, num_evals = adaptive_grid_max(logit_sum_ij, 
+                                                len(beta_0_list), len(beta_1_list), 
+                                                num_coarse, num_best)
+    
+    savings = grid_savings(num_evals, len(beta_0_list)*len(beta_1_list))
+    if verbose:
+        print("Evaluated logit_like_sum at %d of %d grid points (%d saved)." % 
+              (savings['num_evals'], savings['num_points'], savings['num_saved']))
+    
+    # At the end, if a highest value was found, 
+    # output those values.
+    if (i_max is not None and j_max is not None):
+        beta_best = [float(beta_0_list[i_max]), float(beta_1_list[j_max])]
+    else:
+        print("No value of logit_like_sum was higher than the initial value.")
+        print("Choose different values of the parameters for beta_0 and beta_1.")
+        beta_best = None
+    
+    if full_output:
+        return [beta_best, savings]
+    return beta_best
+
+
+
+#--------------------------------------------------
+# Parallel Grid Search
+#--------------------------------------------------
+
+# The rows of the grid of beta_0 are split into chunks
+# and searched in separate processes. 
+# The chunk function must be defined at the top level of the module
+# so that it can be sent to the worker processes.
+
+def max_logit_chunk(i_start: int, i_stop: int, 
+        y: List[float], x: List[float], 
+        beta_0_min: float, beta_0_max: float, 
+        beta_1_min: float, beta_1_max: float, 
+        step: float) -> List[float]:
+    """
+    Calculates the highest value of the logit_like_sum function
+    on the rows i_start to i_stop - 1 of the grid searched 
+    in max_logit_CES_xy().
+    Returns [max_logit_sum, i_max, j_max], with the indices relative to 
+    the full grid, or [float('-inf'), None, None] if no value was found.
+    
+    >>> max_logit_chunk(0, 10, [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], \
+                        -2.0, 2.0, -2.0, 2.0, 0.10)[1:]
+    [9, 21]
+    >>> max_logit_chunk(20, 40, [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], \
+                        -2.0, 2.0, -2.0, 2.0, 0.10)[1:]
+    [20, 20]
+    >>> max_logit_chunk(40, 50, [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], \
+                        -2.0, 2.0, -2.0, 2.0, 0.10)
+    [-inf, None, None]
+    """
+    
+    # Define grid of parameters for search.
+    beta_0_list = np.arange(beta_0_min, beta_0_max, step)
+    beta_1_list = np.arange(beta_1_min, beta_1_max, step)
+    
+    # Initialize logit and index numbers. 
+    max_logit_sum = float("-inf")
+    i_max = None
+    j_max = None
+    
+    # Loop over candidate values in this chunk of rows.
+    for i in range(i_start, min(i_stop, len(beta_0_list))):
+        for j in range(len(beta_1_list)):
+            
+            # Calculate candidate value of logit_like_sum.
+            logit_sum_ij = logit_like_sum(y, x, beta_0_list[i], beta_1_list[j])
+            
+            # Replace values if logit_sum_ij is a new high.
+            if not logit_sum_ij == None and logit_sum_ij > max_logit_sum:
+                max_logit_sum = float(logit_sum_ij)
+                i_max = i
+                j_max = j
+    
+    return [max_logit_sum, i_max, j_max]
+
+
+def max_logit_CES_xy_parallel(y: List[float], x: List[float], 
+        beta_0_min: float, beta_0_max: float, 
+        beta_1_min: float, beta_1_max: float, 
+        step: float, num_workers: int = 2) -> List[float]:
+    """
+    Calculates the estimated coefficients 
+    by grid search on the value of the logit_like_sum function
+    for the logistic regesssion model 
+    given two lists of data y and x.
+    
+    The search is taken over the same grid as in max_logit_CES_xy(), 
+    with the values of beta_0 split into chunks of rows 
+    that are searched with max_logit_chunk() 
+    in num_workers processes. 
+    The best points in the chunks are compared in order, 
+    so ties are broken in favor of the first values of beta_0 and beta_1, 
+    as in max_logit_CES_xy(). 
+    With num_workers = 1, the chunks are searched in this process. 
+    
+    Run this in a script under if __name__ == "__main__": 
+    so that the worker processes do not run the script again. 
+    
+    >>> [round(beta, 10) for beta in max_logit_CES_xy_parallel(
+    ...     [1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], -2.0, 2.0, -2.0, 2.0, 0.10)]
+    [0.0, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_CES_xy_parallel(
+    ...     [1, 0, 1], [15.0, 10.0, 5.0], -1.0, 1.0, -1.0, 1.0, 0.01, 
+    ...     num_workers = 3)]
+    [0.69, 0.0]
+    >>> [round(beta, 10) for beta in max_logit_CES_xy_parallel(
+    ...     [1, 0, 1, 0, 1], [0, 0, 1, 1, 1], -1.0, 1.0, -1.0, 1.0, 0.01, 
+    ...     num_workers = 1)]
+    [0.0, 0.69]
+    """
+    
+    # Split the values of beta_0 into chunks of rows, 
+    # a few for each worker to balance the load.
+    num_rows = len(np.arange(beta_0_min, beta_0_max, step))
+    num_chunks = max(1, min(num_rows, 4*num_workers))
+    bounds = np.linspace(0, num_rows, num_chunks + 1).astype(int)
+    chunk_args = [(bounds[k], bounds[k + 1], y, x, 
+                   beta_0_min, beta_0_max, beta_1_min, beta_1_max, step) 
+                  for k in range(num_chunks)]
+    
+    if num_workers == 1:
+        chunk_results = [max_logit_chunk(*args) for args in chunk_args]
+    else:
+        with ProcessPoolExecutor(max_workers = num_workers) as executor:
+            futures = [executor.submit(max_logit_chunk, *args) 
+                       for args in chunk_args]
+            chunk_results = [future.result() for future in futures]
+    
+    # Reduce the results in the order of the chunks, 
+    # keeping the first of any tied values.
+    max_logit_sum = float("-inf")
+    i_max = None
+    j_max = None
+    for logit_sum_k, i_k, j_k in chunk_results:
+        if i_k is not None and logit_sum_k > max_logit_sum:
+            max_logit_sum = logit_sum_k
+            i_max = i_k
+            j_max = j_k
+    
+    # At the end, if a highest value was found, 
+    # output those values.
+    if (i_max is not None and j_max is not None):
+        beta_0_list = np.arange(beta_0_min, beta_0_max, step)
+        beta_1_list = np.arange(beta_1_min, beta_1_max, step)
+        return [float(beta_0_list[i_max]), float(beta_1_list[j_max])]
+    else:
+        print("No value of logit_like_sum was higher than the initial value.")
+        print("Choose different values of the parameters for beta_0 and beta_1.")
+        return None
+
+
+
 # Only function definitions above this point. 
 
 
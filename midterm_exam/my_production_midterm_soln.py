@@ -37,6 +37,10 @@
 
 # import name_of_module
 import numpy as np
+import pandas as pd
+from typing import Callable, List
+
+from grid_search import adaptive_grid_max, grid_savings
 
 
 ##################################################
@@ -187,6 +191,266 @@ def profit_max_q(q_max:float, step:float, unit_price:float,
 
 
 
+#--------------------------------------------------
+# Adaptive Grid Search
+#--------------------------------------------------
+
+# Coarse-to-fine search over the same grid points 
+# as the exhaustive search above, 
+# with adaptive_grid_max() from grid_search.py.
+
+def profit_max_q_adaptive(q_max:float, step:float, unit_price:float, 
+                 multiplier:float, fixed_cost:float, 
+                 num_coarse:int = 10, num_best:int = 5, 
+                 verbose:bool = False, full_output:bool = False) -> float:
+    """
+    Calculates the quantity to produce that maximizes profit.
+    The candidate quantities are taken from np.arange(0, q_max, step), 
+    as in profit_max_q(), but the grid is searched from coarse to fine
+    with adaptive_grid_max(), 
+    so the profit is calculated at only a fraction of the points. 
+    If verbose is True, it prints the number of evaluations saved
+    compared to the exhaustive search. 
+    If full_output is True, it returns a list of the result 
+    and the report of the savings from grid_savings(). 
+    Function call: profit_max_q_adaptive(q_max, step, unit_price, multiplier, fixed_cost)
+    
+    >>> profit_max_q_adaptive(1000, 10, 100, 0.10, 2)
+    500
+    >>> profit_max_q_adaptive(100, 1, 200, 2.5, 5, verbose = True)
+    Evaluated profit at 34 of 100 grid points (66 saved).
+    40
+    >>> profit_max_q_adaptive(1000, 10, 100, 0.10, 50001)
+    No positive value of quantity was profitable.
+    0
+    >>> profit_max_q_adaptive(100, 1, 200, 2.5, 5, full_output = True)
+    [40, {'num_evals': 34, 'num_points': 100, 'num_saved': 66}]
+    >>> profit_max_q_adaptive(0, 1, 200, 2.5, 5)
+    Error in profit_max_q_adaptive: the grid of quantities is empty.
+    """
+    
+    q_list = np.arange(0, q_max, step)
+    if len(q_list) == 0:
+        print('Error in profit_max_q_adaptive: the grid of quantities is empty.')
+        return None
+    
+    def profit_i(i: int, j: int) -> float:
+        return total_profit(q_list[i], unit_price, multiplier, fixed_cost)
+    
+    i_max, j_max, num_evals = adaptive_grid_max(profit_i, len(q_list), 1, 
+                                                num_coarse, num_best)
+    max_profit = profit_i(i_max, j_max)
+    savings = grid_savings(num_evals, len(q_list))
+    
+    if verbose:
+        print("Evaluated profit at %d of %d grid points (%d saved)." % 
+              (savings['num_evals'], savings['num_points'], savings['num_saved']))
+    
+    if (max_profit <= 0):
+        print("No positive value of quantity was profitable.")
+        q_best = 0
+    else:
+        q_best = q_list[i_max].item()
+    
+    if full_output:
+        return [q_best, savings]
+    return q_best
+
+#--------------------------------------------------
+# Scenario Analysis
+#--------------------------------------------------
+
+# The closed-form solution in max_profit_calc(), 
+# for arrays of prices, cost multipliers and fixed costs at once.
+
+def profit_valid_params(unit_price: np.ndarray, multiplier: np.ndarray, 
+                        fixed_cost: np.ndarray) -> bool:
+    """
+    Determines whether the parameters of the profit maximization problem 
+    are valid, i.e. unit_price and multiplier are positive
+    and fixed_cost is nonnegative for every element of the arrays, 
+    printing an error message for each invalid parameter.
+    
+    >>> profit_valid_params(np.array([100, 200]), 0.10, 2)
+    True
+    >>> profit_valid_params(np.array([100, -200]), 0, -2)
+    Error in profit_valid_params: unit_price is not positive.
+    Error in profit_valid_params: multiplier is not positive.
+    Error in profit_valid_params: fixed_cost is negative.
+    False
+    """
+    
+    is_valid = True
+    if np.any(np.asarray(unit_price) <= 0):
+        print('Error in profit_valid_params: unit_price is not positive.')
+        is_valid = False
+    if np.any(np.asarray(multiplier) <= 0):
+        print('Error in profit_valid_params: multiplier is not positive.')
+        is_valid = False
+    if np.any(np.asarray(fixed_cost) < 0):
+        print('Error in profit_valid_params: fixed_cost is negative.')
+        is_valid = False
+    
+    return is_valid
+
+
+def max_profit_vec(unit_price: np.ndarray, multiplier: np.ndarray, 
+                   fixed_cost: np.ndarray) -> List[np.ndarray]:
+    """
+    Calculates the quantity to produce that maximizes profit, 
+    as in max_profit_calc(), for arrays of the parameters 
+    unit_price, multiplier and fixed_cost, 
+    which are broadcast against each other. 
+    Returns the list [q_star, profit, shutdown] of arrays 
+    with the broadcast shape, where shutdown is True 
+    when the profit at unit_price/(2*multiplier) is negative, 
+    in which case q_star is 0 and the profit is - fixed_cost.
+    Function call: max_profit_vec(unit_price, multiplier, fixed_cost)
+    
+    >>> q_star, profit, shutdown = max_profit_vec(np.array([100, 200, 100]), 
+    ...                                           np.array([0.10, 2.5, 0.10]), 
+    ...                                           np.array([2, 5, 50001]))
+    >>> q_star
+    array([500.,  40.,   0.])
+    >>> profit
+    array([ 24998.,   3995., -50001.])
+    >>> shutdown
+    array([False, False,  True])
+    >>> max_profit_vec(100, 0, 2)
+    Error in profit_valid_params: multiplier is not positive.
+    """
+    
+    if not profit_valid_params(unit_price, multiplier, fixed_cost):
+        return None
+    unit_price, multiplier, fixed_cost = np.broadcast_arrays(
+        *[np.asarray(param, dtype = float) 
+          for param in [unit_price, multiplier, fixed_cost]])
+    
+    # At q_star = unit_price/(2*multiplier), 
+    # the profit is unit_price**2/(4*multiplier) - fixed_cost.
+    q_star = unit_price/(2*multiplier)
+    profit = unit_price*q_star/2 - fixed_cost
+    shutdown = profit < 0
+    
+    q_star = np.where(shutdown, 0.0, q_star)
+    profit = np.where(shutdown, - fixed_cost, profit)
+    
+    return [q_star, profit, shutdown]
+
+
+def profit_scenario_chunk(unit_prices: np.ndarray, multipliers: np.ndarray, 
+                          fixed_costs: np.ndarray, 
+                          start: int, stop: int) -> pd.DataFrame:
+    """
+    Calculates the rows start to stop - 1 of the data frame 
+    from profit_scenarios(), without forming the other combinations, 
+    for the combinations in the order of nested loops 
+    over unit_prices, multipliers and fixed_costs.
+    Returns None if the parameters are not valid.
+    Function call: profit_scenario_chunk(unit_prices, multipliers, fixed_costs, start, stop)
+    
+    >>> profit_scenario_chunk([100, 200], [0.10, 2.5], [2, 50001], 5, 7)
+       unit_price  multiplier  fixed_cost  q_star   profit  shutdown
+    0       200.0         0.1     50001.0  1000.0  49999.0     False
+    1       200.0         2.5         2.0    40.0   3998.0     False
+    """
+    
+    unit_prices = np.asarray(unit_prices, dtype = float)
+    multipliers = np.asarray(multipliers, dtype = float)
+    fixed_costs = np.asarray(fixed_costs, dtype = float)
+    
+    # Index of each value in the combinations start to stop - 1.
+    i, j, k = np.unravel_index(np.arange(start, stop), 
+                               (len(unit_prices), len(multipliers), 
+                                len(fixed_costs)))
+    
+    solution = max_profit_vec(unit_prices[i], multipliers[j], fixed_costs[k])
+    if solution is None:
+        return None
+    q_star, profit, shutdown = solution
+    
+    return pd.DataFrame({'unit_price': unit_prices[i], 
+                         'multiplier': multipliers[j], 
+                         'fixed_cost': fixed_costs[k], 
+                         'q_star': q_star, 
+                         'profit': profit, 
+                         'shutdown': shutdown})
+
+
+def profit_scenarios(unit_prices: np.ndarray, multipliers: np.ndarray, 
+                     fixed_costs: np.ndarray) -> pd.DataFrame:
+    """
+    Calculates the optimal quantity, the profit and whether to shut down
+    with max_profit_vec() for every combination of the values 
+    in the arrays unit_prices, multipliers and fixed_costs. 
+    Returns a data frame with one row for each combination, 
+    in the order of nested loops over unit_prices, multipliers 
+    and fixed_costs, with the variables 
+    unit_price, multiplier, fixed_cost, q_star, profit and shutdown. 
+    Function call: profit_scenarios(unit_prices, multipliers, fixed_costs)
+    
+    >>> scenarios = profit_scenarios([100, 200], [0.10, 2.5], [2, 50001])
+    >>> scenarios.shape
+    (8, 6)
+    >>> scenarios[['unit_price', 'multiplier', 'q_star', 'shutdown']].iloc[:4]
+       unit_price  multiplier  q_star  shutdown
+    0       100.0         0.1   500.0     False
+    1       100.0         0.1     0.0      True
+    2       100.0         2.5    20.0     False
+    3       100.0         2.5     0.0      True
+    >>> profit_scenarios([100], [0], [2])
+    Error in profit_valid_params: multiplier is not positive.
+    """
+    
+    if not profit_valid_params(unit_prices, multipliers, fixed_costs):
+        return None
+    
+    return profit_scenario_chunk(unit_prices, multipliers, fixed_costs, 0, 
+                                 len(unit_prices)*len(multipliers)*len(fixed_costs))
+
+
+def profit_scenarios_to_csv(csv_path: str, unit_prices: np.ndarray, 
+                            multipliers: np.ndarray, fixed_costs: np.ndarray, 
+                            chunk_size: int = 1000000) -> int:
+    """
+    Writes the data frame from profit_scenarios() to the csv file csv_path, 
+    calculating chunk_size combinations at a time, 
+    so that sweeps with too many combinations to hold in memory
+    can be saved to disk. 
+    Returns the number of rows written, 
+    or None if the parameters are not valid.
+    Function call: profit_scenarios_to_csv(csv_path, unit_prices, multipliers, fixed_costs)
+    
+    >>> import os, tempfile
+    >>> csv_path = os.path.join(tempfile.mkdtemp(), 'scenarios.csv')
+    >>> profit_scenarios_to_csv(csv_path, np.linspace(50, 250, 5), [0.10, 2.5], 
+    ...                         [2, 5, 50001], chunk_size = 7)
+    30
+    >>> scenarios = pd.read_csv(csv_path)
+    >>> scenarios.equals(profit_scenarios(np.linspace(50, 250, 5), [0.10, 2.5], 
+    ...                                   [2, 5, 50001]))
+    True
+    >>> profit_scenarios_to_csv(csv_path, [100], [0.10], [-1])
+    Error in profit_valid_params: fixed_cost is negative.
+    """
+    
+    # Check the parameters before opening the file, 
+    # so that nothing is written if they are not valid.
+    if not profit_valid_params(unit_prices, multipliers, fixed_costs):
+        return None
+    
+    num_rows = len(unit_prices)*len(multipliers)*len(fixed_costs)
+    for start in range(0, num_rows, chunk_size):
+        stop = min(start + chunk_size, num_rows)
+        chunk = profit_scenario_chunk(unit_prices, multipliers, fixed_costs, 
+                                      start, stop)
+        chunk.to_csv(csv_path, mode = 'w' if start == 0 else 'a', 
+                     header = (start == 0), index = False)
+    
+    return num_rows
+
+
+
 # Only function definitions above this point. 
 
 
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for the closed-form CES demand functions
+#
+##################################################
+#
+# Compares CESdemand_vec() and CESindirect_util_vec()
+# with the grid search max_CES_xy() on the examples
+# in its docstring and with CESdemand_calc()
+# on a batch of random parameters.
+#
+##################################################
+"""
+
+
+import unittest
+
+import numpy as np
+
+import my_CES_midterm_soln as my_CES
+
+
+class TestCESdemandVec(unittest.TestCase):
+    """Tests for my_CES.CESdemand_vec and my_CES.CESindirect_util_vec."""
+
+    def test_doctest_examples(self):
+        """Test against max_CES_xy on the examples in its docstring."""
+
+        examples = [(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12),
+                    (0, 127*8*5/4, 0, 27*8*5/9, 1, 1/3, 4, 9, 27*8*5),
+                    (0, 8/2, 0, 8/4, 0.01, 0.001, 2, 4, 8),
+                    (0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2),
+                    (0, 100/4, 0, 100/3, 1.0, 2, 4, 3, 100),
+                    (0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000)]
+        for args in examples:
+            step = args[4]
+            r, p_x, p_y, w = args[5:]
+            x_grid, y_grid = my_CES.max_CES_xy(*args)
+            x_star, y_star = my_CES.CESdemand_vec(r, p_x, p_y, w)
+            # The grid excludes the upper limits,
+            # so it can be up to one step from the optimum.
+            self.assertLessEqual(abs(x_star - x_grid), step + 1e-9)
+            self.assertLessEqual(abs(y_star - y_grid), step + 1e-9)
+            # The grid point can be no better than the optimum.
+            util_grid = my_CES.CESutility(x_grid, y_grid, r)
+            util_star = my_CES.CESindirect_util_vec(r, p_x, p_y, w)
+            self.assertLessEqual(util_grid, util_star*(1 + 1e-12))
+
+    def test_batch_matches_calc(self):
+        """Test the interior solutions against CESdemand_calc."""
+
+        rng = np.random.default_rng(42)
+        r = rng.uniform(0.05, 0.95, 1000)
+        p_x = rng.uniform(0.5, 10, 1000)
+        p_y = rng.uniform(0.5, 10, 1000)
+        w = rng.uniform(1, 1000, 1000)
+        x_star, y_star = my_CES.CESdemand_vec(r, p_x, p_y, w)
+        util_star = my_CES.CESindirect_util_vec(r, p_x, p_y, w)
+        for i in range(len(r)):
+            x_calc, y_calc = my_CES.CESdemand_calc(r[i], p_x[i], p_y[i], w[i])
+            self.assertAlmostEqual(x_star[i], x_calc, delta = 1e-9*w[i])
+            self.assertAlmostEqual(y_star[i], y_calc, delta = 1e-9*w[i])
+            util_calc = my_CES.CESutility(x_calc, y_calc, r[i])
+            self.assertAlmostEqual(util_star[i]/util_calc, 1.0, places = 9)
+
+    def test_budget_exhausted(self):
+        """Test that the bundles spend all the wealth, near and above r = 1."""
+
+        r = np.array([0.999999, 1.0, 1.5, 5.0])
+        x_star, y_star = my_CES.CESdemand_vec(r[:, np.newaxis],
+                                              np.array([2.0, 3.0]), 3.0, 60.0)
+        self.assertTrue(np.all(np.isfinite(x_star)))
+        self.assertTrue(np.allclose(2.0*x_star[:, 0] + 3.0*y_star[:, 0], 60.0))
+        self.assertTrue(np.allclose(x_star[1:, 0], 30.0))
+        # Equal prices: all on y.
+        self.assertTrue(np.allclose(y_star[1:, 1], 20.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for the adaptive grid search functions
+#
+##################################################
+#
+# Compares the coarse-to-fine grid searches 
+# max_logit_adaptive(), max_CES_xy_adaptive() and 
+# profit_max_q_adaptive() with the exhaustive grid searches
+# max_logit(), max_CES_xy() and profit_max_q()
+# on the examples in their docstrings.
+#
+##################################################
+"""
+
+
+import unittest
+
+import my_CES_midterm_soln as my_CES
+import my_logit_midterm_soln as my_logit
+import my_production_midterm_soln as my_production
+
+
+class TestMaxLogitAdaptive(unittest.TestCase):
+    """Tests for my_logit.max_logit_adaptive."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of max_logit."""
+
+        examples = [([1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], 
+                     -2.0, 2.0, -2.0, 2.0, 0.10), 
+                    ([1, 0, 1], [15.0, 10.0, 5.0], 
+                     -1.0, 1.0, -1.0, 1.0, 0.01), 
+                    ([1, 0, 1, 0, 1], [0, 0, 1, 1, 1], 
+                     -1.0, 1.0, -1.0, 1.0, 0.01)]
+        for args in examples:
+            expected = my_logit.max_logit(*args)
+            actual = my_logit.max_logit_adaptive(*args)
+            self.assertEqual(expected, actual)
+
+
+class TestMaxCESxyAdaptive(unittest.TestCase):
+    """Tests for my_CES.max_CES_xy_adaptive."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of max_CES_xy."""
+
+        examples = [(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12), 
+                    (0, 127*8*5/4, 0, 27*8*5/9, 1, 1/3, 4, 9, 27*8*5), 
+                    (0, 8/2, 0, 8/4, 0.01, 0.001, 2, 4, 8), 
+                    (0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2), 
+                    (0, 100/4, 0, 100/3, 1.0, 2, 4, 3, 100), 
+                    (0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000)]
+        for args in examples:
+            expected = my_CES.max_CES_xy(*args)
+            actual = my_CES.max_CES_xy_adaptive(*args)
+            self.assertEqual(expected, actual)
+
+
+class TestProfitMaxQAdaptive(unittest.TestCase):
+    """Tests for my_production.profit_max_q_adaptive."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of profit_max_q."""
+
+        examples = [(1000, 10, 100, 0.10, 2), 
+                    (100, 1, 200, 2.5, 5), 
+                    (1000, 0.5, 100, 0.10, 2)]
+        for args in examples:
+            expected = my_production.profit_max_q(*args)
+            actual = my_production.profit_max_q_adaptive(*args)
+            self.assertEqual(expected, actual)
+
+    def test_no_profitable_quantity(self):
+        """Test a fixed cost too high for any quantity to be profitable."""
+
+        expected = my_production.profit_max_q(1000, 10, 100, 0.10, 50001)
+        actual = my_production.profit_max_q_adaptive(1000, 10, 100, 0.10, 50001)
+        self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for logit_like_sum_vec and max_logit_vec
+#
+##################################################
+#
+# Compares the vectorized versions logit_like_sum_vec()
+# and max_logit_vec() with the reference versions 
+# logit_like_sum() and max_logit()
+# in my_logit_midterm_soln.py, 
+# and the copy of logit_like_sum_vec() in the solution to Assignment 5
+# with the one here. 
+#
+##################################################
+"""
+
+
+import importlib.util
+import math
+import os
+import unittest
+
+import numpy as np
+
+import my_logit_midterm_soln as my_logit
+
+
+class TestLogitLikeSumVec(unittest.TestCase):
+    """Tests for my_logit.logit_like_sum_vec."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of logit_like_sum."""
+
+        examples = [([1, 1, 1], [13.7, 12, 437], 0.0, 0.0), 
+                    ([1, 0], [1, 1], 0.0, math.log(2)), 
+                    ([1, 0], [2, 3], math.log(5), math.log(2))]
+        for y, x, beta_0, beta_1 in examples:
+            expected = my_logit.logit_like_sum(y, x, beta_0, beta_1)
+            actual = my_logit.logit_like_sum_vec(y, x, beta_0, beta_1)
+            self.assertAlmostEqual(expected, actual, places = 12)
+
+    def test_random_data(self):
+        """Test a sample of random data with several observations."""
+
+        rng = np.random.default_rng(3311)
+        x = list(rng.normal(size = 500))
+        y = list(rng.integers(0, 2, size = 500))
+        expected = my_logit.logit_like_sum(y, x, 0.25, -0.75)
+        actual = my_logit.logit_like_sum_vec(y, x, 0.25, -0.75)
+        self.assertAlmostEqual(expected, actual, places = 9)
+
+    def test_batch_of_parameters(self):
+        """Test a batch of candidate parameters in one call."""
+
+        rng = np.random.default_rng(3004)
+        x = list(rng.normal(size = 200))
+        y = list(rng.integers(0, 2, size = 200))
+        beta_0 = np.linspace(-1.0, 1.0, 7)
+        beta_1 = np.linspace(2.0, -2.0, 7)
+        expected = [my_logit.logit_like_sum(y, x, beta_0[i], beta_1[i]) 
+                    for i in range(len(beta_0))]
+        actual = my_logit.logit_like_sum_vec(y, x, beta_0, beta_1)
+        self.assertEqual(actual.shape, beta_0.shape)
+        np.testing.assert_allclose(actual, expected, rtol = 1e-12)
+
+    def test_grid_of_parameters(self):
+        """Test a two-dimensional grid of candidate parameters."""
+
+        y = [1, 0, 1, 0, 1]
+        x = [0, 0, 1, 1, 1]
+        beta_0, beta_1 = np.meshgrid(np.arange(-1.0, 1.0, 0.5), 
+                                     np.arange(-1.0, 1.0, 0.25), 
+                                     indexing = 'ij')
+        actual = my_logit.logit_like_sum_vec(y, x, beta_0, beta_1)
+        self.assertEqual(actual.shape, (4, 8))
+        for i in range(4):
+            for j in range(8):
+                expected = my_logit.logit_like_sum(y, x, beta_0[i, j], 
+                                                   beta_1[i, j])
+                self.assertAlmostEqual(expected, actual[i, j], places = 12)
+
+    def test_non_binary_y(self):
+        """Test that non-binary observations of y are rejected."""
+
+        self.assertIsNone(my_logit.logit_like_sum_vec([1, 2], [2, 3], 0.0, 0.0))
+
+    def test_large_linear_index(self):
+        """Test that large values of beta_0 + x*beta_1 do not overflow."""
+
+        actual = my_logit.logit_like_sum_vec([1, 0], [1000.0, -1000.0], 0.0, 1.0)
+        self.assertAlmostEqual(actual, 0.0, places = 12)
+
+    def test_assignment_05_copy(self):
+        """Test that the copy in my_logit_A5_soln.py gives the same values."""
+
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
+                            '..', 'assignment_05', 'my_logit_A5_soln.py')
+        spec = importlib.util.spec_from_file_location('my_logit_A5_soln', path)
+        my_logit_A5 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(my_logit_A5)
+
+        rng = np.random.default_rng(2022)
+        x = list(rng.normal(size = 100))
+        y = list(rng.integers(0, 2, size = 100))
+        beta_0, beta_1 = np.meshgrid(np.arange(-1.0, 1.0, 0.5), 
+                                     np.arange(-1.0, 1.0, 0.25))
+        np.testing.assert_array_equal(
+            my_logit_A5.logit_like_sum_vec(y, x, beta_0, beta_1), 
+            my_logit.logit_like_sum_vec(y, x, beta_0, beta_1))
+        self.assertIsNone(my_logit_A5.logit_like_sum_vec([1, 2], [2, 3], 0.0, 0.0))
+
+
+class TestMaxLogitVec(unittest.TestCase):
+    """Tests for my_logit.max_logit_vec."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of max_logit."""
+
+        examples = [([1, 1, 0, 0], [15.0, 5.0, 15.0, 5.0], 
+                     -2.0, 2.0, -2.0, 2.0, 0.10), 
+                    ([1, 0, 1], [15.0, 10.0, 5.0], 
+                     -1.0, 1.0, -1.0, 1.0, 0.01), 
+                    ([1, 0, 1, 0, 1], [0, 0, 1, 1, 1], 
+                     -1.0, 1.0, -1.0, 1.0, 0.01)]
+        for args in examples:
+            expected = my_logit.max_logit(*args)
+            actual = my_logit.max_logit_vec(*args)
+            self.assertEqual(expected, actual)
+
+    def test_small_tiles(self):
+        """Test that tiles smaller than one row of the grid 
+        give the same answer as the loop."""
+
+        rng = np.random.default_rng(2022)
+        x = list(rng.normal(size = 300))
+        y = list(rng.integers(0, 2, size = 300))
+        expected = my_logit.max_logit(y, x, -1.0, 1.0, -1.0, 1.0, 0.05)
+        for max_bytes in [2**8, 2**14, 2**30]:
+            actual = my_logit.max_logit_vec(y, x, -1.0, 1.0, -1.0, 1.0, 0.05, 
+                                            max_bytes = max_bytes)
+            self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
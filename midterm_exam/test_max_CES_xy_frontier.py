@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for the budget-frontier grid search
+#
+##################################################
+#
+# Compares max_CES_xy_frontier() and max_util_xy_interior()
+# with the exhaustive grid search max_CES_xy()
+# on the examples in its docstring and on random grids.
+#
+##################################################
+"""
+
+
+import unittest
+
+import numpy as np
+
+import my_CES_midterm_soln as my_CES
+
+
+examples = [(0, 12/2, 0, 12/4, 0.1, 1/2, 2, 4, 12),
+            (0, 127*8*5/4, 0, 27*8*5/9, 1, 1/3, 4, 9, 27*8*5),
+            (0, 8/2, 0, 8/4, 0.01, 0.001, 2, 4, 8),
+            (0, 2/1, 0, 2/1, 0.01, 2, 1, 1, 2),
+            (0, 100/4, 0, 100/3, 1.0, 2, 4, 3, 100),
+            (0, 1000/4, 0, 1000/9, 10/7, 3, 4, 9, 1000)]
+
+
+def random_examples(num_examples, seed = 42):
+    """Generate the arguments of max_CES_xy for small random grids."""
+
+    rng = np.random.default_rng(seed)
+    for k in range(num_examples):
+        r = float(rng.choice([0.2, 0.5, 0.9, 1.0, 2.0]))
+        p_x, p_y = [float(p) for p in rng.uniform(0.5, 5, 2)]
+        w = float(rng.uniform(5, 50))
+        step = float(rng.choice([0.1, 0.25, 0.5, 1.0]))
+        x_min, y_min = [float(q) for q in rng.choice([0.0, 0.5, 1.0], 2)]
+        yield (x_min, x_min + 30*step, y_min, y_min + 30*step, step,
+               r, p_x, p_y, w)
+
+
+def CES_util_func(r):
+    """Return the CES utility function for arrays of x and y."""
+
+    return lambda x, y: (x**r + y**r)**(1/r)
+
+
+class TestMaxCESxyFrontier(unittest.TestCase):
+    """Tests for my_CES.max_CES_xy_frontier."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of max_CES_xy."""
+
+        for args in examples:
+            expected = my_CES.max_CES_xy(*args)
+            actual = my_CES.max_CES_xy_frontier(*args)
+            self.assertEqual(expected, actual)
+
+    def test_random_grids(self):
+        """Test on random grids, including empty budget sets."""
+
+        for args in random_examples(50):
+            expected = my_CES.max_CES_xy(*args)
+            actual = my_CES.max_CES_xy_frontier(*args)
+            self.assertEqual(expected, actual)
+
+
+class TestMaxUtilxyInterior(unittest.TestCase):
+    """Tests for my_CES.max_util_xy_interior."""
+
+    def test_doctest_examples(self):
+        """Test the examples in the docstring of max_CES_xy."""
+
+        for args in examples:
+            r, p_x, p_y, w = args[5:]
+            expected = my_CES.max_CES_xy(*args)
+            actual = my_CES.max_util_xy_interior(CES_util_func(r),
+                                                 *args[:5], p_x, p_y, w)
+            self.assertEqual(expected, actual)
+
+    def test_satiation_point(self):
+        """Test a utility function with a maximum inside the budget set."""
+
+        util_func = lambda x, y: - (x - 2)**2 - (y - 3)**2
+        actual = my_CES.max_util_xy_interior(util_func, 0, 10, 0, 10, 0.5,
+                                             1, 2, 20)
+        self.assertEqual(actual, [2.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for the profit scenario functions
+#
+##################################################
+#
+# Compares max_profit_vec() and profit_scenarios()
+# with max_profit_calc() and total_profit()
+# for every combination of a set of parameters.
+#
+##################################################
+"""
+
+
+import unittest
+
+import numpy as np
+
+import my_production_midterm_soln as my_production
+
+
+unit_prices = [50, 100, 200]
+multipliers = [0.10, 2.5, 10]
+fixed_costs = [0, 5, 1000, 50001]
+
+
+class TestMaxProfitVec(unittest.TestCase):
+    """Tests for my_production.max_profit_vec."""
+
+    def test_matches_max_profit_calc(self):
+        """Test each combination against max_profit_calc and total_profit."""
+
+        q_star, profit, shutdown = my_production.max_profit_vec(
+            np.array(unit_prices)[:, np.newaxis, np.newaxis],
+            np.array(multipliers)[np.newaxis, :, np.newaxis],
+            np.array(fixed_costs)[np.newaxis, np.newaxis, :])
+        for i, unit_price in enumerate(unit_prices):
+            for j, multiplier in enumerate(multipliers):
+                for k, fixed_cost in enumerate(fixed_costs):
+                    expected = my_production.max_profit_calc(unit_price,
+                                                             multiplier,
+                                                             fixed_cost)
+                    self.assertAlmostEqual(q_star[i, j, k], expected)
+                    self.assertAlmostEqual(profit[i, j, k],
+                                           my_production.total_profit(
+                                               expected, unit_price,
+                                               multiplier, fixed_cost))
+                    self.assertEqual(shutdown[i, j, k], expected == 0)
+
+
+class TestProfitScenarios(unittest.TestCase):
+    """Tests for my_production.profit_scenarios."""
+
+    def test_order_of_combinations(self):
+        """Test that the rows follow nested loops over the parameters."""
+
+        scenarios = my_production.profit_scenarios(unit_prices, multipliers,
+                                                   fixed_costs)
+        row = 0
+        for unit_price in unit_prices:
+            for multiplier in multipliers:
+                for fixed_cost in fixed_costs:
+                    self.assertEqual(scenarios['unit_price'][row], unit_price)
+                    self.assertEqual(scenarios['multiplier'][row], multiplier)
+                    self.assertEqual(scenarios['fixed_cost'][row], fixed_cost)
+                    row = row + 1
+
+    def test_chunks_match(self):
+        """Test that the chunks put together equal the whole data frame."""
+
+        scenarios = my_production.profit_scenarios(unit_prices, multipliers,
+                                                   fixed_costs)
+        for start in range(0, len(scenarios), 5):
+            chunk = my_production.profit_scenario_chunk(
+                unit_prices, multipliers, fixed_costs,
+                start, min(start + 5, len(scenarios)))
+            self.assertTrue(np.array_equal(chunk['profit'],
+                                           scenarios['profit'][start:start + 5]))
+
+
+if __name__ == '__main__':
+    unittest.main()
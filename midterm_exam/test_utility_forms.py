@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Tests for the registry of utility functions
+#
+##################################################
+#
+# Compares the grid searches in utility_forms.py
+# with each other and with max_CES_xy()
+# for each form of utility function in UTILITY_FORMS.
+#
+##################################################
+"""
+
+
+import unittest
+
+import my_CES_midterm_soln as my_CES
+import utility_forms as uf
+
+
+grids = [(0, 12/2, 0, 12/4, 0.1, 2, 4, 12),
+         (0, 10, 0, 10, 0.5, 2, 1, 12),
+         (0.5, 20, 0, 20, 0.25, 1, 3, 15),
+         (0, 1, 0, 10, 1.0, 2, 1, 12)]
+
+params = {'cobb_douglas': {'alpha': 1/3},
+          'CES': {'r': 1/2},
+          'leontief': {'a': 1, 'b': 2},
+          'quasi_linear': {'a': 6}}
+
+
+class TestMaxUtilxy(unittest.TestCase):
+    """Tests for uf.max_util_xy."""
+
+    def test_CES_matches_max_CES_xy(self):
+        """Test the CES form against max_CES_xy."""
+
+        for r in [1/3, 1/2, 2]:
+            for grid in grids:
+                expected = my_CES.max_CES_xy(*grid[:5], r, *grid[5:])
+                for method in ['frontier', 'interior', 'grid']:
+                    actual = uf.max_util_xy('CES', {'r': r}, *grid,
+                                            method = method)
+                    self.assertEqual(expected, actual)
+
+    def test_methods_agree(self):
+        """Test that the default method matches the full grid for each form."""
+
+        for name in uf.UTILITY_FORMS:
+            for grid in grids:
+                expected = uf.max_util_xy(name, params[name], *grid,
+                                          method = 'grid')
+                actual = uf.max_util_xy(name, params[name], *grid)
+                self.assertEqual(expected, actual)
+
+    def test_invalid_params(self):
+        """Test that invalid parameters return None."""
+
+        self.assertIsNone(uf.max_util_xy('CES', {'r': -1}, *grids[0]))
+        self.assertIsNone(uf.max_util_xy('leontief', {'a': 0, 'b': 1},
+                                         *grids[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
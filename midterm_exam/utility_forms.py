@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+##################################################
+#
+# QMB 3311: Python for Business Analytics
+#
+# Utility Functions for Two Goods
+#
+##################################################
+#
+# This module collects several forms of utility function
+# in the dictionary UTILITY_FORMS,
+# so that the grid searches for the optimal bundle
+# can be used with any of them.
+#
+# Each form has a utility function that takes arrays
+# of quantities x and y, so that it is evaluated
+# on many bundles in one call,
+# and a validation function for the parameters,
+# which is called once before the search,
+# rather than at every point on the grid,
+# as CESutility_in_budget() does in max_CES_xy().
+# max_CES_xy() and the other searches in my_CES_midterm_soln.py
+# are left as they are, for CES utility only,
+# since they are the solutions to the exam questions.
+#
+##################################################
+"""
+
+
+##################################################
+# Import Required Modules
+##################################################
+
+import numpy as np
+from typing import Callable, Dict, List
+
+import my_CES_midterm_soln as my_CES
+
+
+##################################################
+# Function Definitions
+##################################################
+
+#--------------------------------------------------
+# Utility functions and parameter checks
+#--------------------------------------------------
+
+def cobb_douglas_util(x: np.ndarray, y: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Calculates the Cobb-Douglas utility function x**alpha * y**(1 - alpha).
+
+    >>> cobb_douglas_util(np.array([4.0, 1.0]), np.array([1.0, 8.0]), 1/2)
+    array([2.        , 2.82842712])
+    """
+
+    return x**alpha * y**(1 - alpha)
+
+
+def cobb_douglas_valid(alpha: float) -> bool:
+    """
+    Determines whether the parameter of the Cobb-Douglas
+    utility function is valid, i.e. 0 < alpha < 1.
+
+    >>> cobb_douglas_valid(1/3)
+    True
+    >>> cobb_douglas_valid(1)
+    Error in cobb_douglas_valid: alpha is not between 0 and 1.
+    False
+    """
+
+    if alpha <= 0 or alpha >= 1:
+        print('Error in cobb_douglas_valid: alpha is not between 0 and 1.')
+        return False
+    return True
+
+
+def CES_util(x: np.ndarray, y: np.ndarray, r: float) -> np.ndarray:
+    """
+    Calculates the Constant Elasticity of Substitution
+    utility function (x**r + y**r)**(1/r),
+    as in CESutility().
+
+    >>> CES_util(np.array([3.0, 1.0]), np.array([4.0, 1.0]), 2)
+    array([5.        , 1.41421356])
+    """
+
+    return (x**r + y**r)**(1/r)
+
+
+def CES_valid(r: float) -> bool:
+    """
+    Determines whether the parameter of the CES utility function
+    is valid, i.e. r is positive, as in CESutility_valid().
+
+    >>> CES_valid(1/2)
+    True
+    >>> CES_valid(0)
+    Error in CES_valid: r is not positive.
+    False
+    """
+
+    if r <= 0:
+        print('Error in CES_valid: r is not positive.')
+        return False
+    return True
+
+
+def leontief_util(x: np.ndarray, y: np.ndarray,
+                  a: float = 1.0, b: float = 1.0) -> np.ndarray:
+    """
+    Calculates the Leontief (perfect complements)
+    utility function min(a*x, b*y).
+
+    >>> leontief_util(np.array([3.0, 1.0]), np.array([4.0, 1.0]), 1, 2)
+    array([3., 1.])
+    """
+
+    return np.minimum(a*x, b*y)
+
+
+def leontief_valid(a: float = 1.0, b: float = 1.0) -> bool:
+    """
+    Determines whether the parameters of the Leontief
+    utility function are valid, i.e. a and b are positive.
+
+    >>> leontief_valid(1, 2)
+    True
+    >>> leontief_valid(1, -2)
+    Error in leontief_valid: b is not positive.
+    False
+    """
+
+    is_valid = True
+    if a <= 0:
+        print('Error in leontief_valid: a is not positive.')
+        is_valid = False
+    if b <= 0:
+        print('Error in leontief_valid: b is not positive.')
+        is_valid = False
+    return is_valid
+
+
+def quasi_linear_util(x: np.ndarray, y: np.ndarray, a: float) -> np.ndarray:
+    """
+    Calculates the quasi-linear utility function a*log(1 + x) + y,
+    which is linear in the good y.
+
+    >>> quasi_linear_util(np.array([0.0, np.e - 1]), np.array([2.0, 2.0]), 3)
+    array([2., 5.])
+    """
+
+    return a*np.log1p(x) + y
+
+
+def quasi_linear_valid(a: float) -> bool:
+    """
+    Determines whether the parameter of the quasi-linear
+    utility function is valid, i.e. a is positive.
+
+    >>> quasi_linear_valid(3)
+    True
+    >>> quasi_linear_valid(0)
+    Error in quasi_linear_valid: a is not positive.
+    False
+    """
+
+    if a <= 0:
+        print('Error in quasi_linear_valid: a is not positive.')
+        return False
+    return True
+
+
+#--------------------------------------------------
+# The registry of utility functions
+#--------------------------------------------------
+
+# For each form, 'util' is the utility function of arrays x and y
+# and the parameters, 'valid' checks the parameters, and
+# 'strictly_increasing' indicates whether utility is strictly
+# increasing in y at every x, so that the optimum for each x
+# can be found on the budget line.
+# Cobb-Douglas utility is not: it is 0 for every y at x = 0.
+UTILITY_FORMS = {
+    'cobb_douglas': {'util': cobb_douglas_util, 'valid': cobb_douglas_valid,
+                     'strictly_increasing': False},
+    'CES': {'util': CES_util, 'valid': CES_valid,
+            'strictly_increasing': True},
+    'leontief': {'util': leontief_util, 'valid': leontief_valid,
+                 'strictly_increasing': False},
+    'quasi_linear': {'util': quasi_linear_util, 'valid': quasi_linear_valid,
+                     'strictly_increasing': True}
+}
+
+
+def register_utility(name: str,
+                     util: Callable[..., np.ndarray],
+                     valid: Callable[..., bool],
+                     strictly_increasing: bool = False) -> None:
+    """
+    Adds a form of utility function to UTILITY_FORMS,
+    with the utility function util(x, y, **params),
+    which takes arrays of quantities x and y,
+    and the check of the parameters valid(**params).
+    Unless strictly_increasing is True,
+    the grid searches evaluate the whole budget set.
+
+    >>> register_utility('linear', lambda x, y, a: a*x + y,
+    ...                  lambda a: a > 0, strictly_increasing = True)
+    >>> sorted(UTILITY_FORMS)
+    ['CES', 'cobb_douglas', 'leontief', 'linear', 'quasi_linear']
+    >>> del UTILITY_FORMS['linear']
+    """
+
+    UTILITY_FORMS[name] = {'util': util, 'valid': valid,
+                           'strictly_increasing': strictly_increasing}
+
+
+def get_utility(name: str, **params) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """
+    Returns the utility function of arrays x and y
+    of the form name in UTILITY_FORMS, with the parameters params,
+    after checking the parameters once.
+    Returns None if the form is not registered
+    or the parameters are not valid.
+
+    >>> util_func = get_utility('cobb_douglas', alpha = 1/2)
+    >>> util_func(np.array([4.0, 9.0]), np.array([1.0, 4.0]))
+    array([2., 6.])
+    >>> get_utility('cobb_douglas', alpha = 2)
+    Error in cobb_douglas_valid: alpha is not between 0 and 1.
+    >>> get_utility('translog')
+    Error in get_utility: translog is not a registered utility function.
+    """
+
+    if name not in UTILITY_FORMS:
+        print('Error in get_utility: %s is not a registered utility function.' % name)
+        return None
+    form = UTILITY_FORMS[name]
+    if not form['valid'](**params):
+        return None
+
+    util = form['util']
+    return lambda x, y: util(x, y, **params)
+
+
+#--------------------------------------------------
+# Grid search for any form of utility function
+#--------------------------------------------------
+
+def max_util_xy_grid(
+        util_func: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        x_min: float, x_max: float,
+        y_min: float, y_max: float,
+        step: float,
+        p_x: float, p_y: float, w: float) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y
+    on the grid of np.arange(x_min, x_max, step) and
+    np.arange(y_min, y_max, step),
+    evaluating util_func(x, y) on the whole grid in one call,
+    as the vectorized version of the exhaustive search in max_CES_xy().
+    The bundles outside the budget constraint,
+    or with negative quantities, are excluded.
+    The first of the highest values is selected,
+    in the order of the exhaustive search.
+
+    >>> max_util_xy_grid(get_utility('CES', r = 1/2),
+    ...                  0, 12/2, 0, 12/4, 0.1, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_util_xy_grid(get_utility('leontief', a = 1, b = 1),
+    ...                  0, 10, 0, 10, 1.0, 1, 1, 5)
+    [2.0, 2.0]
+    """
+
+    x_list = np.arange(x_min, x_max, step)
+    y_list = np.arange(y_min, y_max, step)
+    x_grid = x_list[:, np.newaxis]
+    y_grid = y_list[np.newaxis, :]
+
+    is_valid = (p_x*x_grid + p_y*y_grid <= w) & (x_grid >= 0) & (y_grid >= 0)
+    if not np.any(is_valid):
+        print("No value of utility was higher than the initial value.")
+        print("Choose different values of the parameters for x and y.")
+        return None
+
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        util = util_func(x_grid, y_grid)
+    util = np.where(is_valid, util, - np.inf)
+    i_max, j_max = np.unravel_index(np.argmax(util), util.shape)
+
+    return [float(x_list[i_max]), float(y_list[j_max])]
+
+
+def max_util_xy(name: str, params: Dict[str, float],
+                x_min: float, x_max: float,
+                y_min: float, y_max: float,
+                step: float,
+                p_x: float, p_y: float, w: float,
+                method: str = None) -> List[float]:
+    """
+    Calculates the optimal bundle of goods x and y
+    for the utility function of the form name in UTILITY_FORMS
+    with parameters params, by grid search over
+    np.arange(x_min, x_max, step) and np.arange(y_min, y_max, step).
+
+    The parameters are checked once, with get_utility().
+    The method is one of:
+    'frontier': max_util_xy_frontier(), along the budget line,
+    'interior': max_util_xy_interior(), over the budget set, or
+    'grid': max_util_xy_grid(), over the whole grid.
+    By default, the frontier search is used for forms
+    that are strictly increasing in y and the interior search
+    for the others, such as Leontief, where many bundles
+    tie for the highest utility.
+
+    >>> max_util_xy('CES', {'r': 1/2}, 0, 12/2, 0, 12/4, 0.1, 2, 4, 12)
+    [4.0, 1.0]
+    >>> max_util_xy('cobb_douglas', {'alpha': 2/3}, 0, 10, 0, 10, 0.5, 2, 1, 12)
+    [4.0, 4.0]
+
+    With only x = 0 on the grid, every bundle has zero Cobb-Douglas utility,
+    and the first one is selected, as in the exhaustive search,
+    not the one on the budget line:
+
+    >>> max_util_xy('cobb_douglas', {'alpha': 1/2}, 0, 1, 0, 10, 1.0, 2, 1, 12)
+    [0.0, 0.0]
+    >>> max_util_xy('quasi_linear', {'a': 6}, 0, 10, 0, 10, 0.5, 2, 1, 12)
+    [2.0, 8.0]
+    >>> max_util_xy('leontief', {'a': 1, 'b': 2}, 0, 10, 0, 10, 0.5, 1, 1, 6)
+    [4.0, 2.0]
+    >>> max_util_xy('CES', {'r': 1/2}, 0, 6, 0, 3, 0.1, 2, 4, 12, 'newton')
+    Error in max_util_xy: method must be 'frontier', 'interior' or 'grid'.
+    """
+
+    util_func = get_utility(name, **params)
+    if util_func is None:
+        return None
+
+    if method is None:
+        if UTILITY_FORMS[name]['strictly_increasing']:
+            method = 'frontier'
+        else:
+            method = 'interior'
+
+    if method == 'frontier':
+        search = my_CES.max_util_xy_frontier
+    elif method == 'interior':
+        search = my_CES.max_util_xy_interior
+    elif method == 'grid':
+        search = max_util_xy_grid
+    else:
+        print("Error in max_util_xy: method must be 'frontier', 'interior' or 'grid'.")
+        return None
+
+    return search(util_func, x_min, x_max, y_min, y_max, step, p_x, p_y, w)
+
+
+##################################################
+# Test the examples in the docstrings
+##################################################
+
+
+if __name__ == "__main__":
+    import doctest
+    print(doctest.testmod())